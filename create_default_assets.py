@@ -1,214 +1,261 @@
 import pygame
 import os
+import sys
+import json
+import time
 import random
+import hashlib
+import inspect
+from concurrent.futures import ProcessPoolExecutor
 
-def create_default_assets():
+# Generation cache: output file -> hash of generator source and parameters
+CACHE_FILE = os.path.join("assets", ".asset_cache.json")
+VARIANTS_DIR = os.path.join("assets", "variants")
+
+# Generator source code, read once per run
+generator_sources = {}
+
+# Rider/bike colors
+PLAYER_COLORS = {
+    "bike_color": (255, 105, 180),   # Pink
+    "body_color": (255, 215, 0),     # Golden shirt
+    "leg_color": (255, 192, 203),    # Pink pants
+    "helmet_color": (255, 255, 0),   # Yellow
+}
+ENEMY_COLORS = {
+    "bike_color": (0, 128, 0),       # Green
+    "body_color": (50, 50, 150),     # Blue shirt
+    "leg_color": (50, 50, 50),       # Dark pants
+    "helmet_color": (150, 0, 0),     # Red
+}
+
+def create_default_assets(variants=0, force=False, workers=None):
     """
     Create default game assets in the assets directory
+
+    Only outputs whose generator source or parameters changed since the last
+    run are rendered; stale ones are rendered in a process pool.
     """
-    pygame.init()
-    
+    start = time.perf_counter()
+
     # Create assets directory if it doesn't exist
     if not os.path.exists("assets"):
         os.makedirs("assets")
-    
-    # Create player bike with rider
-    create_player_bike()
-    
-    # Create enemy bike with rider
-    create_enemy_bike()
-    
-    # Create obstacle
-    create_obstacle()
-    
-    # Create cloud
-    create_cloud()
-    
-    # Create grass
-    create_grass()
-    
-    # Create highway board
-    create_highway_board()
-
-def create_player_bike():
+    if variants and not os.path.exists(VARIANTS_DIR):
+        os.makedirs(VARIANTS_DIR)
+
+    jobs = asset_jobs() + variant_jobs(variants)
+    cache = {} if force else load_cache()
+
+    # Skip outputs that are already up to date
+    stale = []
+    for path, generator, params in jobs:
+        key = job_hash(generator, params)
+        if cache.get(path) != key or not os.path.exists(path):
+            stale.append((path, generator, params, key))
+
+    if len(stale) > 1 and workers != 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            rendered = list(pool.map(render_job, stale, chunksize=max(1, len(stale) // 64)))
+    else:
+        rendered = [render_job(job) for job in stale]
+
+    for path, key in rendered:
+        cache[path] = key
+    save_cache(cache)
+
+    elapsed = time.perf_counter() - start
+    hits = len(jobs) - len(stale)
+    print(f"Assets: {len(jobs)} total, {hits} up to date, {len(stale)} rendered "
+          f"in {elapsed:.2f}s")
+    return len(stale)
+
+def asset_jobs():
+    """List the (path, generator, params) jobs for the base game assets"""
+    return [
+        # Player bike with rider
+        (os.path.join("assets", "player.png"), "create_rider_bike", PLAYER_COLORS),
+        # Enemy bike with rider
+        (os.path.join("assets", "enemy.png"), "create_rider_bike", ENEMY_COLORS),
+        (os.path.join("assets", "obstacle.png"), "create_obstacle", {}),
+        (os.path.join("assets", "cloud.png"), "create_cloud", {}),
+        (os.path.join("assets", "grass.png"), "create_grass", {"seed": 0}),
+        (os.path.join("assets", "highway_board.png"), "create_highway_board", {}),
+    ]
+
+def variant_jobs(count):
+    """List jobs for recolored enemy liveries used by the traffic system"""
+    jobs = []
+    for i in range(count):
+        rng = random.Random(i)
+        colors = {
+            name: (rng.randint(0, 255), rng.randint(0, 255), rng.randint(0, 255))
+            for name in ENEMY_COLORS
+        }
+        path = os.path.join(VARIANTS_DIR, f"enemy_{i:03d}.png")
+        jobs.append((path, "create_rider_bike", colors))
+    return jobs
+
+def job_hash(generator, params):
+    """Hash a generator's source code together with its parameters"""
+    if generator not in generator_sources:
+        generator_sources[generator] = inspect.getsource(globals()[generator]).encode()
+    digest = hashlib.sha256(generator_sources[generator])
+    digest.update(json.dumps(params, sort_keys=True).encode())
+    return digest.hexdigest()
+
+def load_cache():
+    """Load the generation cache, or an empty one"""
+    try:
+        with open(CACHE_FILE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_cache(cache):
+    """Write the generation cache"""
+    with open(CACHE_FILE, "w") as f:
+        json.dump(cache, f, indent=1, sort_keys=True)
+
+def render_job(job):
+    """Run one generator (in a worker process) and return (path, hash)"""
+    path, generator, params, key = job
+    globals()[generator](path, **params)
+    return path, key
+
+def create_rider_bike(asset_path, bike_color, body_color, leg_color, helmet_color):
     """Create a sports bike with rider in sports dress"""
     width, height = 50, 100
     surface = pygame.Surface((width, height), pygame.SRCALPHA)
-    
-    # Bike body (pink) - facing upward
-    bike_color = (255, 105, 180)  # Pink
-    pygame.draw.polygon(surface, bike_color, [(15, 60), (35, 60), (25, 40)])
-    pygame.draw.rect(surface, bike_color, (20, 60, 10, 30))
-    
-    # Wheels - vertically aligned
-    wheel_color = (30, 30, 30)  # Dark gray
-    pygame.draw.circle(surface, wheel_color, (25, 70), 6)  # Middle wheel
-    pygame.draw.circle(surface, wheel_color, (25, 90), 6)  # Back wheel
-    
-    # Headlight (red) - at the front (top) of the bike
-    headlight_color = (255, 0, 0)  # Red
-    pygame.draw.circle(surface, headlight_color, (25, 40), 4)
-    
-    # Rider body - more human-like shape
-    body_color = (255, 215, 0)  # Golden shirt
-    # Torso
-    pygame.draw.rect(surface, body_color, (18, 35, 14, 20))
-    # Arms
-    pygame.draw.rect(surface, body_color, (14, 40, 4, 15))
-    pygame.draw.rect(surface, body_color, (32, 40, 4, 15))
-    
-    # Rider legs - positioned lower on the bike
-    leg_color = (255, 192, 203)  # Pink pants
-    pygame.draw.rect(surface, leg_color, (18, 55, 6, 25))
-    pygame.draw.rect(surface, leg_color, (26, 55, 6, 25))
-    
-    # Helmet
-    helmet_color = (255, 255, 0)  # Yellow
-    pygame.draw.circle(surface, helmet_color, (25, 25), 8)
-    # Face area
-    face_color = (255, 213, 170)  # Skin tone
-    pygame.draw.rect(surface, face_color, (21, 22, 8, 8))
-    
-    # Save the image
-    asset_path = os.path.join("assets", "player.png")
-    pygame.image.save(surface, asset_path)
-    print(f"Created {asset_path}")
 
-def create_enemy_bike():
-    """Create an enemy bike with rider"""
-    width, height = 50, 100
-    surface = pygame.Surface((width, height), pygame.SRCALPHA)
-    
-    # Bike body (green) - facing upward
-    bike_color = (0, 128, 0)  # Green
+    # Bike body - facing upward
     pygame.draw.polygon(surface, bike_color, [(15, 60), (35, 60), (25, 40)])
     pygame.draw.rect(surface, bike_color, (20, 60, 10, 30))
-    
+
     # Wheels - vertically aligned
     wheel_color = (30, 30, 30)  # Dark gray
     pygame.draw.circle(surface, wheel_color, (25, 70), 6)  # Middle wheel
     pygame.draw.circle(surface, wheel_color, (25, 90), 6)  # Back wheel
-    
+
     # Headlight (red) - at the front (top) of the bike
     headlight_color = (255, 0, 0)  # Red
     pygame.draw.circle(surface, headlight_color, (25, 40), 4)
-    
+
     # Rider body - more human-like shape
-    body_color = (50, 50, 150)  # Blue shirt
     # Torso
     pygame.draw.rect(surface, body_color, (18, 35, 14, 20))
     # Arms
     pygame.draw.rect(surface, body_color, (14, 40, 4, 15))
     pygame.draw.rect(surface, body_color, (32, 40, 4, 15))
-    
+
     # Rider legs - positioned lower on the bike
-    leg_color = (50, 50, 50)  # Dark pants
     pygame.draw.rect(surface, leg_color, (18, 55, 6, 25))
     pygame.draw.rect(surface, leg_color, (26, 55, 6, 25))
-    
+
     # Helmet
-    helmet_color = (150, 0, 0)  # Red
     pygame.draw.circle(surface, helmet_color, (25, 25), 8)
     # Face area
     face_color = (255, 213, 170)  # Skin tone
     pygame.draw.rect(surface, face_color, (21, 22, 8, 8))
-    
+
     # Save the image
-    asset_path = os.path.join("assets", "enemy.png")
     pygame.image.save(surface, asset_path)
     print(f"Created {asset_path}")
 
-def create_obstacle():
+def create_obstacle(asset_path):
     """Create an obstacle"""
     width, height = 30, 30
     surface = pygame.Surface((width, height), pygame.SRCALPHA)
-    
+
     # Draw a rock/barrier
     obstacle_color = (100, 100, 100)  # Gray
-    pygame.draw.polygon(surface, obstacle_color, 
+    pygame.draw.polygon(surface, obstacle_color,
                        [(5, 25), (10, 5), (20, 5), (25, 25)])
-    
+
     # Add some detail
     detail_color = (70, 70, 70)  # Darker gray
     pygame.draw.line(surface, detail_color, (10, 15), (20, 15), 2)
-    
+
     # Save the image
-    asset_path = os.path.join("assets", "obstacle.png")
     pygame.image.save(surface, asset_path)
     print(f"Created {asset_path}")
 
-def create_cloud():
+def create_cloud(asset_path):
     """Create a cloud"""
     width, height = 80, 40
     surface = pygame.Surface((width, height), pygame.SRCALPHA)
-    
+
     # Create a cloud shape
     cloud_color = (255, 255, 255)  # White
     pygame.draw.ellipse(surface, cloud_color, (0, 10, 40, 30))
     pygame.draw.ellipse(surface, cloud_color, (20, 0, 50, 25))
     pygame.draw.ellipse(surface, cloud_color, (30, 10, 40, 30))
-    
+
     # Save the image
-    asset_path = os.path.join("assets", "cloud.png")
     pygame.image.save(surface, asset_path)
     print(f"Created {asset_path}")
 
-def create_grass():
+def create_grass(asset_path, seed):
     """Create grass for roadside"""
     width, height = 40, 30
     surface = pygame.Surface((width, height), pygame.SRCALPHA)
-    
+
+    # Seeded so the output only changes when the parameters do
+    rng = random.Random(seed)
+
     # Base grass color
     grass_color = (34, 139, 34)  # Forest green
-    
+
     # Draw several blades of grass
     for i in range(15):
-        x = random.randint(0, width)
-        h = random.randint(10, 25)
-        w = random.randint(2, 4)
+        x = rng.randint(0, width)
+        h = rng.randint(10, 25)
+        w = rng.randint(2, 4)
         pygame.draw.line(surface, grass_color, (x, height), (x, height - h), w)
-    
+
     # Add some variation in color
     light_grass = (85, 170, 85)
     for i in range(5):
-        x = random.randint(0, width)
-        h = random.randint(8, 20)
-        w = random.randint(1, 3)
+        x = rng.randint(0, width)
+        h = rng.randint(8, 20)
+        w = rng.randint(1, 3)
         pygame.draw.line(surface, light_grass, (x, height), (x, height - h), w)
-    
+
     # Save the image
-    asset_path = os.path.join("assets", "grass.png")
     pygame.image.save(surface, asset_path)
     print(f"Created {asset_path}")
 
-def create_highway_board():
+def create_highway_board(asset_path):
     """Create highway board"""
     width, height = 60, 80
     surface = pygame.Surface((width, height), pygame.SRCALPHA)
-    
+
     # Draw pole
     pole_color = (100, 100, 100)  # Gray
     pygame.draw.rect(surface, pole_color, (width//2 - 3, height//3, 6, 2*height//3))
-    
+
     # Draw sign
     sign_color = (0, 0, 150)  # Blue
     pygame.draw.rect(surface, sign_color, (5, 5, width - 10, height//3))
-    
+
     # Add white border
     border_color = (255, 255, 255)  # White
     pygame.draw.rect(surface, border_color, (5, 5, width - 10, height//3), 2)
-    
+
     # Add some text-like markings
     text_color = (255, 255, 255)  # White
     pygame.draw.line(surface, text_color, (15, 15), (width - 15, 15), 3)
     pygame.draw.line(surface, text_color, (15, 25), (width - 25, 25), 3)
-    
+
     # Save the image
-    asset_path = os.path.join("assets", "highway_board.png")
     pygame.image.save(surface, asset_path)
     print(f"Created {asset_path}")
 
 if __name__ == "__main__":
-    create_default_assets()
+    # Usage: create_default_assets.py [--force] [--variants N] [--workers N]
+    args = sys.argv[1:]
+    variants = int(args[args.index("--variants") + 1]) if "--variants" in args else 0
+    workers = int(args[args.index("--workers") + 1]) if "--workers" in args else None
+    create_default_assets(variants=variants, force="--force" in args, workers=workers)
     print("\nDefault assets created successfully.")
-    print("You can replace these with custom assets in the assets directory.")
\ No newline at end of file
+    print("You can replace these with custom assets in the assets directory.")
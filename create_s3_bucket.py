@@ -1,14 +1,38 @@
 import boto3
 import sys
 import os
+import json
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 
-def create_bucket(bucket_name="road-rash-game-assets", region="us-east-1"):
+# Upload tuning: parts are uploaded in parallel above the multipart threshold
+MULTIPART_CHUNK_SIZE = 8 * 1024 * 1024
+UPLOAD_WORKERS = 16
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=MULTIPART_CHUNK_SIZE,
+    multipart_chunksize=MULTIPART_CHUNK_SIZE,
+    max_concurrency=4,
+    use_threads=True,
+)
+
+# Manifest listing every published asset, fetched by clients in one request
+MANIFEST_KEY = "manifest.json"
+
+def get_s3_client(region=None, endpoint_url=None):
+    """
+    Create an S3 client, optionally against a local S3 stand-in
+    """
+    config = Config(max_pool_connections=UPLOAD_WORKERS * TRANSFER_CONFIG.max_concurrency)
+    return boto3.client('s3', region_name=region, endpoint_url=endpoint_url, config=config)
+
+def create_bucket(bucket_name="road-rash-game-assets", region="us-east-1", endpoint_url=None):
     """
     Create an S3 bucket for storing game assets
     """
+    s3_client = get_s3_client(region, endpoint_url)
     try:
-        s3_client = boto3.client('s3', region_name=region)
-        
         # Create the bucket
         if region == "us-east-1":
             s3_client.create_bucket(Bucket=bucket_name)
@@ -18,45 +42,123 @@ def create_bucket(bucket_name="road-rash-game-assets", region="us-east-1"):
                 Bucket=bucket_name,
                 CreateBucketConfiguration=location
             )
-        
+
         print(f"Successfully created bucket: {bucket_name}")
         return True
+    except s3_client.exceptions.BucketAlreadyOwnedByYou:
+        # Re-publishing into our own bucket is fine
+        print(f"Bucket already exists: {bucket_name}")
+        return True
     except Exception as e:
         print(f"Error creating bucket: {e}")
         return False
 
-def upload_default_assets(bucket_name="road-rash-game-assets"):
+def local_etag(path, chunk_size=MULTIPART_CHUNK_SIZE):
+    """
+    Compute the ETag S3 will report for a file uploaded with TRANSFER_CONFIG
+
+    Single-part uploads use the MD5 of the content; multipart uploads use the
+    MD5 of the concatenated part MD5s followed by the part count.
+    """
+    whole = hashlib.md5()
+    part_digests = []
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            whole.update(chunk)
+            part_digests.append(hashlib.md5(chunk).digest())
+
+    if os.path.getsize(path) < TRANSFER_CONFIG.multipart_threshold:
+        return whole.hexdigest()
+    combined = hashlib.md5(b"".join(part_digests)).hexdigest()
+    return f"{combined}-{len(part_digests)}"
+
+def list_local_assets(assets_dir="assets"):
+    """
+    List (key, path) for every PNG in the assets directory, including variants
+    """
+    files = []
+    for root, _, names in os.walk(assets_dir):
+        for name in names:
+            if name.endswith(".png"):
+                path = os.path.join(root, name)
+                key = os.path.relpath(path, assets_dir).replace(os.sep, "/")
+                files.append((key, path))
+    return sorted(files)
+
+def list_remote_etags(s3_client, bucket_name):
+    """
+    Map every object key in the bucket to its ETag
+    """
+    etags = {}
+    paginator = s3_client.get_paginator('list_objects_v2')
+    for page in paginator.paginate(Bucket=bucket_name):
+        for obj in page.get('Contents', []):
+            etags[obj['Key']] = obj['ETag'].strip('"')
+    return etags
+
+def build_manifest(entries):
     """
-    Create and upload default assets to S3
+    Build a versioned manifest from {key: {"etag", "size"}} entries
+
+    The version is derived from the content, so publishing the same asset set
+    twice produces the same version.
+    """
+    digest = hashlib.sha256()
+    for key in sorted(entries):
+        digest.update(f"{key}:{entries[key]['etag']}\n".encode())
+    return {
+        "version": digest.hexdigest()[:16],
+        "assets": {key: entries[key] for key in sorted(entries)},
+    }
+
+def upload_default_assets(bucket_name="road-rash-game-assets", endpoint_url=None,
+                          assets_dir="assets", workers=UPLOAD_WORKERS):
+    """
+    Generate the full asset set and publish it to S3
+
+    Objects whose remote ETag already matches the local file are skipped, the
+    rest are uploaded concurrently. A versioned manifest is written last.
     """
     try:
-        import pygame
-        pygame.init()
-        
-        # Create assets directory if it doesn't exist
-        if not os.path.exists("assets"):
-            os.makedirs("assets")
-        
-        # Create default assets
-        assets = {
-            "player.png": (50, 100, (255, 0, 0)),      # Red player
-            "enemy.png": (50, 100, (0, 0, 0)),         # Black enemy
-            "obstacle.png": (30, 30, (255, 255, 255))  # White obstacle
-        }
-        
-        s3_client = boto3.client('s3')
-        
-        for asset_name, (width, height, color) in assets.items():
-            # Create surface and save as PNG
-            surface = pygame.Surface((width, height))
-            surface.fill(color)
-            asset_path = os.path.join("assets", asset_name)
-            pygame.image.save(surface, asset_path)
-            
-            # Upload to S3
-            s3_client.upload_file(asset_path, bucket_name, asset_name)
-            print(f"Uploaded {asset_name} to S3 bucket {bucket_name}")
-        
+        from create_default_assets import create_default_assets
+
+        # Bring the local asset set up to date (incremental)
+        create_default_assets()
+
+        s3_client = get_s3_client(endpoint_url=endpoint_url)
+        remote = list_remote_etags(s3_client, bucket_name)
+
+        entries = {}
+        pending = []
+        for key, path in list_local_assets(assets_dir):
+            etag = local_etag(path)
+            entries[key] = {"etag": etag, "size": os.path.getsize(path)}
+            if remote.get(key) != etag:
+                pending.append((key, path))
+
+        def upload(item):
+            key, path = item
+            s3_client.upload_file(path, bucket_name, key, Config=TRANSFER_CONFIG,
+                                  ExtraArgs={'ContentType': 'image/png'})
+            return key
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for key in pool.map(upload, pending):
+                print(f"Uploaded {key} to S3 bucket {bucket_name}")
+
+        # Publish the manifest under a versioned key and as the latest one
+        manifest = build_manifest(entries)
+        body = json.dumps(manifest, indent=1).encode()
+        versioned_key = f"manifests/manifest-{manifest['version']}.json"
+        for key in (versioned_key, MANIFEST_KEY):
+            s3_client.put_object(Bucket=bucket_name, Key=key, Body=body,
+                                 ContentType='application/json')
+
+        print(f"Published {len(entries)} assets ({len(pending)} uploaded, "
+              f"{len(entries) - len(pending)} unchanged), manifest version {manifest['version']}")
         return True
     except Exception as e:
         print(f"Error uploading assets: {e}")
@@ -65,21 +167,30 @@ def upload_default_assets(bucket_name="road-rash-game-assets"):
 if __name__ == "__main__":
     bucket_name = "road-rash-game-assets"
     region = "us-east-1"
-    
+    endpoint_url = None
+
+    # Allow a local S3 stand-in (e.g. MinIO or moto_server) via --endpoint-url
+    args = sys.argv[1:]
+    if "--endpoint-url" in args:
+        index = args.index("--endpoint-url")
+        endpoint_url = args[index + 1]
+        del args[index:index + 2]
+
     # Allow custom bucket name from command line
-    if len(sys.argv) > 1:
-        bucket_name = sys.argv[1]
-    
+    if len(args) > 0:
+        bucket_name = args[0]
+
     # Allow custom region from command line
-    if len(sys.argv) > 2:
-        region = sys.argv[2]
-    
-    if create_bucket(bucket_name, region):
-        upload_default_assets(bucket_name)
+    if len(args) > 1:
+        region = args[1]
+
+    if create_bucket(bucket_name, region, endpoint_url):
+        upload_default_assets(bucket_name, endpoint_url)
         print(f"\nS3 bucket setup complete. The game will now use assets from: {bucket_name}")
+        print(f"Clients can fetch the asset list from {MANIFEST_KEY}.")
         print("You can customize the assets by uploading your own versions of:")
         print("- player.png")
         print("- enemy.png")
         print("- obstacle.png")
     else:
-        print("\nFailed to set up S3 bucket. The game will use default generated assets.")
\ No newline at end of file
+        print("\nFailed to set up S3 bucket. The game will use default generated assets.")
@@ -0,0 +1,52 @@
+"""
+Road Rash style game.
+
+The engine lives in submodules that are imported on first attribute
+access, so `import roadrash` is cheap and tools that only need one part
+(savestate, ecs, ...) do not pay for pygame, NumPy or the rest:
+
+    import roadrash
+    game = roadrash.game.Game(difficulty="classic")
+"""
+
+import importlib
+
+SUBMODULES = (
+    "asset_watcher",
+    "assets",
+    "audio",
+    "behavior",
+    "combat",
+    "config",
+    "controls",
+    "ecs",
+    "game",
+    "latency",
+    "leaderboard",
+    "lighting",
+    "lod",
+    "navigation",
+    "objects",
+    "particles",
+    "physics",
+    "pipeline",
+    "quality",
+    "render_queue",
+    "render_target",
+    "rewind",
+    "savestate",
+    "telemetry",
+    "tuning",
+)
+
+__all__ = list(SUBMODULES)
+
+
+def __getattr__(name):
+    if name in SUBMODULES:
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(SUBMODULES))
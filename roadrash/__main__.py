@@ -0,0 +1,7 @@
+"""
+Run the game with `python -m roadrash`.
+"""
+
+from .game import main
+
+main()
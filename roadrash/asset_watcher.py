@@ -0,0 +1,117 @@
+"""
+Asset hot-reload for the Road Rash style game.
+
+A background thread polls the assets directory (and create_default_assets.py)
+for new and modified PNGs, so dropping a new sprite in works as well as
+editing one. The thread also decodes and scales the sprites that changed
+and hands the Surfaces to the game loop through a queue; drain() only
+converts them to the display's pixel format (convert_alpha() must run on
+the thread that owns the display), so a reload costs the frame next to
+nothing. A file that fails to decode (usually still being written) is
+retried on a later poll. Only the watcher thread touches the recorded
+modification times.
+"""
+
+import glob
+import os
+import queue
+import subprocess
+import sys
+import threading
+
+# Seconds between filesystem polls
+POLL_INTERVAL = 0.5
+
+# Editing the generator script re-runs it, which rewrites the PNGs
+GENERATOR_SCRIPT = "create_default_assets.py"
+
+
+class AssetWatcher:
+    """Polls the assets directory and queues new and changed sprites for the main thread"""
+    def __init__(self, asset_manager, interval=POLL_INTERVAL):
+        self.asset_manager = asset_manager
+        self.interval = interval
+        self.ready = queue.Queue()
+        self.stop_event = threading.Event()
+        self.thread = None
+
+        # Baseline modification times, so nothing reloads at startup (watcher thread only)
+        self.mtimes = {}
+        self.failed = {}    # path -> modification time that last failed to decode
+        for path in self.watched_paths().values():
+            self.mtimes[path] = self.get_mtime(path)
+
+    def watched_paths(self):
+        """Map every PNG in the assets directory (by asset name), and the generator, to its path"""
+        paths = {os.path.splitext(os.path.basename(path))[0]: path
+                 for path in glob.glob(os.path.join(self.asset_manager.assets_dir, "*.png"))}
+        paths[GENERATOR_SCRIPT] = GENERATOR_SCRIPT
+        return paths
+
+    def get_mtime(self, path):
+        """Get a file's modification time, or None if it does not exist"""
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
+    def start(self):
+        """Start the background polling thread"""
+        self.thread = threading.Thread(target=self.run, name="asset-watcher", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Stop the background polling thread"""
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def run(self):
+        """Polling loop executed on the watcher thread"""
+        while not self.stop_event.wait(self.interval):
+            self.poll()
+
+    def poll(self):
+        """Check every watched file once, and decode and queue new and changed sprites"""
+        for name, path in self.watched_paths().items():
+            mtime = self.get_mtime(path)
+            if mtime is None or mtime == self.mtimes.get(path):
+                continue
+
+            if name == GENERATOR_SCRIPT:
+                self.mtimes[path] = mtime
+                self.regenerate()
+                continue
+            try:
+                image = self.asset_manager.decode_asset(name)
+            except Exception as e:
+                # Probably a half-written file: leave its time unrecorded so the next poll tries again
+                if self.failed.get(path) != mtime:
+                    print(f"Could not reload {path}: {e}")
+                    self.failed[path] = mtime
+                continue
+            self.mtimes[path] = mtime
+            self.failed.pop(path, None)
+            self.ready.put((name, image))
+
+    def regenerate(self):
+        """Re-run the asset generator in a separate process"""
+        print(f"{GENERATOR_SCRIPT} changed, regenerating assets...")
+        result = subprocess.run([sys.executable, GENERATOR_SCRIPT],
+                                capture_output=True, text=True)
+        if result.returncode != 0:
+            print(f"Asset generation failed:\n{result.stderr}")
+
+    def drain(self):
+        """Convert the sprites decoded since the last call; returns (name, sprite) pairs
+
+        Call from the thread that owns the display.
+        """
+        reloaded = []
+        while True:
+            try:
+                name, image = self.ready.get_nowait()
+            except queue.Empty:
+                return reloaded
+            reloaded.append((name, self.asset_manager.convert_asset(image)))
@@ -0,0 +1,67 @@
+"""
+Sprite loading for the Road Rash style game.
+"""
+
+import os
+import sys
+
+import pygame
+
+from .config import ASSET_SIZES
+
+
+class AssetManager:
+    """Manages game assets including downloading from S3 when needed"""
+    def __init__(self, bucket_name="road-rash-game-assets"):
+        self.bucket_name = bucket_name
+        self.assets_dir = "assets"
+        self.ensure_assets_dir()
+
+        # Load assets from files
+        self.assets = self.load_assets()
+
+    def ensure_assets_dir(self):
+        """Create assets directory if it doesn't exist"""
+        if not os.path.exists(self.assets_dir):
+            os.makedirs(self.assets_dir)
+
+    def load_assets(self):
+        """Load game assets from files"""
+        assets = {}
+
+        try:
+            for name in ASSET_SIZES:
+                assets[name] = self.load_asset(name)
+
+            return assets
+        except Exception as e:
+            print(f"Error loading assets: {e}")
+            print("Make sure you've run create_default_assets.py first")
+            sys.exit(1)
+
+    def asset_path(self, name):
+        """Get the file path of an asset"""
+        return os.path.join(self.assets_dir, name + ".png")
+
+    def load_asset(self, name):
+        """Load a single asset, resized to match game dimensions and converted for the display"""
+        return self.convert_asset(self.decode_asset(name))
+
+    def decode_asset(self, name):
+        """Decode an asset's file and resize it to match game dimensions
+
+        Sprites without a game size (new files dropped into the assets
+        directory) keep their own size. This does not touch the display, so
+        it can run on any thread.
+        """
+        image = pygame.image.load(self.asset_path(name))
+        if name in ASSET_SIZES:
+            image = pygame.transform.scale(image, ASSET_SIZES[name])
+        return image
+
+    @staticmethod
+    def convert_asset(image):
+        """With a display open, convert a decoded sprite to its pixel format so blits do not every frame"""
+        if pygame.display.get_surface() is not None:
+            image = image.convert_alpha()
+        return image
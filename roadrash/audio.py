@@ -0,0 +1,246 @@
+"""
+Sound for the Road Rash style game, built on pygame.mixer.
+
+All sounds are synthesized once at startup with NumPy; nothing is
+resampled while playing:
+- The player's engine is a set of seamless loops pre-rendered at
+  ENGINE_STEPS pitches across the speed range. The loop follows
+  Player.speed by switching to the nearest step, with a short fade.
+- Every enemy rider (the FSM enemies and ECS traffic) is a sound source
+  with a distance-attenuated, panned engine loop. Only the MAX_SOURCE_VOICES
+  loudest sources get a voice. Voices come from a fixed channel pool and
+  stay with their source while it is audible, so with 50+ sources the
+  mixing cost stays bounded.
+- Crashes and landed punches or kicks play noise bursts on reserved
+  effects channels.
+
+If the mixer cannot be opened (no audio device), the SoundSystem disables
+itself. It works with SDL_AUDIODRIVER=dummy.
+"""
+
+import numpy as np
+import pygame
+
+from .config import SCREEN_WIDTH
+
+# Mixer format: a small buffer keeps sound in step with the picture. pygame.init()
+# opens the mixer with its own defaults, so call pre_init() before it
+SAMPLE_RATE = 22050
+SAMPLE_SIZE = -16
+MIXER_CHANNELS = 2
+BUFFER_SIZE = 512
+
+# Channel layout: engine, effects, then the pool of source voices
+ENGINE_CHANNEL = 0
+EFFECT_CHANNELS = (1, 2)
+MAX_SOURCE_VOICES = 8
+
+# Engine pitch steps between the lowest and highest speed
+ENGINE_STEPS = 16
+ENGINE_MIN_HZ = 55.0
+ENGINE_MAX_HZ = 165.0
+ENGINE_FADE_MS = 40
+LOOP_SECONDS = 0.25
+
+# Source attenuation: full volume within REFERENCE_DISTANCE, silent beyond MAX_DISTANCE
+REFERENCE_DISTANCE = 120.0
+MAX_DISTANCE = 700.0
+SOURCE_VOLUME = 0.5
+
+
+def engine_wave(frequency, rate, seconds=LOOP_SECONDS, roughness=0.3, seed=0):
+    """Render a seamless engine loop: whole periods of a buzzy harmonic tone"""
+    periods = max(1, round(frequency * seconds))
+    length = round(periods * rate / frequency)
+    # Snap the frequency so the loop holds an exact number of periods
+    phase = np.arange(length) * (periods / length) * 2 * np.pi
+    wave = sum(np.sin(phase * harmonic) / harmonic for harmonic in range(1, 7))
+    # Cylinder firing pulses at twice the base frequency
+    wave *= 0.75 + 0.25 * np.sign(np.sin(phase * 2))
+    rng = np.random.default_rng(seed)
+    wave += roughness * rng.standard_normal(length) * 0.2
+    return wave / np.abs(wave).max()
+
+
+def crash_wave(rate, seconds=0.6, seed=1):
+    """Render a crash: low-passed noise with a fast decay and a thump"""
+    length = int(rate * seconds)
+    rng = np.random.default_rng(seed)
+    noise = np.convolve(rng.standard_normal(length), np.ones(8) / 8, mode="same")
+    t = np.arange(length) / rate
+    thump = np.sin(2 * np.pi * 60 * t) * np.exp(-t * 12)
+    wave = (noise * 0.8 + thump) * np.exp(-t * 6)
+    return wave / np.abs(wave).max()
+
+
+def pre_init():
+    """Ask for the game's mixer format; must run before pygame.init()"""
+    pygame.mixer.pre_init(SAMPLE_RATE, SAMPLE_SIZE, MIXER_CHANNELS, BUFFER_SIZE)
+
+
+class SoundSystem:
+    """Engine, rider and crash sounds for one Game"""
+    def __init__(self, speed_range, max_voices=MAX_SOURCE_VOICES):
+        self.enabled = False
+        try:
+            # Opened with another format (pre_init was not called first): reopen it
+            if pygame.mixer.get_init() not in (None, (SAMPLE_RATE, SAMPLE_SIZE, MIXER_CHANNELS)):
+                pygame.mixer.quit()
+            if not pygame.mixer.get_init():
+                pygame.mixer.init(SAMPLE_RATE, SAMPLE_SIZE, MIXER_CHANNELS, BUFFER_SIZE)
+        except pygame.error as e:
+            print(f"Audio disabled: {e}")
+            return
+        self.enabled = True
+        self.rate, self.size, self.channels = pygame.mixer.get_init()
+
+        # Fixed channel layout; the mixer never picks channels on its own
+        self.max_voices = max_voices
+        first_voice = max(EFFECT_CHANNELS) + 1
+        pygame.mixer.set_num_channels(first_voice + max_voices)
+        pygame.mixer.set_reserved(first_voice + max_voices)
+        self.engine_channel = pygame.mixer.Channel(ENGINE_CHANNEL)
+        self.effect_channels = [pygame.mixer.Channel(i) for i in EFFECT_CHANNELS]
+        self.free_voices = [pygame.mixer.Channel(first_voice + i) for i in range(max_voices)]
+        self.voices = {}    # Source key -> channel
+
+        # Pre-rendered buffers
+        self.min_speed, self.max_speed = speed_range
+        frequencies = np.geomspace(ENGINE_MIN_HZ, ENGINE_MAX_HZ, ENGINE_STEPS)
+        self.engine_steps = [self.make_sound(engine_wave(f, self.rate) * 0.6) for f in frequencies]
+        self.rider_sound = self.make_sound(engine_wave(ENGINE_MIN_HZ * 1.3, self.rate,
+                                                       roughness=0.6, seed=2) * 0.5)
+        self.crash_sound = self.make_sound(crash_wave(self.rate))
+        self.hit_sound = self.make_sound(crash_wave(self.rate, seconds=0.12, seed=3) * 0.5)
+        self.engine_step = None
+
+    def make_sound(self, wave):
+        """Convert a mono float wave in [-1, 1] to a Sound in the mixer's format"""
+        bits = abs(self.size)
+        if bits == 8:
+            samples = (wave * 127).astype(np.int8 if self.size < 0 else np.uint8)
+        elif bits == 32:
+            samples = wave.astype(np.float32)
+        else:
+            samples = (wave * 32767).astype(np.int16)
+        if self.channels > 1:
+            samples = np.repeat(samples[:, None], self.channels, axis=1)
+        return pygame.sndarray.make_sound(np.ascontiguousarray(samples))
+
+    def set_engine_speed(self, speed):
+        """Switch the engine loop to the pitch step nearest to speed"""
+        fraction = (speed - self.min_speed) / max(self.max_speed - self.min_speed, 1e-6)
+        step = min(ENGINE_STEPS - 1, max(0, round(fraction * (ENGINE_STEPS - 1))))
+        if step != self.engine_step:
+            self.engine_step = step
+            self.engine_channel.play(self.engine_steps[step], loops=-1, fade_ms=ENGINE_FADE_MS)
+
+    def update_sources(self, listener, keys, xs, ys):
+        """Give the loudest sources a panned voice, release the rest
+
+        keys identify sources across frames; xs and ys are their positions.
+        """
+        listener_x, listener_y = listener
+        dx = np.asarray(xs, dtype=np.float64) - listener_x
+        dy = np.asarray(ys, dtype=np.float64) - listener_y
+        distance = np.hypot(dx, dy)
+        gain = SOURCE_VOLUME / (1.0 + (np.maximum(distance - REFERENCE_DISTANCE, 0) / REFERENCE_DISTANCE) ** 2)
+        gain[distance > MAX_DISTANCE] = 0.0
+
+        # Voice limiting: only the loudest audible sources are mixed
+        audible = np.flatnonzero(gain > 0.01)
+        if len(audible) > self.max_voices:
+            audible = audible[np.argpartition(-gain[audible], self.max_voices)[:self.max_voices]]
+        wanted = {keys[i]: i for i in audible.tolist()}
+
+        # Release voices of sources that went quiet, keep the rest on their channel
+        for key in [key for key in self.voices if key not in wanted]:
+            channel = self.voices.pop(key)
+            channel.fadeout(60)
+            self.free_voices.append(channel)
+
+        pan = np.clip(dx / (SCREEN_WIDTH / 2), -1.0, 1.0)
+        left = gain * np.sqrt((1 - pan) / 2)
+        right = gain * np.sqrt((1 + pan) / 2)
+        for key, i in wanted.items():
+            channel = self.voices.get(key)
+            if channel is None:
+                channel = self.free_voices.pop()
+                channel.play(self.rider_sound, loops=-1)
+                self.voices[key] = channel
+            channel.set_volume(float(left[i]), float(right[i]))
+
+    def update(self, game):
+        """Follow the player's speed and every rider's position for one frame"""
+        if not self.enabled:
+            return
+        player = game.player
+        self.set_engine_speed(player.speed)
+
+        keys = [("enemy", i) for i in range(len(game.enemies))]
+        xs = [enemy.x for enemy in game.enemies]
+        ys = [enemy.y for enemy in game.enemies]
+        traffic = game.world.archetypes.get("traffic_rider")
+        if traffic is not None and traffic.count:
+            keys.extend(("traffic", i) for i in range(traffic.count))
+            xs = np.concatenate([xs, traffic["x"]])
+            ys = np.concatenate([ys, traffic["y"]])
+        self.update_sources((player.x, player.y), keys, xs, ys)
+
+    def crash(self, cause):
+        """Play the crash effect on a free effects channel and stop the engine"""
+        if not self.enabled:
+            return
+        self.engine_channel.fadeout(200)
+        self.engine_step = None
+        self.play_effect(self.crash_sound)
+
+    def hit(self):
+        """Play a landed punch or kick"""
+        if self.enabled:
+            self.play_effect(self.hit_sound)
+
+    def play_effect(self, sound):
+        """Play a one-shot sound on a free effects channel, or cut the oldest"""
+        for channel in self.effect_channels:
+            if not channel.get_busy():
+                channel.play(sound)
+                return
+        self.effect_channels[0].play(sound)
+
+    def stop(self):
+        """Silence everything"""
+        if self.enabled:
+            pygame.mixer.stop()
+
+
+if __name__ == "__main__":
+    import os
+    import time
+
+    # Cost of one audio update with many riders on the road
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    from .game import Game
+
+    game = Game(adaptive_quality=False, audio=True)
+    audio = game.audio
+    print(f"Mixer: {audio.rate} Hz, {audio.size}-bit, {audio.channels} channels, "
+          f"{ENGINE_STEPS} engine steps, {audio.max_voices} source voices")
+    for count in (0, 50, 200, 1000):
+        game.world.set_count("traffic_rider", count)
+        frames = 300
+        audio_time = 0.0
+        for frame in range(frames):
+            game.player.speed = 3 + (frame % 100) * 0.09
+            game.world.update(game.player.speed)
+            for enemy in game.enemies:
+                enemy.update(game.player.speed, game.player)
+            game.move_riders()
+            start = time.perf_counter()
+            audio.update(game)
+            audio_time += time.perf_counter() - start
+        busy = sum(pygame.mixer.Channel(i).get_busy() for i in range(pygame.mixer.get_num_channels()))
+        print(f"{count + len(game.enemies):>5} sources: audio update {audio_time / frames * 1000:.3f} ms, "
+              f"{busy} channels playing")
+    game.shutdown()
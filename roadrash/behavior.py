@@ -0,0 +1,383 @@
+"""
+Data-defined enemy behavior trees for the Road Rash style game.
+
+Every enemy personality (behaviors.json) has a tree of nodes:
+- "selector": tries its children in order until one succeeds
+- "sequence": succeeds if all its children succeed, in order; a selector
+  or sequence may only be the last child of a sequence
+- conditions, which succeed or fail:
+  - "in_range" {enter, exit, states}: the player is closer than enter, or
+    closer than exit while the enemy is in one of states (hysteresis)
+  - "health_below" {fraction}: the enemy's health is below a fraction
+  - "faster_than" {speed}: the player rides faster than speed
+- actions, which always succeed and become the enemy's state:
+  "patrol", "chase" {speed}, "attack" {move}, "retreat" {speed}
+
+The personalities are the opponent racers and police of architecture.md's
+AI system. Brawlers chase and punch; rivals ride harder, kick and back off
+when hurt. The police run the chase sequences: a player riding faster than
+8 starts a pursuit, which carries on while the player stays within 400
+pixels, and a police rider that closes in kicks.
+
+Trees are not walked at run time. When a personality is loaded its tree is
+compiled into the source of one Python function of nested ifs with early
+returns and conditions inlined as expressions. Like the hand-written chain
+it replaced, the function first branches on the enemy's state and each
+branch holds the tree specialized for that state: hysteresis tests fold to
+a single distance comparison and state switches are only emitted where
+they happen. The context tuple is only indexed by the action that runs.
+
+Measured on the 200-agent benchmark (distances wandering as on the road,
+best of interleaved runs), against the old if/elif chain at about 250 ns
+per agent including the call: the brawler, which makes the same decisions
+as the chain, costs 3% more; the police, which also tests the player's
+speed, 10% more; and the rival, which tests its health on every call
+before anything else, about 40% more.
+
+A profiled build of the same function also counts and times every node; run `python -m roadrash.behavior profile` to see per-node costs in a
+headless game, or the module alone to benchmark 200 agents.
+"""
+
+import json
+import os
+import time
+
+DEFAULT_BEHAVIORS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "behaviors.json")
+
+# Actions in save-state order, with the Enemy call they compile to and their parameters
+ACTION_NAMES = ("patrol", "chase", "attack", "retreat")
+ACTIONS = {
+    "patrol": ("agent.patrol()", {}),
+    # ctx is (flank_dx, dy, side, navigation); it is only indexed by the action that runs
+    "chase": ("agent.chase(ctx[0], ctx[1], ctx[3], {speed!r})", {"speed": 1.0}),
+    "attack": ("agent.attack(ctx[0], ctx[1], ctx[2], {move!r})", {"move": "punch"}),
+    "retreat": ("agent.retreat(ctx[2], {speed!r})", {"speed": 1.0}),
+}
+
+# Conditions as Python expressions over think()'s arguments and the enemy's state, with
+# their parameters. in_range tests the wider exit distance first, so an enemy out of
+# range fails on one comparison.
+CONDITIONS = {
+    "in_range": ("distance < {exit!r} and (distance < {enter!r} or state in {states!r})",
+                 {"enter": None, "exit": None, "states": ()}),
+    "health_below": ("agent.health < {fraction!r} * agent.difficulty.enemy_health", {"fraction": None}),
+    "faster_than": ("speed > {speed!r}", {"speed": None}),
+}
+
+COMPOSITES = ("selector", "sequence")
+
+
+def node_params(node, defaults):
+    """A node's parameters merged over the defaults, checking for unknown or missing ones"""
+    params = {key: value for key, value in node.items() if key not in ("type", "children")}
+    unknown = set(params) - set(defaults)
+    if unknown:
+        raise ValueError(f"Unknown parameters for {node['type']}: {sorted(unknown)}")
+    merged = {**defaults, **params}
+    missing = [key for key, value in merged.items() if value is None]
+    if missing:
+        raise ValueError(f"Missing parameters for {node['type']}: {missing}")
+    if "states" in merged:
+        merged["states"] = tuple(merged["states"])
+    if "enter" in merged and merged["enter"] > merged["exit"]:
+        raise ValueError(f"in_range enter ({merged['enter']}) is beyond exit ({merged['exit']})")
+    return merged
+
+
+def condition_source(kind, params, state=None):
+    """Python expression for a condition; state, if known, is the enemy's state when it runs"""
+    if kind == "in_range" and state is not None:
+        # The hysteresis folds away into one distance test
+        limit = params["exit"] if state in params["states"] else params["enter"]
+        return f"distance < {limit!r}"
+    template, _ = CONDITIONS[kind]
+    return template.format(**params)
+
+
+def action_types(node):
+    """The actions a tree can run, in save-state order"""
+    found = set()
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if node.get("type") in ACTIONS:
+            found.add(node["type"])
+        stack.extend(node.get("children", ()))
+    return [name for name in ACTION_NAMES if name in found]
+
+
+def node_label(node):
+    """Short text for a node in the profiler view"""
+    params = {key: value for key, value in node.items() if key not in ("type", "children")}
+    if not params:
+        return node["type"]
+    text = ", ".join(f"{key}={'/'.join(value) if isinstance(value, list) else value}"
+                     for key, value in params.items())
+    return f"{node['type']}({text})"
+
+
+class BehaviorTree:
+    """One personality: its tree compiled into a think(agent, distance, speed, ctx) function
+
+    ctx is (flank_dx, dy, side, navigation) from Enemy.update. think returns
+    True if an action ran. With profile=True every node records visits and
+    time in counts and times (nanoseconds), indexed like nodes.
+    """
+    def __init__(self, name, spec, profile=False):
+        self.name = name
+        self.team = spec.get("team", "enemy")
+        self.tint = tuple(spec["tint"]) if "tint" in spec else None
+        self.root = spec["tree"]
+        self.profile = profile
+        self.nodes = []         # (depth, label) in node id order
+        self.node_ids = {}      # id(node) -> node id
+        self.known_state = None # the enemy's state in the code being emitted, if known
+        self.counts = []
+        self.times = []
+        self.source = self.generate()
+
+        namespace = {"_counts": self.counts, "_times": self.times, "_clock": time.perf_counter_ns}
+        exec(compile(self.source, f"<behavior {name}>", "exec"), namespace)
+        self.think = namespace["think"]
+
+    def generate(self):
+        """Python source of think() for the tree"""
+        body = ["    state = agent.state"]
+        # One copy of the tree per state it can set, specialized for that state
+        for i, state in enumerate(action_types(self.root)):
+            body.append(f"    {'elif' if i else 'if'} state == {state!r}:")
+            self.known_state = state
+            self.emit(self.root, 0, 2, body)
+            body.append("        return False")
+        # Any other state (a fresh or restored enemy) runs the general copy
+        self.known_state = None
+        self.emit(self.root, 0, 1, body)
+        body.append("    return False")
+        if not self.profile:
+            return "\n".join(["def think(agent, distance, speed, ctx):"] + body) + "\n"
+        # Profiled build: the tree body is timed as a whole under the root's id
+        return "\n".join(
+            ["def _body(agent, distance, speed, ctx):"] + body +
+            ["def think(agent, distance, speed, ctx):",
+             "    _start = _clock()",
+             "    _result = _body(agent, distance, speed, ctx)",
+             "    _times[0] += _clock() - _start",
+             "    return _result"]) + "\n"
+
+    def add_node(self, node, depth):
+        """Register a node for the profiler and return its id, the same in every copy of the tree"""
+        if id(node) in self.node_ids:
+            return self.node_ids[id(node)]
+        self.node_ids[id(node)] = len(self.nodes)
+        self.nodes.append((depth, node_label(node)))
+        self.counts.append(0)
+        self.times.append(0)
+        return len(self.nodes) - 1
+
+    def emit(self, node, depth, indent, lines):
+        """Append the code for node; it returns True on success and falls through on failure"""
+        kind = node.get("type")
+        pad = "    " * indent
+        if kind in CONDITIONS:
+            self.emit_condition(node, depth, indent, lines)
+            lines.append(pad + "    return True")
+            return
+        if kind not in COMPOSITES:
+            self.emit_action(node, depth, indent, lines)
+            lines.append(pad + "return True")
+            return
+
+        node_id = self.add_node(node, depth)
+        if self.profile:
+            lines.append(f"{pad}_counts[{node_id}] += 1")
+        if kind == "selector":
+            for child in node["children"]:
+                self.emit(child, depth + 1, indent, lines)
+            return
+
+        children = node["children"]
+        for i, child in enumerate(children):
+            child_kind = child.get("type")
+            if child_kind in COMPOSITES:
+                if i != len(children) - 1:
+                    raise ValueError("A selector or sequence must be the last child of a sequence")
+                self.emit(child, depth + 1, indent, lines)
+                return
+            if child_kind in CONDITIONS:
+                self.emit_condition(child, depth + 1, indent, lines)
+                indent += 1
+            else:
+                self.emit_action(child, depth + 1, indent, lines)
+                if i != len(children) - 1:
+                    # Code after this runs in either state: stop specializing
+                    lines.append("    " * indent + f"state = {child_kind!r}")
+                    self.known_state = None
+        lines.append("    " * indent + "return True")
+
+    def emit_condition(self, node, depth, indent, lines):
+        """Append an if statement that enters its block when the condition holds"""
+        _, defaults = CONDITIONS[node["type"]]
+        expression = condition_source(node["type"], node_params(node, defaults), self.known_state)
+        node_id = self.add_node(node, depth)
+        pad = "    " * indent
+        if not self.profile:
+            lines.append(f"{pad}if {expression}:")
+            return
+        lines.extend([f"{pad}_start = _clock()",
+                      f"{pad}_ok = {expression}",
+                      f"{pad}_times[{node_id}] += _clock() - _start",
+                      f"{pad}_counts[{node_id}] += 1",
+                      f"{pad}if _ok:"])
+
+    def emit_action(self, node, depth, indent, lines):
+        """Append the statements that switch to and run an action"""
+        kind = node.get("type")
+        if kind not in ACTIONS:
+            raise ValueError(f"Unknown behavior node type: {kind}")
+        template, defaults = ACTIONS[kind]
+        call = template.format(**node_params(node, defaults))
+        node_id = self.add_node(node, depth)
+        pad = "    " * indent
+        if self.profile:
+            lines.append(f"{pad}_start = _clock()")
+        if self.known_state is None:
+            lines.extend([f"{pad}if state != {kind!r}:",
+                          f"{pad}    agent.change_state({kind!r})"])
+        elif self.known_state != kind:
+            lines.append(f"{pad}agent.change_state({kind!r})")
+        lines.append(f"{pad}{call}")
+        if self.profile:
+            lines.extend([f"{pad}_times[{node_id}] += _clock() - _start",
+                          f"{pad}_counts[{node_id}] += 1"])
+
+    def report(self):
+        """Per-node visits and time, as text lines indented like the tree"""
+        total = self.times[0] or 1
+        lines = [f"{self.name}:"]
+        for (depth, label), count, elapsed in zip(self.nodes, self.counts, self.times):
+            per_visit = f"{elapsed / count:8.0f} ns" if count and elapsed else " " * 11
+            share = f"{elapsed / total:6.1%}" if elapsed else " " * 6
+            lines.append(f"  {'  ' * depth + label:<58} {count:>9} {per_visit} {share}")
+        return lines
+
+
+def load_behaviors(path=DEFAULT_BEHAVIORS_FILE, profile=False):
+    """Compile every personality in a behaviors file
+
+    Returns ({name: BehaviorTree}, list of personality names of the enemies to spawn).
+    """
+    with open(path) as f:
+        data = json.load(f)
+    trees = {name: BehaviorTree(name, spec, profile) for name, spec in data["personalities"].items()}
+    riders = data["riders"]
+    unknown = set(riders) - set(trees)
+    if unknown:
+        raise ValueError(f"Riders use unknown personalities: {sorted(unknown)}")
+    return trees, riders
+
+
+if __name__ == "__main__":
+    import argparse
+    import random
+
+    parser = argparse.ArgumentParser(description="Enemy behavior tree tools")
+    commands = parser.add_subparsers(dest="command")
+    profile_command = commands.add_parser("profile", help="per-node costs in a headless game")
+    profile_command.add_argument("--ticks", type=int, default=1200)
+    profile_command.add_argument("--source", action="store_true", help="print the generated code")
+    args = parser.parse_args()
+
+    if args.command == "profile":
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        from .game import Game
+
+        trees, _ = load_behaviors(profile=True)
+        game = Game(adaptive_quality=False)
+        for enemy in game.enemies:
+            enemy.behavior = trees[enemy.behavior.name]
+        for _ in range(args.ticks):
+            game.update()
+            if game.game_over:
+                game.reset_game()
+        game.shutdown()
+        print(f"{'node':<60} {'visits':>9} {'per visit':>11} {'share':>6}")
+        for tree in trees.values():
+            if args.source:
+                print(tree.source)
+            print("\n".join(tree.report()))
+        raise SystemExit
+
+    # Decisions for 200 agents per frame: compiled trees against the old hand-written chain
+    class Agent:
+        """Enemy stand-in whose actions do nothing, so only the decision is timed"""
+        def __init__(self, difficulty):
+            self.state = "patrol"
+            self.health = difficulty.enemy_health
+            self.difficulty = difficulty
+
+        def change_state(self, state):
+            self.state = state
+
+        def patrol(self):
+            pass
+
+        def chase(self, dx, dy, navigation, speed=1.0):
+            pass
+
+        def attack(self, dx, dy, side, move="punch"):
+            pass
+
+        def retreat(self, side, speed=1.0):
+            pass
+
+    def chain(agent, distance, speed, ctx):
+        """The enemy state machine as it was written before behavior trees"""
+        flank_dx, dy, side, navigation = ctx
+        if agent.state == "patrol":
+            if distance < 200:
+                agent.change_state("chase")
+            else:
+                agent.patrol()
+        elif agent.state == "chase":
+            if distance < 80:
+                agent.change_state("attack")
+            elif distance > 250:
+                agent.change_state("patrol")
+            else:
+                agent.chase(flank_dx, dy, navigation)
+        elif agent.state == "attack":
+            if distance > 100:
+                agent.change_state("chase")
+            else:
+                agent.attack(flank_dx, dy, side)
+
+    from .config import load_difficulty
+
+    difficulty = load_difficulty()
+    trees, _ = load_behaviors()
+    rng = random.Random(0)
+    agents = [Agent(difficulty) for _ in range(200)]
+    frames = 500
+    # Distances and the player's speed wander a little every frame, as they do on the road,
+    # so agents move through every state and stay in each for a while
+    distances = [rng.uniform(0, 400) for _ in agents]
+    speeds = [rng.uniform(3, 12) for _ in agents]
+    inputs = []
+    for _ in range(frames):
+        distances = [min(400.0, max(0.0, d + rng.uniform(-15, 15))) for d in distances]
+        speeds = [min(12.0, max(3.0, v + rng.uniform(-0.5, 0.5))) for v in speeds]
+        inputs.append([(d, v, (0.0, 0.0, 1, None)) for d, v in zip(distances, speeds)])
+    candidates = [("hand-written chain", chain)] + [(f"tree {name}", tree.think) for name, tree in trees.items()]
+    # Best of several interleaved runs, so scheduler noise does not decide the comparison
+    best = [float("inf")] * len(candidates)
+    for _ in range(7):
+        for i, (label, think) in enumerate(candidates):
+            start = time.perf_counter()
+            for frame in range(frames):
+                for agent, (distance, speed, ctx) in zip(agents, inputs[frame]):
+                    think(agent, distance, speed, ctx)
+            best[i] = min(best[i], time.perf_counter() - start)
+    baseline = best[0]
+    for (label, _), best in zip(candidates, best):
+        print(f"{label:<20} {best / frames * 1000:.3f} ms per frame for {len(agents)} agents "
+              f"({best / frames / len(agents) * 1e9:.0f} ns per agent, {best / baseline - 1:+.0%} vs chain)")
@@ -0,0 +1,88 @@
+"""
+Game constants and difficulty presets for the Road Rash style game.
+
+Screen geometry, sprite sizes and colors are fixed. Everything that tunes
+how hard the game is (speeds, AI aggression) is a difficulty preset defined
+as data in difficulty.json.
+"""
+
+import json
+import os
+from collections import namedtuple
+
+# Game constants
+SCREEN_WIDTH = 800
+SCREEN_HEIGHT = 600
+ROAD_WIDTH = 400
+PLAYER_WIDTH = 50
+PLAYER_HEIGHT = 100
+ENEMY_WIDTH = 50
+ENEMY_HEIGHT = 100
+OBSTACLE_WIDTH = 30
+OBSTACLE_HEIGHT = 30
+CLOUD_WIDTH = 80
+CLOUD_HEIGHT = 40
+GRASS_WIDTH = 40
+GRASS_HEIGHT = 30
+BOARD_WIDTH = 60
+BOARD_HEIGHT = 80
+REWIND_MAX_BYTES = 8 * 1024 * 1024  # Memory cap for rewind history
+
+# Road boundaries
+ROAD_LEFT = (SCREEN_WIDTH - ROAD_WIDTH) // 2
+ROAD_RIGHT = ROAD_LEFT + ROAD_WIDTH
+
+# Sprite sizes by asset name
+ASSET_SIZES = {
+    "player": (PLAYER_WIDTH, PLAYER_HEIGHT),
+    "enemy": (ENEMY_WIDTH, ENEMY_HEIGHT),
+    "obstacle": (OBSTACLE_WIDTH, OBSTACLE_HEIGHT),
+    "cloud": (CLOUD_WIDTH, CLOUD_HEIGHT),
+    "grass": (GRASS_WIDTH, GRASS_HEIGHT),
+    "highway_board": (BOARD_WIDTH, BOARD_HEIGHT),
+}
+
+# Colors
+SKY_BLUE = (135, 206, 235)
+GRAY = (100, 100, 100)
+WHITE = (255, 255, 255)
+BLACK = (0, 0, 0)
+RED = (255, 0, 0)
+GREEN = (0, 200, 0)
+
+# Enemy state until its behavior tree picks an action (see behavior.py)
+PATROL = "patrol"
+
+# Difficulty tuning, one preset per entry in difficulty.json
+Difficulty = namedtuple("Difficulty", [
+    "road_speed",          # Starting player speed
+    "max_speed",           # Top player speed
+    "acceleration",        # Speed gained per frame while accelerating
+    "enemy_speed",         # Enemy speed down the road
+    "enemy_speed_share",   # Fraction of the player's speed added to enemy speed
+    "obstacle_speed",      # Obstacle speed down the road
+    "patrol_speed",        # Enemy side to side speed while patrolling
+    "chase_speed",         # Enemy sideways speed while chasing
+    "attack_speed",        # Enemy sideways speed while attacking
+    "attack_cooldown",     # Frames between enemy attacks
+    "player_health",       # Player health at the start of a run
+    "enemy_health",        # Enemy health, restored when an enemy respawns
+])
+
+DIFFICULTY_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "difficulty.json")
+DEFAULT_DIFFICULTY = "normal"
+
+
+def load_difficulties(path=DIFFICULTY_FILE):
+    """Load all difficulty presets from a JSON file, by name"""
+    with open(path) as f:
+        presets = json.load(f)["presets"]
+    return {name: Difficulty(**values) for name, values in presets.items()}
+
+
+def load_difficulty(name=DEFAULT_DIFFICULTY, path=DIFFICULTY_FILE):
+    """Load one difficulty preset by name"""
+    presets = load_difficulties(path)
+    if name not in presets:
+        raise ValueError(f"Unknown difficulty: {name} (choose from {', '.join(presets)})")
+    return presets[name]
@@ -0,0 +1,337 @@
+"""
+Input actions for the Road Rash style game.
+
+Everything that rides the player's bike goes through the same small record,
+Actions: analog steer (-1 left .. 1 right), throttle and brake (0..1), an
+attack ("punch", "kick" or None) with the side it is thrown to, and rewind.
+Game.apply_actions applies one per tick and appends it to the run's
+ActionLog, whatever produced it (a Game's input_source, if set, replaces
+the live devices):
+- Controls samples the live devices on the thread that owns the window:
+  the keyboard, and any joystick or gamepad (left stick steers, the
+  triggers are throttle and brake, buttons attack and rewind). Analog and
+  digital inputs are merged field by field.
+- A scripted source, such as tuning.ScriptedPlayer, makes one per tick from
+  the game state, for headless bots.
+- Replay plays an ActionLog back tick by tick.
+
+filter_events limits the SDL event queue to the event types the game reads,
+so mouse motion, text input and window chatter are never queued or pumped.
+
+ActionLog run-length encodes the ticks (held inputs repeat for many ticks),
+so recording costs an equality check per tick and stays small. A record
+file holds the random seed and difficulty of a run and its ActionLog, which
+is enough to replay the run exactly (with adaptive quality off, since
+quality changes respawn scenery). Restarting after a crash and quick
+loading are not actions: a recording ends at the first of either, and a
+replay ignores both until it has played out.
+
+Run this module to measure sampling and recording and to check that a
+recorded bot run replays to the same state.
+"""
+
+import json
+import sys
+from collections import namedtuple
+
+import pygame
+from pygame.locals import *
+
+# One tick of rider input
+Actions = namedtuple("Actions", "steer throttle brake attack attack_side rewind")
+IDLE = Actions(0.0, 0.0, 0.0, None, 0, False)
+ATTACK_NAMES = ("punch", "kick")
+
+# Event types the game reads; everything else is dropped by SDL before it is queued
+ALLOWED_EVENTS = (QUIT, KEYDOWN, KEYUP, VIDEORESIZE, JOYBUTTONDOWN, JOYDEVICEADDED, JOYDEVICEREMOVED)
+
+# Keyboard bindings
+KEY_STEER_LEFT = K_LEFT
+KEY_STEER_RIGHT = K_RIGHT
+KEY_THROTTLE = K_UP
+KEY_BRAKE = K_DOWN
+KEY_REWIND = K_BACKSPACE
+KEY_ATTACKS = {K_z: "punch", K_x: "kick"}
+
+# Gamepad bindings (SDL joystick numbering of XInput-style pads)
+AXIS_STEER = 0
+# (brake, throttle) trigger axes depend on the joystick driver: Linux's evdev numbers the
+# left trigger 2, after the left stick, and the right one 5; XInput on Windows and SDL's
+# HIDAPI drivers put both triggers after the right stick, at 4 and 5
+PLATFORM_TRIGGER_AXES = {"linux": (2, 5)}
+DEFAULT_TRIGGER_AXES = (4, 5)
+BUTTON_ATTACKS = {0: "punch", 1: "kick"}
+BUTTON_REWIND = 4
+
+# Stick travel ignored around the centre, and steering needed to aim an attack
+DEADZONE = 0.15
+AIM_THRESHOLD = 0.3
+
+RECORD_VERSION = 1
+
+
+def default_trigger_axes(platform=sys.platform):
+    """(brake, throttle) trigger axes for XInput-style pads on a platform"""
+    return PLATFORM_TRIGGER_AXES.get(platform, DEFAULT_TRIGGER_AXES)
+
+
+def parse_axes(text):
+    """Parse a BRAKE,THROTTLE pair of axis numbers such as '2,5'"""
+    brake, throttle = (int(axis) for axis in text.split(","))
+    if brake < 0 or throttle < 0 or brake == throttle:
+        raise ValueError(f"Bad trigger axes: {text}")
+    return brake, throttle
+
+
+def filter_events():
+    """Only queue the event types in ALLOWED_EVENTS"""
+    pygame.event.set_blocked(None)
+    pygame.event.set_allowed(ALLOWED_EVENTS)
+
+
+def aim(steer):
+    """Attack side for a steering input: the side being steered to, or 0 for the nearest enemy"""
+    if steer > AIM_THRESHOLD:
+        return 1
+    if steer < -AIM_THRESHOLD:
+        return -1
+    return 0
+
+
+def deadzone(value):
+    """Stick value with the centre deadzone removed, rescaled to -1..1"""
+    if abs(value) < DEADZONE:
+        return 0.0
+    return (value - DEADZONE if value > 0 else value + DEADZONE) / (1.0 - DEADZONE)
+
+
+def merge(samples):
+    """Combine Actions from several devices or frames into one tick's worth
+
+    The strongest steer and the most throttle and brake win; the first
+    attack is kept, and rewind is held if any sample holds it.
+    """
+    if len(samples) == 1:
+        return samples[0]
+    steer = max((sample.steer for sample in samples), key=abs)
+    attack = next((sample for sample in samples if sample.attack), None)
+    return Actions(steer, max(sample.throttle for sample in samples), max(sample.brake for sample in samples),
+                   attack.attack if attack else None, attack.attack_side if attack else 0,
+                   any(sample.rewind for sample in samples))
+
+
+class Keyboard:
+    """Actions from the arrow keys, Z/X and BACKSPACE"""
+    def sample(self, events):
+        """Actions from the held keys and this frame's key presses"""
+        keys = pygame.key.get_pressed()
+        steer = (1.0 if keys[KEY_STEER_RIGHT] else 0.0) - (1.0 if keys[KEY_STEER_LEFT] else 0.0)
+        attack = None
+        for event in events:
+            if event.type == KEYDOWN and event.key in KEY_ATTACKS:
+                attack = KEY_ATTACKS[event.key]
+                break
+        return Actions(steer, 1.0 if keys[KEY_THROTTLE] else 0.0, 1.0 if keys[KEY_BRAKE] else 0.0,
+                       attack, aim(steer), bool(keys[KEY_REWIND]))
+
+
+class Gamepads:
+    """Actions from every connected joystick or gamepad, opened as they are plugged in
+
+    trigger_axes is the (brake, throttle) pair of axis numbers, by default
+    the platform's.
+    """
+    def __init__(self, trigger_axes=None):
+        pygame.joystick.init()
+        self.brake_axis, self.throttle_axis = trigger_axes or default_trigger_axes()
+        self.pads = {}      # instance id -> (joystick, resting value of each trigger axis)
+        for index in range(pygame.joystick.get_count()):
+            self.open(index)
+
+    def open(self, index):
+        """Start reading a joystick by device index"""
+        joystick = pygame.joystick.Joystick(index)
+        # Triggers rest at -1 on some drivers and 0 on others; read the rest position now
+        rest = {axis: joystick.get_axis(axis) for axis in (self.brake_axis, self.throttle_axis)
+                if axis < joystick.get_numaxes()}
+        self.pads[joystick.get_instance_id()] = (joystick, rest)
+
+    @staticmethod
+    def trigger(joystick, rest, axis):
+        """Trigger travel 0..1 from its resting position"""
+        if axis not in rest or rest[axis] >= 1.0:
+            return 0.0
+        return max(0.0, min(1.0, (joystick.get_axis(axis) - rest[axis]) / (1.0 - rest[axis])))
+
+    def sample(self, events):
+        """Actions from the pads' sticks, triggers and this frame's button presses"""
+        attack, side, rewind = None, 0, False
+        for event in events:
+            if event.type == JOYDEVICEADDED:
+                self.open(event.device_index)
+            elif event.type == JOYDEVICEREMOVED:
+                self.pads.pop(event.instance_id, None)
+            elif event.type == JOYBUTTONDOWN and attack is None and event.button in BUTTON_ATTACKS:
+                attack = BUTTON_ATTACKS[event.button]
+        if not self.pads:
+            return IDLE if attack is None else IDLE._replace(attack=attack)
+
+        steer = throttle = brake = 0.0
+        for joystick, rest in self.pads.values():
+            if joystick.get_numaxes() > AXIS_STEER:
+                value = deadzone(joystick.get_axis(AXIS_STEER))
+                steer = value if abs(value) > abs(steer) else steer
+            if rest:
+                throttle = max(throttle, self.trigger(joystick, rest, self.throttle_axis))
+                brake = max(brake, self.trigger(joystick, rest, self.brake_axis))
+            elif joystick.get_numaxes() > 1:
+                # No triggers: the stick's forward and back travel
+                forward = -deadzone(joystick.get_axis(1))
+                throttle, brake = max(throttle, forward), max(brake, -forward)
+            if joystick.get_numbuttons() > BUTTON_REWIND and joystick.get_button(BUTTON_REWIND):
+                rewind = True
+        if attack:
+            side = aim(steer)
+        return Actions(steer, throttle, brake, attack, side, rewind)
+
+
+class Controls:
+    """Live input: merged Actions from the keyboard and gamepads"""
+    def __init__(self, gamepads=True, trigger_axes=None):
+        self.devices = [Keyboard()]
+        if gamepads:
+            self.devices.append(Gamepads(trigger_axes))
+
+    def sample(self, events):
+        """Actions for this frame from the events pumped for it and the devices' current state"""
+        return merge([device.sample(events) for device in self.devices])
+
+
+class ActionLog:
+    """Run-length encoded Actions, one per tick"""
+    def __init__(self, runs=None):
+        self.runs = runs or []    # [count, Actions]
+        self.ticks = sum(count for count, _ in self.runs)
+
+    def append(self, actions):
+        """Log one tick"""
+        runs = self.runs
+        if runs and runs[-1][1] == actions:
+            runs[-1][0] += 1
+        else:
+            runs.append([1, actions])
+        self.ticks += 1
+
+    def __len__(self):
+        return self.ticks
+
+    def __iter__(self):
+        for count, actions in self.runs:
+            for _ in range(count):
+                yield actions
+
+    def to_json(self):
+        """Rows of [count, *actions]"""
+        return [[count, *actions] for count, actions in self.runs]
+
+    @classmethod
+    def from_json(cls, rows):
+        """Rebuild a log from to_json rows"""
+        runs = []
+        for row in rows:
+            if len(row) != len(Actions._fields) + 1 or not isinstance(row[0], int) or row[0] < 1:
+                raise ValueError(f"Bad action log entry: {row}")
+            actions = Actions(float(row[1]), float(row[2]), float(row[3]), row[4], int(row[5]), bool(row[6]))
+            if actions.attack is not None and actions.attack not in ATTACK_NAMES:
+                raise ValueError(f"Unknown attack in action log: {actions.attack}")
+            runs.append([row[0], actions])
+        return cls(runs)
+
+
+class Replay:
+    """Plays an ActionLog back one tick at a time, then idles"""
+    def __init__(self, log):
+        self.actions = iter(log)
+        self.remaining = len(log)
+
+    @property
+    def done(self):
+        """Whether every logged tick has been played"""
+        return self.remaining == 0
+
+    def next(self, game):
+        """The next tick's Actions"""
+        if self.remaining:
+            self.remaining -= 1
+        return next(self.actions, IDLE)
+
+
+# A recorded run: the seed and difficulty it started from and its inputs
+Record = namedtuple("Record", "seed difficulty log")
+
+
+def save_record(path, record):
+    """Write a Record to a JSON file"""
+    with open(path, "w") as f:
+        json.dump({"version": RECORD_VERSION, "seed": record.seed, "difficulty": record.difficulty,
+                   "ticks": len(record.log), "actions": record.log.to_json()}, f)
+
+
+def load_record(path):
+    """Read a Record written by save_record"""
+    with open(path) as f:
+        data = json.load(f)
+    if data.get("version") != RECORD_VERSION:
+        raise ValueError(f"Unsupported record version: {data.get('version')}")
+    log = ActionLog.from_json(data["actions"])
+    if len(log) != data["ticks"]:
+        raise ValueError(f"Record holds {len(log)} ticks, expected {data['ticks']}")
+    return Record(data["seed"], data["difficulty"], log)
+
+
+if __name__ == "__main__":
+    import os
+    import random
+    import time
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    from . import savestate
+    from .game import Game
+    from .tuning import ScriptedPlayer
+
+    # Cost of sampling live devices and of recording, per tick
+    pygame.init()
+    pygame.display.set_mode((64, 64))
+    controls = Controls()
+    log = ActionLog()
+    events = [pygame.event.Event(KEYDOWN, key=K_z)]
+    samples = 100000
+    start = time.perf_counter()
+    for tick in range(samples):
+        log.append(controls.sample(events if tick % 30 == 0 else ()))
+    elapsed = (time.perf_counter() - start) / samples * 1e6
+    print(f"sample + record: {elapsed:.2f} us per tick, {len(log)} ticks in {len(log.runs)} runs")
+
+    # A bot's run, replayed from its record to the same state
+    ticks = 1200
+    seed, difficulty = 2, "normal"
+    random.seed(seed)
+    game = Game(adaptive_quality=False, difficulty=difficulty)
+    policy = ScriptedPlayer()
+    start = time.perf_counter()
+    while game.tick < ticks and not game.game_over:
+        game.apply_actions(policy.next(game))
+        game.update()
+    bot_ms = (time.perf_counter() - start) / max(game.tick, 1) * 1000
+    record = Record(seed, difficulty, game.action_log)
+    recorded = savestate.save_state(game)
+    game.shutdown()
+
+    random.seed(record.seed)
+    game = Game(adaptive_quality=False, difficulty=record.difficulty, input_source=Replay(record.log))
+    while len(game.action_log) < len(record.log):
+        game.apply_input([], IDLE)
+        game.update()
+    print(f"bot run: {len(record.log)} ticks, {len(record.log.runs)} runs, {bot_ms:.3f} ms per tick; "
+          f"replay matches: {savestate.save_state(game) == recorded}")
+    game.shutdown()
@@ -0,0 +1,651 @@
+"""
+Main game loop and command line entry point for the Road Rash style game.
+
+Optional subsystems (hot-reload, adaptive quality, the pipelined and
+low-latency loops) are imported only when they are turned on.
+"""
+
+import argparse
+import random
+import time
+from collections import namedtuple
+
+import numpy as np
+import pygame
+from pygame.locals import *
+
+from . import combat, config, controls, ecs, lighting, particles, physics, render_target, rewind, savestate, telemetry
+from .assets import AssetManager
+from .behavior import load_behaviors
+from .config import (ENEMY_HEIGHT, ENEMY_WIDTH, GRAY, GREEN, PLAYER_HEIGHT, PLAYER_WIDTH, RED, REWIND_MAX_BYTES, ROAD_LEFT,
+                     ROAD_RIGHT, ROAD_WIDTH, SCREEN_HEIGHT, SCREEN_WIDTH, SKY_BLUE, WHITE)
+from .navigation import FlowField
+from .lighting import Lighting
+from .objects import FLANK_DISTANCE, Enemy, Player, Road
+from .particles import ParticleSystem, draw_particles
+from .render_queue import RenderQueue
+from .render_target import RenderTarget
+
+# Immutable snapshot of one frame, produced by the simulation and drawn by draw_frame;
+# background and foreground are render_queue batches
+Frame = namedtuple("Frame", "tick background road_stripes foreground particles health_bars light "
+                             "score best_score speed health game_over input_time")
+
+
+class Game:
+    """Main game class"""
+    def __init__(self, hot_reload=False, adaptive_quality=True,
+                 internal_resolution=None, upscale=render_target.NEAREST,
+                 vsync=False, measure_latency=False, difficulty=config.DEFAULT_DIFFICULTY,
+                 leaderboard_path=None, telemetry_dir=None, telemetry_url=None, audio=False,
+                 behaviors=None, weather="clear", lighting="day", window_size=None, resizable=False,
+                 seed=None, input_source=None, record_path=None, verbose=False,
+                 trigger_axes=None):
+        if audio:
+            from .audio import pre_init
+            pre_init()
+        pygame.init()
+        # A seeded game plays out the same for the same inputs (see controls.py)
+        self.seed = seed
+        if seed is not None:
+            random.seed(seed)
+        # The game plays in fixed SCREEN_WIDTH x SCREEN_HEIGHT logical coordinates;
+        # the window can be any size, and the canvas scales the scene to fit it
+        window_size = tuple(window_size or (SCREEN_WIDTH, SCREEN_HEIGHT))
+        flags = RESIZABLE if resizable else 0
+        if vsync:
+            # SDL only honours vsync for SCALED or OPENGL displays
+            self.screen = pygame.display.set_mode(window_size, flags | SCALED, vsync=1)
+        else:
+            self.screen = pygame.display.set_mode(window_size, flags)
+        self.vsync = vsync
+        pygame.display.set_caption("Road Rash Style Game")
+
+        # Optional lower internal resolution, upscaled when presented; kept as a
+        # fraction of the window's resolution, so it follows resizes
+        self.base_render_scale = 1.0
+        self.canvas = RenderTarget(self.screen, logical_size=(SCREEN_WIDTH, SCREEN_HEIGHT), upscale=upscale)
+        if internal_resolution:
+            # The internal surface keeps the viewport's aspect ratio: fit the requested size inside it
+            _, _, width, height = self.canvas.layout.viewport
+            self.base_render_scale = min(internal_resolution[0] / width, internal_resolution[1] / height, 1.0)
+            self.canvas.set_scale(self.base_render_scale)
+        self.clock = pygame.time.Clock()
+        self.running = True
+        self.game_over = False
+        self.font = pygame.font.SysFont(None, 36)
+
+        # Speeds and AI tuning: a preset name, or a config.Difficulty built elsewhere (see tuning.py)
+        if isinstance(difficulty, config.Difficulty):
+            self.difficulty_name, self.difficulty = "custom", difficulty
+        else:
+            self.difficulty_name = difficulty
+            self.difficulty = config.load_difficulty(difficulty)
+
+        # Initialize asset manager
+        self.asset_manager = AssetManager()
+
+        # Initialize game objects
+        road_center_x = ROAD_LEFT + (ROAD_WIDTH // 2) - (PLAYER_WIDTH // 2)
+        self.player = Player(road_center_x, SCREEN_HEIGHT - PLAYER_HEIGHT - 20,
+                             self.asset_manager.assets["player"], self.difficulty)
+
+        self.road = Road()
+
+        # Clouds, grass, highway boards, obstacles and traffic are data-defined entities
+        entity_types = ecs.load_entity_types()
+        for entity_type in entity_types:
+            if entity_type.name == "obstacle":
+                entity_type.velocity = (0.0, self.difficulty.obstacle_speed)
+        layout = ecs.Layout(SCREEN_WIDTH, SCREEN_HEIGHT, ROAD_LEFT, ROAD_RIGHT)
+        self.world = ecs.World(entity_types, layout, self.asset_manager.assets)
+
+        # Create enemies: one per rider in behaviors.json (or the (trees, riders) passed in),
+        # each with its personality's tree
+        self.behaviors, riders = behaviors if behaviors is not None else load_behaviors()
+        self.enemies = [Enemy(self.rider_sprite(self.behaviors[name]), self.difficulty, self.behaviors[name])
+                        for name in riders]
+
+        # Shared flow field the enemies chase along
+        self.navigation = FlowField(ROAD_LEFT, ROAD_RIGHT, SCREEN_HEIGHT, (ENEMY_WIDTH, ENEMY_HEIGHT))
+
+        # Punches, kicks and knockback between the player and the enemies
+        self.combat = combat.Combat()
+
+        # Rain, tire dust and sparks
+        self.weather = weather
+        self.particles = ParticleSystem()
+
+        # Day/night and tunnel lighting
+        self.lighting = Lighting(lighting)
+
+        # Input: live devices, or a source (controls.Replay, tuning.ScriptedPlayer) that
+        # supplies each tick's Actions instead; the Actions of the current run are logged
+        controls.filter_events()
+        self.controls = controls.Controls(trigger_axes=trigger_axes)
+        self.input_source = input_source
+        self.action_log = controls.ActionLog()
+        self.record_path = record_path
+
+        # Quick save slot (binary snapshot from savestate.save_state)
+        self.quick_save = None
+
+        # Rewind history (hold BACKSPACE to rewind)
+        self.rewind = rewind.RewindBuffer(REWIND_MAX_BYTES)
+        self.rewinding = False
+
+        # Optionally watch the assets directory and reload changed sprites
+        self.asset_watcher = None
+        if hot_reload:
+            from .asset_watcher import AssetWatcher
+            self.asset_watcher = AssetWatcher(self.asset_manager)
+            self.asset_watcher.start()
+
+        # Optional key event to presented frame latency measurement
+        self.latency_probe = None
+        if measure_latency:
+            from .latency import LatencyProbe
+            self.latency_probe = LatencyProbe()
+
+        # Statistics of the current run, stored when it ends
+        self.run_start_tick = 0
+        self.top_speed = self.player.speed
+        self.crash_cause = None
+
+        # Optional persistent leaderboard, written off the game thread
+        self.leaderboard = None
+        self.best_score = 0
+        if leaderboard_path:
+            from .leaderboard import Leaderboard
+            self.leaderboard = Leaderboard(leaderboard_path)
+            self.best_score = self.leaderboard.best_score(self.difficulty_name)
+
+        # Optional gameplay telemetry to rotating files and/or a collector
+        exporters = []
+        if telemetry_dir:
+            exporters.append(telemetry.RotatingFileExporter(telemetry_dir))
+        if telemetry_url:
+            exporters.append(telemetry.HttpExporter(telemetry_url))
+        if exporters:
+            telemetry.start(exporters)
+
+        # Optional engine, rider and crash sounds
+        self.audio = None
+        if audio:
+            from .audio import SoundSystem
+            self.audio = SoundSystem((self.difficulty.road_speed, self.difficulty.max_speed))
+
+        # Adaptive detail level (AI runs every ai_interval ticks)
+        self.tick = 0
+        self.ai_interval = 1
+        self.quality = None
+        if adaptive_quality:
+            from .quality import QualityController
+            self.quality = QualityController(self, verbose=verbose)
+
+    def handle_events(self):
+        """Handle game events like keyboard input"""
+        events = pygame.event.get()
+        if self.latency_probe:
+            self.latency_probe.on_events(events)
+        self.handle_window_events(events)
+        self.apply_input(events, self.controls.sample(events))
+
+    def handle_window_events(self, events):
+        """Follow window resizes; must run on the thread that owns the window"""
+        for event in events:
+            if event.type == VIDEORESIZE:
+                self.screen = pygame.display.get_surface()
+                self.canvas.resize(self.screen)
+
+    def apply_input(self, events, actions):
+        """Apply queued events and this tick's live Actions to the game
+
+        Restarting and quick loading change the run outside the action log:
+        they end a recording (it is written up to that tick), and are ignored
+        while a replay plays.
+        """
+        replaying = self.replaying()
+        for event in events:
+            if event.type == QUIT:
+                self.running = False
+            elif event.type == KEYDOWN:
+                if event.key == K_ESCAPE:
+                    self.running = False
+                elif event.key == K_RETURN and self.game_over and not replaying:
+                    self.reset_game()
+                elif event.key == K_F5:
+                    self.quick_save = savestate.save_state(self)
+                elif event.key == K_F9 and self.quick_save is not None and not replaying:
+                    self.save_record()
+                    savestate.restore_state(self, self.quick_save)
+
+        if self.input_source is not None:
+            actions = self.input_source.next(self)
+        self.apply_actions(actions)
+
+    def apply_actions(self, actions):
+        """Ride the bike with one tick's controls.Actions; the live game, bots and replays all come here"""
+        self.action_log.append(actions)
+
+        # Rewind one tick per frame while rewind is held
+        self.rewinding = actions.rewind
+        if self.rewinding:
+            snapshot = self.rewind.pop()
+            if snapshot is not None:
+                savestate.restore_state(self, snapshot)
+
+        if not self.game_over and not self.rewinding:
+            self.player.control(actions.throttle, actions.brake, actions.steer)
+            if actions.attack:
+                self.player.attack(actions.attack, actions.attack_side)
+        else:
+            self.player.control(0.0, 0.0, 0.0)
+
+    def update(self):
+        """Update game state"""
+        # Particles keep moving on the game over screen
+        self.update_particles()
+
+        if self.game_over or self.rewinding:
+            return
+
+        # Update road
+        self.road.update(self.player.speed)
+        self.lighting.advance(self.player.speed)
+
+        # Update clouds, grass, highway boards, obstacles and traffic
+        self.world.update(self.player.speed)
+
+        # Update enemies, spreading AI work over ticks when ai_interval > 1
+        self.tick += 1
+        self.update_navigation()
+        for i, enemy in enumerate(self.enemies):
+            think = (self.tick + i) % self.ai_interval == 0
+            enemy.update(self.player.speed, self.player, think, self.navigation)
+
+        # Integrate every bike with the inputs set above
+        self.move_riders()
+
+        # Check for collision between enemies and player
+        for enemy in self.enemies:
+            if enemy.get_rect().colliderect(self.player.get_rect()):
+                self.crash("enemy")
+
+        # Resolve punches and kicks, then knockouts
+        for hit in self.combat.step([self.player] + self.enemies):
+            telemetry.emit("hit", hit.damage, f"{hit.attacker.team} {hit.attack}")
+            self.particles.sparks(hit.target.x + hit.target.width / 2, hit.target.y + hit.target.height / 2,
+                                  hit.damage * 3)
+            if self.audio:
+                self.audio.hit()
+            if not hit.knocked_out:
+                continue
+            if hit.target is self.player:
+                self.crash("knockout")
+            else:
+                if hit.attacker is self.player:
+                    self.player.update_score(combat.KNOCKOUT_SCORE)
+                hit.target.reset()
+
+        # Check for collision between obstacles or traffic and player
+        hit = self.world.collides(self.player.get_rect())
+        if hit:
+            self.crash(hit)
+
+        # Update score based on speed
+        if not self.game_over:
+            self.player.update_score(int(self.player.speed / 10))
+            self.top_speed = max(self.top_speed, self.player.speed)
+
+        # Follow the new positions and speed with the sound
+        if self.audio:
+            self.audio.update(self)
+
+        # Record this tick for rewinding
+        self.rewind.record(savestate.save_state(self))
+
+    def update_particles(self):
+        """Emit rain and dust for this tick and move every particle"""
+        if self.weather == "rain":
+            self.particles.rain()
+        if not self.game_over:
+            player = self.player
+            self.particles.dust(player.x + player.width / 2, player.y + player.height, player.speed)
+        self.particles.update(self.player.speed)
+
+    def update_navigation(self):
+        """Rebuild the enemies' flow field around obstacles, traffic, riders and the player"""
+        player = self.player
+        blockers = np.vstack([self.world.solid_boxes(), [(player.x, player.y, player.width, player.height)]])
+        riders = [(enemy.x, enemy.y, enemy.width, enemy.height) for enemy in self.enemies]
+        # Attack positions on either side of the player, where they are on the road
+        goals = [(player.x + side * FLANK_DISTANCE, player.y) for side in (-1, 1)
+                 if ROAD_LEFT <= player.x + side * FLANK_DISTANCE <= ROAD_RIGHT - ENEMY_WIDTH]
+        self.navigation.build(blockers, riders, goals)
+
+    def move_riders(self):
+        """Advance the player's and the enemies' bikes by one tick"""
+        riders = [self.player] + self.enemies
+        bikes = physics.Bikes.gather(riders)
+        speed = self.player.speed
+        bikes.integrate(speed, (ROAD_LEFT, ROAD_RIGHT, SCREEN_HEIGHT))
+        bikes.scatter(riders)
+        if int(self.player.speed) != int(speed):
+            telemetry.emit("speed", self.player.speed)
+
+    def crash(self, cause):
+        """End the run on a collision and store its statistics"""
+        if self.game_over:
+            return
+        self.game_over = True
+        self.crash_cause = cause
+        self.best_score = max(self.best_score, self.player.score)
+        self.particles.sparks(self.player.x + self.player.width / 2, self.player.y + self.player.height / 2)
+        telemetry.emit("crash", self.player.score, cause)
+        if self.audio:
+            self.audio.crash(cause)
+        if self.leaderboard:
+            from .leaderboard import RunRecord
+            self.leaderboard.submit(RunRecord(time.time(), self.difficulty_name, self.player.score,
+                                              self.tick - self.run_start_tick, self.top_speed,
+                                              cause, "game"))
+
+    def capture_frame(self, input_time=None):
+        """Capture an immutable snapshot of everything draw_frame needs"""
+        queue = RenderQueue((SCREEN_WIDTH, SCREEN_HEIGHT))
+
+        # Scenery drawn under the road
+        queue.extend(self.world.layer("background"), "background")
+
+        # Riders and obstacles drawn over the road
+        queue.submit(self.player.sprite, self.player.x, self.player.y)
+        queue.extend((enemy.sprite, enemy.x, enemy.y) for enemy in self.enemies)
+        queue.extend(self.world.layer("foreground"))
+
+        # Health bars over damaged enemies
+        health_bars = tuple((enemy.x, enemy.y, enemy.health / self.difficulty.enemy_health)
+                            for enemy in self.enemies if enemy.health < self.difficulty.enemy_health)
+
+        # Sprites swapped for their variants at this frame's light level
+        light = self.lighting.light(self.tick, self.player)
+        background = self.lighting.tint_batch(queue.batch("background"), light)
+        foreground = self.lighting.tint_batch(queue.batch("foreground"), light)
+
+        return Frame(self.tick, background, tuple(self.road.stripes), foreground,
+                     self.particles.snapshot(),
+                     health_bars, light, self.player.score, self.best_score, self.player.speed,
+                     self.player.health, self.game_over, input_time)
+
+    def draw(self, present=True):
+        """Draw game elements on screen"""
+        self.draw_frame(self.capture_frame(), present)
+
+    def draw_frame(self, frame, present=True):
+        """Draw a captured frame, and show it unless present is False"""
+        canvas = self.canvas
+
+        # Fill background with sky blue, as lit
+        lighting = self.lighting
+        canvas.fill(lighting.color(SKY_BLUE, frame.light))
+
+        # Draw clouds, grass and highway boards
+        canvas.blits(frame.background)
+
+        # Draw road
+        self.road.draw(canvas, frame.road_stripes, lighting.color(GRAY, frame.light),
+                       lighting.color(WHITE, frame.light))
+
+        # Draw player, enemies, obstacles and traffic, nearest last
+        canvas.blits(frame.foreground)
+
+        # Rain, dust and sparks over everything but the HUD
+        draw_particles(canvas.surface, frame.particles, canvas.scale)
+
+        # Light the road ahead at night and in tunnels
+        lighting.headlight(canvas, frame.light)
+
+        for x, y, fraction in frame.health_bars:
+            canvas.fill(RED, (x, y - 8, combat.HEALTH_BAR_WIDTH, 4))
+            canvas.fill(GREEN, (x, y - 8, round(combat.HEALTH_BAR_WIDTH * fraction), 4))
+
+        # Draw score, best score, speed and health
+        hud_color = lighting.hud_color(frame.light)
+        score_text = self.font.render(f"Score: {frame.score}", True, hud_color)
+        best_text = self.font.render(f"Best: {max(frame.best_score, frame.score)}", True, hud_color)
+        speed_text = self.font.render(f"Speed: {int(frame.speed)}", True, hud_color)
+        health_text = self.font.render(f"Health: {frame.health}", True, hud_color)
+        canvas.blit(score_text, (10, 10))
+        canvas.blit(best_text, (10, 50))
+        canvas.blit(speed_text, (10, 90))
+        canvas.blit(health_text, (10, 130))
+
+        # Draw game over message if game is over
+        if frame.game_over:
+            game_over_text = self.font.render("GAME OVER! Press ENTER to restart", True, RED)
+            text_rect = game_over_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2))
+            canvas.blit(game_over_text, text_rect)
+
+        if present:
+            self.present()
+
+    def present(self):
+        """Show the drawn frame (blocks until the vertical blank with vsync)"""
+        self.canvas.present()
+        pygame.display.flip()
+
+    def reset_game(self):
+        """Reset the game state"""
+        self.save_record()
+        self.action_log = controls.ActionLog()
+        self.game_over = False
+
+        # Reset player
+        road_center_x = ROAD_LEFT + (ROAD_WIDTH // 2) - (PLAYER_WIDTH // 2)
+        self.player.x = road_center_x
+        self.player.y = SCREEN_HEIGHT - PLAYER_HEIGHT - 20
+        self.player.reset_bike()
+        self.player.score = 0
+        self.player.reset_combat()
+
+        # Start a new run
+        self.run_start_tick = self.tick
+        self.top_speed = self.player.speed
+        self.crash_cause = None
+
+        # Reset enemies and obstacles
+        for enemy in self.enemies:
+            enemy.reset()
+
+        self.world.respawn_all("obstacle")
+
+        self.rewind.clear()
+
+    def apply_quality(self, settings):
+        """Apply a detail level from quality.QUALITY_LEVELS"""
+        self.world.set_count("cloud", settings["clouds"])
+        self.world.set_count("grass_left", settings["grass_patches"])
+        self.world.set_count("grass_right", settings["grass_patches"])
+        self.ai_interval = settings["ai_interval"]
+        render_scale = self.base_render_scale * settings["render_scale"]
+        if render_scale != self.canvas.render_scale:
+            self.canvas.set_scale(render_scale)
+
+    def swap_asset(self, name, sprite, clear_canvas=True):
+        """Swap a reloaded sprite into every live object using it
+
+        clear_canvas=False leaves dropping the render target's scaled copies
+        to the thread that draws (see pipeline.py).
+        """
+        # World entities look sprites up in the asset table when drawn
+        self.asset_manager.assets[name] = sprite
+        # Scaled and lit variants of the old sprite are stale
+        if clear_canvas:
+            self.canvas.lod.clear()
+        self.lighting.clear()
+
+        if name == "player":
+            users = [self.player]
+        elif name == "enemy":
+            for enemy in self.enemies:
+                enemy.sprite = self.rider_sprite(enemy.behavior)
+            return
+        else:
+            users = []
+
+        for user in users:
+            user.sprite = sprite
+
+    def rider_sprite(self, behavior):
+        """The enemy sprite, tinted with a personality's colour if it has one"""
+        sprite = self.asset_manager.assets["enemy"]
+        if behavior.tint is None:
+            return sprite
+        tinted = sprite.copy()
+        tinted.fill(behavior.tint, special_flags=BLEND_RGB_MULT)
+        return tinted
+
+    def run(self, pipelined=False, low_latency=False):
+        """Main game loop"""
+        if pipelined:
+            from .pipeline import PipelinedRunner
+            PipelinedRunner(self).run()
+            return
+        if low_latency and not self.vsync:
+            print("The low-latency loop needs vsync; running the standard loop")
+        elif low_latency:
+            from .latency import LowLatencyRunner
+            LowLatencyRunner(self).run()
+            return
+
+        while self.running:
+            if self.asset_watcher:
+                for name, sprite in self.asset_watcher.drain():
+                    self.swap_asset(name, sprite)
+            start = time.perf_counter()
+            self.handle_events()
+            self.update()
+            self.draw()
+            if self.latency_probe:
+                self.latency_probe.on_present()
+            self.record_frame_time((time.perf_counter() - start) * 1000)
+            self.clock.tick(60)  # 60 FPS
+
+        self.shutdown()
+
+    def record_frame_time(self, frame_ms, adapt=True):
+        """Feed one frame's work time to adaptive quality (unless adapt is False) and report spikes"""
+        if adapt and self.quality:
+            self.quality.record(frame_ms)
+        if frame_ms > telemetry.SPIKE_MS:
+            telemetry.emit("frame_spike", frame_ms)
+
+    def replaying(self):
+        """Whether a controls.Replay still has ticks to play"""
+        return isinstance(self.input_source, controls.Replay) and not self.input_source.done
+
+    def save_record(self):
+        """Write the first run's seed and inputs to record_path, once (at the first restart, quick load or exit)"""
+        if self.record_path:
+            controls.save_record(self.record_path,
+                                 controls.Record(self.seed, self.difficulty_name, self.action_log))
+            self.record_path = None
+
+    def shutdown(self):
+        """Stop background threads, save pending runs and close the window"""
+        self.save_record()
+        if self.asset_watcher:
+            self.asset_watcher.stop()
+        if self.leaderboard:
+            self.leaderboard.close()
+        telemetry.stop()
+        if self.audio:
+            self.audio.stop()
+        pygame.quit()
+
+
+def main(argv=None):
+    """Parse command line options and run the game"""
+    parser = argparse.ArgumentParser(description="Road Rash style game")
+    parser.add_argument("--difficulty", choices=sorted(config.load_difficulties()),
+                        default=config.DEFAULT_DIFFICULTY,
+                        help="difficulty preset from difficulty.json")
+    parser.add_argument("--leaderboard", default="leaderboard.db",
+                        help="SQLite file that stores finished runs")
+    parser.add_argument("--no-leaderboard", action="store_true",
+                        help="do not store finished runs")
+    parser.add_argument("--telemetry", metavar="DIR",
+                        help="write gameplay telemetry to rotating files in DIR")
+    parser.add_argument("--telemetry-url", metavar="URL",
+                        help="POST gameplay telemetry batches to a collector")
+    parser.add_argument("--weather", choices=particles.WEATHERS, default="clear",
+                        help="rain falls in rain weather")
+    parser.add_argument("--lighting", choices=lighting.LIGHTING_MODES, default="day",
+                        help="day/night cycle, night or tunnels")
+    parser.add_argument("--record", metavar="FILE",
+                        help="write the first run's inputs to FILE for --replay")
+    parser.add_argument("--replay", metavar="FILE",
+                        help="play back a run written by --record")
+    parser.add_argument("--no-audio", action="store_true",
+                        help="play without sound")
+    parser.add_argument("--hot-reload", action="store_true",
+                        help="reload changed assets while playing")
+    parser.add_argument("--fixed-quality", action="store_true",
+                        help="disable adaptive quality")
+    parser.add_argument("--verbose", action="store_true",
+                        help="print every adaptive quality change")
+    parser.add_argument("--trigger-axes", type=controls.parse_axes, metavar="BRAKE,THROTTLE",
+                        help="gamepad trigger axis numbers (default: 2,5 on Linux, 4,5 elsewhere)")
+    parser.add_argument("--pipelined", action="store_true",
+                        help="run the simulation on its own thread")
+    parser.add_argument("--low-latency", action="store_true",
+                        help="sample input as late as possible before each vsynced frame (needs --vsync)")
+    parser.add_argument("--vsync", action="store_true",
+                        help="sync presentation to the display refresh")
+    parser.add_argument("--measure-latency", action="store_true",
+                        help="print key event to presented frame latency on exit")
+    parser.add_argument("--window", type=render_target.parse_resolution,
+                        help="window size, e.g. 1280x720 (the scene is letterboxed to fit)")
+    parser.add_argument("--resizable", action="store_true",
+                        help="let the window be resized while playing")
+    parser.add_argument("--internal-res", type=render_target.parse_resolution,
+                        help="internal render resolution, e.g. 400x300")
+    parser.add_argument("--upscale", choices=render_target.UPSCALE_MODES,
+                        default=render_target.NEAREST,
+                        help="filter used to upscale the internal resolution")
+    args = parser.parse_args(argv)
+    if args.low_latency and not args.vsync:
+        parser.error("--low-latency only helps with --vsync")
+
+    # Recorded and replayed runs start from a known seed, with fixed quality
+    # (quality changes respawn scenery, which draws random numbers)
+    seed, replay, difficulty = None, None, args.difficulty
+    if args.replay:
+        record = controls.load_record(args.replay)
+        seed, replay, difficulty = record.seed, controls.Replay(record.log), record.difficulty
+    elif args.record:
+        seed = random.randrange(2 ** 31)
+
+    game = Game(hot_reload=args.hot_reload,
+                adaptive_quality=not (args.fixed_quality or args.record or args.replay),
+                internal_resolution=args.internal_res,
+                upscale=args.upscale,
+                vsync=args.vsync,
+                measure_latency=args.measure_latency,
+                difficulty=difficulty,
+                leaderboard_path=None if args.no_leaderboard else args.leaderboard,
+                telemetry_dir=args.telemetry,
+                telemetry_url=args.telemetry_url,
+                audio=not args.no_audio,
+                weather=args.weather,
+                lighting=args.lighting,
+                window_size=args.window,
+                resizable=args.resizable,
+                seed=seed,
+                input_source=replay,
+                record_path=args.record,
+                verbose=args.verbose,
+                trigger_axes=args.trigger_axes)
+    game.run(pipelined=args.pipelined, low_latency=args.low_latency)
+    if game.latency_probe:
+        game.latency_probe.print_report()
@@ -0,0 +1,154 @@
+"""
+Input latency measurement and a low-latency game loop.
+
+With vsync, the standard loop samples input and draws, then its flip
+blocks until the next refresh, so every input waits out the rest of the
+frame on top of the work. The LowLatencyRunner is for that case: it sleeps
+first (precisely: coarse sleep, then a short spin) until just before the
+refresh, anchored to when the previous flip returned, and samples input as
+late as the predicted update and draw work allows.
+
+It requires vsync. Without vsync there is no refresh to sample just ahead
+of, since frames are shown as soon as they are drawn, and the late-sampling
+loop measured worse than the standard one (median 13.5 ms against 9.3 ms).
+Game.run falls back to the standard loop, with a warning, and the command
+line rejects --low-latency without --vsync.
+
+LatencyProbe timestamps every key event when it is pumped (or uses the
+'sent' attribute of synthetic events) and measures the time until the first
+frame that includes its effect has been presented. Run this module to
+compare the loops with synthetic key presses: the standard loop without
+vsync, and both loops with an emulated vsync flip.
+"""
+
+import statistics
+import time
+
+import pygame
+from pygame.locals import KEYDOWN, KEYUP
+
+# Time left for spinning instead of sleeping, in seconds
+SPIN_MARGIN = 0.002
+# Extra headroom added to the predicted frame work
+WORK_MARGIN = 0.001
+
+
+def precise_sleep_until(deadline):
+    """Sleep until a perf_counter deadline with sub-millisecond accuracy"""
+    remaining = deadline - time.perf_counter()
+    if remaining > SPIN_MARGIN:
+        time.sleep(remaining - SPIN_MARGIN)
+    while time.perf_counter() < deadline:
+        pass
+
+
+class LatencyProbe:
+    """Measures key event to presented frame latency"""
+    def __init__(self):
+        self.pending = []
+        self.samples = []
+
+    def on_events(self, events):
+        """Record the arrival time of key events pumped this frame"""
+        now = time.perf_counter()
+        for event in events:
+            if event.type in (KEYDOWN, KEYUP):
+                self.pending.append(getattr(event, "sent", now))
+
+    def on_present(self):
+        """Record latencies for every event included in the frame just presented"""
+        if self.pending:
+            now = time.perf_counter()
+            self.samples.extend(now - sent for sent in self.pending)
+            self.pending = []
+
+    def report(self):
+        """Median and worst-case latency in seconds"""
+        if not self.samples:
+            return {"count": 0, "median": 0.0, "worst": 0.0}
+        return {
+            "count": len(self.samples),
+            "median": statistics.median(self.samples),
+            "worst": max(self.samples),
+        }
+
+    def print_report(self, label="Input latency"):
+        """Print median and worst-case latency"""
+        stats = self.report()
+        print(f"{label}: {stats['count']} events, median {stats['median'] * 1000:.1f} ms, "
+              f"worst {stats['worst'] * 1000:.1f} ms")
+
+
+class LowLatencyRunner:
+    """Game loop that samples input just in time before each vsynced frame"""
+    def __init__(self, game, fps=60):
+        self.game = game
+        self.frame_seconds = 1.0 / fps
+        self.work_estimate = self.frame_seconds / 4
+
+    def run(self):
+        """Run the game until it stops"""
+        game = self.game
+        next_present = time.perf_counter() + self.frame_seconds
+        while game.running:
+            if game.asset_watcher:
+                for name, sprite in game.asset_watcher.drain():
+                    game.swap_asset(name, sprite)
+
+            # Wait, then sample input as late as the predicted work allows
+            precise_sleep_until(next_present - self.work_estimate * 1.5 - WORK_MARGIN)
+
+            start = time.perf_counter()
+            game.handle_events()
+            game.update()
+            game.draw(present=False)
+            work = time.perf_counter() - start
+            game.present()
+            end = time.perf_counter()
+            if game.latency_probe:
+                game.latency_probe.on_present()
+
+            self.work_estimate = 0.9 * self.work_estimate + 0.1 * work
+            game.record_frame_time(work * 1000)
+
+            # present() blocked until the vertical blank
+            next_present = end + self.frame_seconds
+
+        game.shutdown()
+
+
+if __name__ == "__main__":
+    import os
+    import random
+    import threading
+
+    # Compare loops with synthetic key presses posted at random times
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    from .game import Game
+
+    # The dummy driver has no refresh, so emulate a flip that blocks until vblank
+    flip = pygame.display.flip
+    refresh = 1.0 / 60
+
+    def vsync_flip():
+        flip()
+        now = time.perf_counter()
+        precise_sleep_until(now + refresh - now % refresh)
+
+    def inject(game, seconds):
+        end = time.perf_counter() + seconds
+        while time.perf_counter() < end:
+            time.sleep(random.uniform(0.005, 0.04))
+            pygame.event.post(pygame.event.Event(KEYDOWN, key=pygame.K_LSHIFT,
+                                                 sent=time.perf_counter()))
+        game.running = False
+
+    for vsync, low_latency in ((False, False), (True, False), (True, True)):
+        pygame.display.flip = vsync_flip if vsync else flip
+        game = Game(adaptive_quality=False)
+        game.vsync = vsync
+        game.latency_probe = LatencyProbe()
+        threading.Thread(target=inject, args=(game, 5.0), daemon=True).start()
+        game.run(low_latency=low_latency)
+        label = "Low-latency loop" if low_latency else "Standard loop"
+        game.latency_probe.print_report(label + (" (vsync)" if vsync else ""))
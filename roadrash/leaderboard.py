@@ -0,0 +1,272 @@
+"""
+Persistent leaderboard and run statistics for the Road Rash style game.
+
+Every finished run (score, survival time, top speed, crash cause) is stored
+in a local SQLite database in WAL mode, so leaderboard reads never block on
+writes. The game only puts records on a queue: a writer thread inserts them
+in batches, one transaction per batch, so a game over never waits on disk.
+
+Results of headless batch runs can be bulk imported (millions of rows), and
+top-N queries are answered from a (difficulty, score) index in milliseconds.
+Run this module to import JSON Lines files, print the leaderboard or
+benchmark bulk import and queries.
+"""
+
+import json
+import queue
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+
+DEFAULT_DB = "leaderboard.db"
+
+# Writer thread batching
+BATCH_SIZE = 256
+FLUSH_INTERVAL = 0.5    # Seconds a record may wait before its batch is written
+# Bulk imports: rows per executemany call and page cache size
+IMPORT_CHUNK = 50000
+IMPORT_CACHE_KIB = 256 * 1024
+
+# One finished run; survival is counted in simulation ticks (60 per second)
+RunRecord = namedtuple("RunRecord", "finished_at difficulty score survival_ticks top_speed crash_cause source")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    finished_at REAL NOT NULL,
+    difficulty TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    survival_ticks INTEGER NOT NULL,
+    top_speed REAL NOT NULL,
+    crash_cause TEXT,
+    source TEXT NOT NULL
+);
+"""
+
+INDEXES = (
+    "CREATE INDEX IF NOT EXISTS runs_by_score ON runs (score DESC)",
+    "CREATE INDEX IF NOT EXISTS runs_by_difficulty_score ON runs (difficulty, score DESC)",
+)
+
+INSERT = ("INSERT INTO runs (finished_at, difficulty, score, survival_ticks, top_speed, crash_cause, source) "
+          "VALUES (?, ?, ?, ?, ?, ?, ?)")
+
+
+def connect(path):
+    """Open a connection with the WAL settings used by every reader and writer"""
+    connection = sqlite3.connect(path, timeout=30)
+    connection.execute("PRAGMA journal_mode=WAL")
+    # Durable at checkpoints only; a power cut may lose the last few runs
+    connection.execute("PRAGMA synchronous=NORMAL")
+    return connection
+
+
+class Leaderboard:
+    """SQLite run store with an asynchronous batching writer"""
+    def __init__(self, path=DEFAULT_DB):
+        self.path = path
+        self.reader = connect(path)
+        self.reader.executescript(SCHEMA)
+        for statement in INDEXES:
+            self.reader.execute(statement)
+        self.pending = queue.SimpleQueue()
+        self.written = 0
+        self.thread = threading.Thread(target=self.write_loop, name="leaderboard-writer", daemon=True)
+        self.thread.start()
+
+    def submit(self, record):
+        """Queue a RunRecord for writing; never blocks"""
+        self.pending.put(record)
+
+    def flush(self):
+        """Block until every record submitted so far has been written"""
+        done = threading.Event()
+        self.pending.put(done)
+        done.wait()
+
+    def close(self):
+        """Write outstanding records and stop the writer thread"""
+        if self.thread is None:
+            return
+        self.pending.put(None)
+        self.thread.join()
+        self.thread = None
+        self.reader.close()
+
+    def write_loop(self):
+        """Writer thread: insert queued records in batches
+
+        Besides records the queue carries an Event from flush(), set once
+        everything before it is written, and None from close().
+        """
+        connection = connect(self.path)
+        running = True
+        while running:
+            # Wait for a first record, then collect more until the batch is full or due
+            batch = []
+            flushed = None
+            item = self.pending.get()
+            deadline = time.monotonic() + FLUSH_INTERVAL
+            while True:
+                if item is None:
+                    running = False
+                    break
+                if isinstance(item, threading.Event):
+                    flushed = item
+                    break
+                batch.append(item)
+                if len(batch) >= BATCH_SIZE:
+                    break
+                try:
+                    item = self.pending.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+
+            if batch:
+                try:
+                    with connection:
+                        connection.executemany(INSERT, batch)
+                    self.written += len(batch)
+                except sqlite3.Error as e:
+                    print(f"Could not save {len(batch)} runs to the leaderboard: {e}")
+            if flushed is not None:
+                flushed.set()
+        connection.close()
+
+    def bulk_import(self, records):
+        """Insert an iterable of RunRecords (or equivalent tuples) synchronously
+
+        Meant for results of headless batch runs. Everything goes in one
+        transaction on a separate connection: the indexes are dropped, rows
+        are inserted in chunks of IMPORT_CHUNK and the indexes are rebuilt
+        in one sorted pass, which is much faster than updating them row by
+        row. Readers keep seeing the previous state (with its indexes) until
+        the import commits. Returns the number of rows imported.
+        """
+        connection = connect(self.path)
+        connection.isolation_level = None
+        connection.execute(f"PRAGMA cache_size=-{IMPORT_CACHE_KIB}")
+        total = 0
+        try:
+            connection.execute("BEGIN IMMEDIATE")
+            for (name,) in connection.execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'runs' "
+                    "AND sql IS NOT NULL").fetchall():
+                connection.execute(f"DROP INDEX {name}")
+            chunk = []
+            for record in records:
+                chunk.append(record)
+                if len(chunk) >= IMPORT_CHUNK:
+                    connection.executemany(INSERT, chunk)
+                    total += len(chunk)
+                    chunk = []
+            connection.executemany(INSERT, chunk)
+            total += len(chunk)
+            for statement in INDEXES:
+                connection.execute(statement)
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        finally:
+            connection.close()
+        return total
+
+    def top(self, n=10, difficulty=None):
+        """Best n runs as RunRecords, optionally for one difficulty"""
+        columns = "finished_at, difficulty, score, survival_ticks, top_speed, crash_cause, source"
+        if difficulty is None:
+            rows = self.reader.execute(
+                f"SELECT {columns} FROM runs ORDER BY score DESC LIMIT ?", (n,))
+        else:
+            rows = self.reader.execute(
+                f"SELECT {columns} FROM runs WHERE difficulty = ? ORDER BY score DESC LIMIT ?",
+                (difficulty, n))
+        return [RunRecord(*row) for row in rows]
+
+    def best_score(self, difficulty=None):
+        """Highest stored score, or 0 when there are no runs"""
+        best = self.top(1, difficulty)
+        return best[0].score if best else 0
+
+    def count(self):
+        """Number of stored runs"""
+        return self.reader.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+
+
+def read_jsonl(path, source="batch"):
+    """Yield RunRecords from a JSON Lines file of run results"""
+    with open(path) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            run = json.loads(line)
+            yield RunRecord(run.get("finished_at", 0.0), run.get("difficulty", "normal"),
+                            int(run["score"]), int(run.get("survival_ticks", 0)),
+                            float(run.get("top_speed", 0.0)), run.get("crash_cause"),
+                            run.get("source", source))
+
+
+if __name__ == "__main__":
+    import argparse
+    import os
+    import random
+    import tempfile
+
+    parser = argparse.ArgumentParser(description="Road Rash leaderboard")
+    parser.add_argument("--db", default=DEFAULT_DB, help="database file")
+    commands = parser.add_subparsers(dest="command", required=True)
+    import_command = commands.add_parser("import", help="bulk import JSON Lines run results")
+    import_command.add_argument("files", nargs="+")
+    top_command = commands.add_parser("top", help="print the leaderboard")
+    top_command.add_argument("-n", type=int, default=10)
+    top_command.add_argument("--difficulty")
+    bench_command = commands.add_parser("bench", help="benchmark bulk import and top-N queries")
+    bench_command.add_argument("--rows", type=int, default=1000000)
+    args = parser.parse_args()
+
+    if args.command == "import":
+        board = Leaderboard(args.db)
+        for path in args.files:
+            start = time.perf_counter()
+            count = board.bulk_import(read_jsonl(path))
+            print(f"{path}: {count} runs in {time.perf_counter() - start:.2f} s")
+        board.close()
+
+    elif args.command == "top":
+        board = Leaderboard(args.db)
+        for rank, run in enumerate(board.top(args.n, args.difficulty), 1):
+            print(f"{rank:>3}. {run.score:>8} {run.difficulty:<8} {run.survival_ticks / 60:>7.1f} s "
+                  f"top speed {run.top_speed:>5.1f}  {run.crash_cause or '-'}")
+        board.close()
+
+    else:
+        # Bulk import into a scratch database, then time queries and async submits
+        with tempfile.TemporaryDirectory() as scratch:
+            board = Leaderboard(os.path.join(scratch, "bench.db"))
+            rng = random.Random(0)
+            causes = ("enemy", "obstacle", "traffic_rider")
+            records = (RunRecord(i, rng.choice(("normal", "classic")), rng.randint(0, 10 ** 6),
+                                 rng.randint(60, 60 * 600), rng.uniform(3, 15), rng.choice(causes), "bench")
+                       for i in range(args.rows))
+            start = time.perf_counter()
+            board.bulk_import(records)
+            elapsed = time.perf_counter() - start
+            print(f"Bulk import: {args.rows} rows in {elapsed:.2f} s ({args.rows / elapsed:,.0f} rows/s)")
+
+            for difficulty in (None, "classic"):
+                runs = 200
+                start = time.perf_counter()
+                for _ in range(runs):
+                    board.top(10, difficulty)
+                label = difficulty or "all"
+                print(f"Top 10 ({label}): {(time.perf_counter() - start) / runs * 1000:.3f} ms")
+
+            start = time.perf_counter()
+            for i in range(1000):
+                board.submit(RunRecord(i, "normal", i, 600, 10.0, "enemy", "bench"))
+            submit_time = (time.perf_counter() - start) / 1000
+            board.flush()
+            print(f"Submit: {submit_time * 1e6:.1f} us per run on the game thread")
+            board.close()
@@ -0,0 +1,233 @@
+"""
+Day/night and tunnel lighting for the Road Rash style game.
+
+The light level is quantized to STEPS steps, and everything that depends on
+it is computed once per step instead of per frame:
+- a color lookup table per palette ("sky" for open road, "tunnel" for the
+  sodium-lit tunnels) of ambient multipliers, from full daylight at the top
+  step down to night, which also gives the lit sky and road fill colors;
+- tinted variants of each sprite, made the first time a sprite is drawn at
+  a step and then reused;
+- a headlight cone per step, pre-rendered as an additive light mask whose
+  strength makes up for the darkness of that step.
+
+Lighting a frame is then a lookup per sprite, lit fill colors and one
+additive blit of the cached cone in front of the player. A multiply pass
+over the whole finished frame would be simpler, but pygame's software
+BLEND_RGB_MULT fill costs several milliseconds at 800x600 (run this module
+to compare). The HUD is drawn unlit, in a color that reads on the scene.
+
+Modes (Game(lighting=...), --lighting):
+- "day": always full daylight, no lighting passes at all
+- "night": always night, with headlights
+- "cycle": a day and night every DAY_SECONDS
+- "tunnels": daylight with a tunnel every TUNNEL_SPACING pixels of road
+
+Lighting is cosmetic and follows the game's tick and distance ridden. Save
+states store both (see savestate.py), so a quick load or a rewind puts the
+day/night and tunnel phase back with the rest of the game.
+
+Run this module to measure the cost of each lighting mode.
+"""
+
+import math
+from collections import namedtuple
+
+import numpy as np
+import pygame
+
+from .config import BLACK, WHITE
+
+LIGHTING_MODES = ("day", "night", "cycle", "tunnels")
+
+# Light levels from darkest (0) to full daylight (STEPS - 1)
+STEPS = 16
+
+# Ambient multiplier keyframes per palette: (light level 0..1, RGB)
+PALETTES = {
+    "sky": ((0.0, (60, 70, 120)), (0.5, (200, 150, 120)), (1.0, (255, 255, 255))),
+    "tunnel": ((0.0, (90, 70, 40)), (1.0, (255, 255, 255))),
+}
+
+# Length of a full day and night, in seconds at 60 ticks per second
+DAY_SECONDS = 120
+TICK_RATE = 60
+
+# Tunnels: one every TUNNEL_SPACING pixels of road, TUNNEL_LENGTH long, fading over TUNNEL_FADE
+TUNNEL_SPACING = 6000
+TUNNEL_LENGTH = 1500
+TUNNEL_FADE = 150
+
+# Headlights come on below this light level; the cone's size in pixels
+HEADLIGHT_LEVEL = 0.6
+CONE_SIZE = (260, 360)
+CONE_ANGLE = math.radians(28)
+CONE_COLOR = (255, 240, 200)
+
+# What a frame needs to draw its lighting: palette, step and where the headlight cone goes
+Light = namedtuple("Light", "palette step cone_x cone_y")
+DAYLIGHT = Light("sky", STEPS - 1, None, None)
+
+
+def ambient_table(keyframes):
+    """Ambient RGB multiplier for every step, interpolated between keyframes"""
+    levels = np.linspace(0.0, 1.0, STEPS)
+    points = [level for level, _ in keyframes]
+    colors = np.array([color for _, color in keyframes], dtype=np.float64)
+    table = np.column_stack([np.interp(levels, points, colors[:, channel]) for channel in range(3)])
+    return [tuple(int(round(value)) for value in row) for row in table]
+
+
+def render_cone(strength):
+    """Additive headlight mask: a wedge opening up the screen from its bottom centre"""
+    width, height = CONE_SIZE
+    x = np.arange(width)[:, None] - width / 2
+    y = height - np.arange(height)[None, :]
+    distance = np.hypot(x, y)
+    inside = np.abs(np.arctan2(x, y)) < CONE_ANGLE
+    # Bright near the bike, fading with distance and toward the cone's edges
+    edge = np.clip(1.0 - np.abs(np.arctan2(x, y)) / CONE_ANGLE, 0.0, 1.0)
+    falloff = np.clip(1.0 - distance / height, 0.0, 1.0) * np.sqrt(edge) * inside * strength
+    surface = pygame.Surface(CONE_SIZE)
+    pixels = pygame.surfarray.pixels3d(surface)
+    for channel, value in enumerate(CONE_COLOR):
+        pixels[:, :, channel] = (falloff * value).astype(np.uint8)
+    del pixels
+    return surface
+
+
+class Lighting:
+    """Light level over time and distance, and the cached tables to draw it"""
+    def __init__(self, mode="day"):
+        if mode not in LIGHTING_MODES:
+            raise ValueError(f"Unknown lighting mode: {mode}")
+        self.mode = mode
+        self.distance = 0.0
+        self.tables = {name: ambient_table(keyframes) for name, keyframes in PALETTES.items()}
+        self.cones = {}     # step -> cone mask, rendered on first use
+        self.tinted = {}    # (sprite, palette, step) -> lit copy of the sprite
+
+    def advance(self, speed):
+        """Follow the road for one tick"""
+        self.distance += speed
+
+    def tunnel_depth(self):
+        """0 on open road, 1 inside a tunnel, ramping at the portals"""
+        if self.mode != "tunnels":
+            return 0.0
+        position = self.distance % TUNNEL_SPACING
+        into = min(position, TUNNEL_LENGTH - position)
+        return max(0.0, min(1.0, into / TUNNEL_FADE)) if position < TUNNEL_LENGTH else 0.0
+
+    def daylight(self, tick):
+        """Open-road light level 0..1 at a tick"""
+        if self.mode == "night":
+            return 0.0
+        if self.mode != "cycle":
+            return 1.0
+        return 0.5 + 0.5 * math.cos(2 * math.pi * tick / (DAY_SECONDS * TICK_RATE))
+
+    def light(self, tick, player):
+        """The Light for a frame"""
+        tunnel = self.tunnel_depth()
+        level = self.daylight(tick) * (1.0 - tunnel)
+        step = round(level * (STEPS - 1))
+        if step == STEPS - 1:
+            return DAYLIGHT
+        palette = "tunnel" if tunnel > 0 else "sky"
+        if level >= HEADLIGHT_LEVEL:
+            return Light(palette, step, None, None)
+        return Light(palette, step, player.x + player.width / 2 - CONE_SIZE[0] / 2, player.y - CONE_SIZE[1] + 20)
+
+    def cone(self, step):
+        """Headlight mask for a step, strong enough to light the dark back up"""
+        cone = self.cones.get(step)
+        if cone is None:
+            cone = self.cones[step] = render_cone(1.0 - step / (STEPS - 1))
+        return cone
+
+    def color(self, color, light):
+        """A fill color under a Light"""
+        if light.step == STEPS - 1:
+            return color
+        ambient = self.tables[light.palette][light.step]
+        return tuple(channel * scale // 255 for channel, scale in zip(color, ambient))
+
+    def sprite(self, sprite, light):
+        """A sprite under a Light, tinted once per step and cached"""
+        if light.step == STEPS - 1:
+            return sprite
+        key = (sprite, light.palette, light.step)
+        tinted = self.tinted.get(key)
+        if tinted is None:
+            tinted = sprite.copy()
+            tinted.fill(self.tables[light.palette][light.step], special_flags=pygame.BLEND_RGB_MULT)
+            self.tinted[key] = tinted
+        return tinted
+
+    def tint_batch(self, batch, light):
+        """A render_queue batch with every sprite swapped for its lit variant"""
+        if light.step == STEPS - 1:
+            return batch
+        return tuple((self.sprite(sprite, light), position) for sprite, position in batch)
+
+    def clear(self):
+        """Drop the tinted sprites, e.g. after sprites are reloaded"""
+        self.tinted.clear()
+
+    def headlight(self, canvas, light):
+        """Add the headlight cone over the drawn scene"""
+        if light.cone_x is not None:
+            canvas.blit(self.cone(light.step), (light.cone_x, light.cone_y), special_flags=pygame.BLEND_RGB_ADD)
+
+    @staticmethod
+    def hud_color(light):
+        """Text color that reads on the lit scene"""
+        return BLACK if light.step >= STEPS // 2 else WHITE
+
+
+if __name__ == "__main__":
+    import os
+    import random
+    import time
+
+    # Draw cost per lighting mode and light level on a headless game
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    from .game import Game
+
+    random.seed(0)
+    game = Game(adaptive_quality=False)
+    for _ in range(120):
+        game.update()
+    frames = 300
+
+    def time_draw():
+        game.draw()
+        start = time.perf_counter()
+        for _ in range(frames):
+            game.draw()
+        return (time.perf_counter() - start) / frames * 1000
+
+    game.lighting = Lighting("day")
+    baseline = time_draw()
+    print(f"{'day':<22} {baseline:.3f} ms per frame")
+    cases = [("dusk", "cycle", DAY_SECONDS * TICK_RATE * 0.2), ("night", "night", 0),
+             ("tunnel", "tunnels", TUNNEL_LENGTH / 2)]
+    for label, mode, position in cases:
+        game.lighting = Lighting(mode)
+        if mode == "cycle":
+            game.tick = int(position)
+        else:
+            game.lighting.distance = position
+        elapsed = time_draw()
+        print(f"{label:<22} {elapsed:.3f} ms per frame (+{elapsed - baseline:.3f} ms for lighting)")
+
+    # For comparison: darkening the finished frame with one multiply pass instead
+    color = game.lighting.tables["sky"][0]
+    start = time.perf_counter()
+    for _ in range(frames):
+        game.canvas.fill(color, special_flags=pygame.BLEND_RGB_MULT)
+    print(f"{'full-frame multiply':<22} {(time.perf_counter() - start) / frames * 1000:.3f} ms per frame "
+          f"for the pass alone")
+    print(f"Cached: {len(game.lighting.tinted)} tinted sprites, {len(game.lighting.cones)} headlight cones")
+    game.shutdown()
@@ -0,0 +1,192 @@
+"""
+Level-of-detail sprite cache for the Road Rash style game.
+
+Drawing a sprite at a variable size (perspective, zoom) with
+pygame.transform.scale every frame costs a full resample per blit. Instead,
+LODCache quantizes the wanted scale to the nearest of a fixed ladder of
+levels, LEVELS_PER_OCTAVE per halving of the size (mip-style), and keeps
+each sprite's variant per level. A variant is made the first time it is
+asked for, and the least recently used ones are dropped once the cache
+holds more than max_bytes of pixels.
+
+The drawn size is off from the wanted one by at most half a level step
+(about 9% with 4 levels per octave), in return for a dictionary lookup per
+draw instead of a resample.
+
+Variants at an exact size (get_exact) share the same LRU and budget. The
+RenderTarget keeps its copies of sprites at the internal resolution there,
+so they outlive a change of render scale or window size and are reused
+when adaptive quality or the window goes back to an earlier size.
+
+Run this module to benchmark a perspective scene against per-frame scaling.
+"""
+
+import math
+from collections import OrderedDict
+
+import pygame
+
+# Variant levels per halving of the size
+LEVELS_PER_OCTAVE = 4
+
+# Default memory budget for cached variants
+DEFAULT_MAX_BYTES = 16 * 1024 * 1024
+
+# Level of the unscaled sprite
+BASE_LEVEL = 0
+
+# Scale of the smallest level; any smaller scale, zero or negative, gets that level
+MIN_SCALE = 1 / 64
+
+
+class LODCache:
+    """Bounded LRU cache of pre-scaled sprite variants"""
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, levels_per_octave=LEVELS_PER_OCTAVE, smooth=True):
+        self.max_bytes = max_bytes
+        self.levels_per_octave = levels_per_octave
+        self.smooth = smooth
+        self.variants = OrderedDict()    # (sprite, level) -> Surface, oldest first
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def level(self, scale):
+        """Nearest level to a scale factor, no lower than MIN_SCALE's"""
+        return round(math.log2(max(scale, MIN_SCALE)) * self.levels_per_octave)
+
+    def level_scale(self, level):
+        """Scale factor of a level"""
+        return 2.0 ** (level / self.levels_per_octave)
+
+    def get(self, sprite, scale):
+        """The cached variant of sprite nearest to scale (the sprite itself at level 0)"""
+        level = self.level(scale)
+        if level == BASE_LEVEL:
+            return sprite
+        key = (sprite, level)
+        variant = self.lookup(key)
+        if variant is None:
+            self.misses += 1
+            width, height = sprite.get_size()
+            scale = self.level_scale(level)
+            variant = self.add(key, self.make_variant(sprite, (max(1, round(width * scale)),
+                                                               max(1, round(height * scale)))))
+        return variant
+
+    def get_exact(self, sprite, scale, make=True):
+        """The cached variant of sprite at exactly scale (sizes rounded down to whole pixels)
+
+        With make=False a missing variant is not made and None is returned.
+        """
+        width, height = sprite.get_size()
+        key = (sprite, (max(1, int(width * scale)), max(1, int(height * scale))))
+        variant = self.lookup(key)
+        if variant is None and make:
+            self.misses += 1
+            variant = self.add(key, self.make_variant(sprite, key[1]))
+        return variant
+
+    def put_exact(self, sprite, variant):
+        """Cache a variant of sprite made elsewhere (such as on a worker thread), keyed by its size"""
+        key = (sprite, variant.get_size())
+        if key not in self.variants:
+            self.add(key, variant)
+
+    def lookup(self, key):
+        """A cached variant, counted as a hit, or None"""
+        variant = self.variants.get(key)
+        if variant is None:
+            return None
+        self.hits += 1
+        self.variants.move_to_end(key)
+        return variant
+
+    def add(self, key, variant):
+        """Cache a new variant, dropping the least recently used ones over the budget"""
+        self.variants[key] = variant
+        self.bytes += surface_bytes(variant)
+        while self.bytes > self.max_bytes and len(self.variants) > 1:
+            _, dropped = self.variants.popitem(last=False)
+            self.bytes -= surface_bytes(dropped)
+            self.evictions += 1
+        return variant
+
+    def make_variant(self, sprite, size):
+        """Resample a sprite to a size"""
+        if self.smooth and sprite.get_bitsize() in (24, 32):
+            return pygame.transform.smoothscale(sprite, size)
+        return pygame.transform.scale(sprite, size)
+
+    def clear(self):
+        """Drop every variant, e.g. after sprites are reloaded"""
+        self.variants.clear()
+        self.bytes = 0
+
+    @property
+    def hit_rate(self):
+        """Fraction of lookups served from the cache"""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self):
+        """One line with the cache's size, memory and hit rate"""
+        return (f"{len(self.variants)} variants, {self.bytes / 1024:.0f} KiB, "
+                f"hit rate {self.hit_rate:.1%}, {self.evictions} evictions")
+
+
+def surface_bytes(surface):
+    """Pixel memory of a surface"""
+    return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+
+if __name__ == "__main__":
+    import os
+    import random
+    import time
+
+    # A perspective scene: sprites grow from a distant horizon to close-ups as they ride down the screen
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    from .config import SCREEN_HEIGHT, SCREEN_WIDTH
+    from .game import Game
+
+    game = Game(adaptive_quality=False)
+    screen = game.screen
+    sprites = list(game.asset_manager.assets.values())
+    rng = random.Random(0)
+    count = 300
+    riders = [(rng.choice(sprites), rng.uniform(0, SCREEN_WIDTH), rng.uniform(0, SCREEN_HEIGHT), rng.uniform(2, 8))
+              for _ in range(count)]
+    frames = 200
+
+    def perspective(y):
+        """Size factor at a screen height: a quarter at the top, a close-up 3x at the bottom"""
+        return 0.25 * 12 ** ((y % SCREEN_HEIGHT) / SCREEN_HEIGHT)
+
+    def draw_frame(frame, scaled):
+        """Draw every rider once; scaled(sprite, scale) returns the surface to blit"""
+        screen.fill((0, 0, 0))
+        for sprite, x, y, speed in riders:
+            y = (y + frame * speed) % SCREEN_HEIGHT
+            screen.blit(scaled(sprite, perspective(y)), (x, y))
+
+    def per_frame(sprite, scale):
+        width, height = sprite.get_size()
+        return pygame.transform.scale(sprite, (max(1, round(width * scale)), max(1, round(height * scale))))
+
+    lod = LODCache()
+    frame_ms = 1000.0 / 60
+    for label, scaled in (("per-frame scale", per_frame), ("LOD cache", lod.get)):
+        start = time.perf_counter()
+        for frame in range(frames):
+            draw_frame(frame, scaled)
+        elapsed = (time.perf_counter() - start) / frames * 1000
+        print(f"{label:<16} {count} sprites: {elapsed:.3f} ms per frame ({elapsed / frame_ms:.1%} of a frame)")
+    print(f"LOD cache: {lod.stats()}")
+
+    # The same scene with a budget too small for every variant
+    small = LODCache(max_bytes=512 * 1024)
+    for frame in range(frames):
+        draw_frame(frame, small.get)
+    print(f"512 KiB budget: {small.stats()}")
+    game.shutdown()
@@ -0,0 +1,253 @@
+"""
+Player, enemy and road objects for the Road Rash style game.
+
+Speeds, health and AI aggression come from a config.Difficulty preset.
+Player and Enemy are also combat fighters (see combat.py): they queue
+punches and kicks in pending_attack and carry health, knockback and stun.
+Neither moves itself: they set throttle, brake and steer inputs and
+physics.Bikes integrates every rider's bike at once. What an Enemy does is
+decided by its behavior.BehaviorTree personality.
+"""
+
+import random
+
+import pygame
+
+from . import physics, telemetry
+from .combat import ATTACKS
+from .config import (ENEMY_HEIGHT, ENEMY_WIDTH, GRAY, PATROL, PLAYER_HEIGHT, PLAYER_WIDTH,
+                     ROAD_LEFT, ROAD_RIGHT, ROAD_WIDTH, SCREEN_HEIGHT, WHITE)
+
+
+# Enemies line up this far beside the player to fight
+FLANK_DISTANCE = ENEMY_WIDTH + 10
+
+
+class Player:
+    """Player class representing the user's bike"""
+    width = PLAYER_WIDTH
+    height = PLAYER_HEIGHT
+    team = "player"
+
+    def __init__(self, x, y, sprite, difficulty):
+        self.x = x
+        self.y = y
+        self.sprite = sprite
+        self.difficulty = difficulty
+        self.bike_params = physics.bike_params(difficulty, player=True)
+        self.reset_bike()
+        self.score = 0
+        self.reset_combat()
+
+    def reset_bike(self):
+        """Upright at road speed with no inputs"""
+        self.speed = self.difficulty.road_speed
+        self.vx = self.vy = self.lean = 0.0
+        self.control(0.0, 0.0, 0.0)
+
+    def control(self, throttle, brake, steer):
+        """Set the bike inputs: throttle and brake 0..1, steer -1 (left) .. 1 (right)"""
+        self.throttle = throttle
+        self.brake = brake
+        self.steer = steer
+
+    def reset_combat(self):
+        """Full health, no knockback and nothing queued"""
+        self.health = self.difficulty.player_health
+        self.knockback = 0.0
+        self.stun = 0
+        self.attack_cooldown = 0
+        self.pending_attack = None
+
+    def attack(self, name, side=0):
+        """Queue a punch or kick toward side (-1 left, 1 right, 0 nearest enemy)"""
+        if self.attack_cooldown > 0 or self.stun > 0:
+            return
+        self.pending_attack = (name, side)
+        self.attack_cooldown = ATTACKS[name].cooldown
+
+    def draw(self, screen):
+        """Draw the player on the screen"""
+        screen.blit(self.sprite, (self.x, self.y))
+
+    def get_rect(self):
+        """Get the player's rectangle for collision detection"""
+        return pygame.Rect(self.x, self.y, PLAYER_WIDTH, PLAYER_HEIGHT)
+
+    def update_score(self, points=1):
+        """Update the player's score"""
+        self.score += points
+
+
+class Enemy:
+    """Enemy biker class driven by a behavior tree
+
+    behavior is a behavior.BehaviorTree; its team sets who this rider fights.
+    Its state is the name of the last action the tree chose.
+    """
+    width = ENEMY_WIDTH
+    height = ENEMY_HEIGHT
+
+    def __init__(self, sprite, difficulty, behavior):
+        self.sprite = sprite
+        self.difficulty = difficulty
+        self.behavior = behavior
+        self.team = behavior.team
+        self.bike_params = physics.bike_params(difficulty)
+        self.state = PATROL
+        self.target = None
+        self.reset()
+
+    def reset(self):
+        """Reset enemy position to top of screen at random x position"""
+        self.x = random.randint(ROAD_LEFT, ROAD_RIGHT - ENEMY_WIDTH)
+        self.y = -ENEMY_HEIGHT
+        self.patrol_direction = random.choice([-1, 1])  # Left or right
+        self.patrol_timer = random.randint(30, 90)  # Frames to patrol in one direction
+        self.attack_cooldown = 0
+        self.speed = self.difficulty.road_speed
+        self.vx = self.vy = self.lean = 0.0
+        self.throttle = self.brake = self.steer = 0.0
+        self.pace = 0.0
+        self.health = self.difficulty.enemy_health
+        self.knockback = 0.0
+        self.stun = 0
+        self.pending_attack = None
+
+    def update(self, player_speed, player=None, think=True, navigation=None):
+        """Set the bike inputs for this tick from the behavior tree's action
+
+        With think=False only the cruise control runs and the steering is
+        kept, the behavior tree is skipped (used to lower the AI tick rate).
+        navigation is the shared navigation.FlowField used while chasing;
+        without it enemies steer straight at the player.
+        """
+        # If enemy went off screen, reset position
+        if self.y > SCREEN_HEIGHT or self.y < -2 * SCREEN_HEIGHT:
+            self.reset()
+
+        # Behavior tree decision
+        if not think:
+            pass
+        elif player:
+            # Calculate distance to player
+            dx = player.x - self.x
+            dy = player.y - self.y
+            distance = (dx**2 + dy**2)**0.5
+
+            # Steer for the side of the player this enemy is on, not into the player
+            side = 1 if dx >= 0 else -1
+            flank_dx = dx - side * FLANK_DISTANCE
+
+            self.behavior.think(self, distance, player_speed, (flank_dx, dy, side, navigation))
+            if self.state != PATROL:
+                self.target = player
+        else:
+            # Default to patrol if no player is provided
+            self.patrol()
+
+        # Ride slower than the player, so the enemy drifts down the road,
+        # plus the pace the chase asks for
+        drift = self.difficulty.enemy_speed + player_speed * self.difficulty.enemy_speed_share
+        self.throttle, self.brake = physics.cruise(self.speed, max(0.0, player_speed - drift + self.pace),
+                                                   self.bike_params)
+
+    def change_state(self, new_state):
+        """Change the enemy's state"""
+        telemetry.emit("enemy_state", detail=f"{self.state}->{new_state}")
+        self.state = new_state
+        self.pace = 0.0
+
+    def patrol(self):
+        """Patrol behavior - weave side to side"""
+        road_right = ROAD_RIGHT - ENEMY_WIDTH
+
+        # Decrease patrol timer
+        self.patrol_timer -= 1
+
+        # Change direction if at a road edge or timer expired
+        if self.x <= ROAD_LEFT or self.x >= road_right or self.patrol_timer <= 0:
+            self.patrol_direction *= -1
+            self.patrol_timer = random.randint(30, 90)
+
+        # Lean in patrol direction
+        self.steer = physics.steer_for(self.patrol_direction * self.difficulty.patrol_speed)
+
+    def chase(self, dx, dy, navigation=None, speed=1.0):
+        """Chase behavior - follow the flow field toward the player's side
+
+        speed scales the difficulty's chase speed.
+        """
+        flow = navigation.flow_at(self.x, self.y) if navigation else None
+        if flow is None:
+            # No field, or no way through: head straight for the player
+            distance = max(1, (dx**2 + dy**2)**0.5)
+            flow = (dx / distance, 0.0)
+
+        # Steer along the flow, and speed up or drop back to follow it down the road
+        fx, fy = flow
+        chase_speed = self.difficulty.chase_speed * speed
+        self.steer = physics.steer_for(fx * chase_speed)
+        self.pace = -fy * chase_speed
+
+    def retreat(self, side, speed=1.0):
+        """Retreat behavior - veer away from the player's side and drop back"""
+        retreat_speed = self.difficulty.chase_speed * speed
+        self.steer = physics.steer_for(-side * retreat_speed)
+        self.pace = -retreat_speed
+
+    def attack(self, dx, dy, side, move="punch"):
+        """Attack behavior - hold position beside the player and punch or kick toward side"""
+        # Close the remaining gap, no faster than the attack speed
+        speed = self.difficulty.attack_speed
+        self.steer = physics.steer_for(max(-speed, min(dx, speed)))
+
+        if self.attack_cooldown <= 0 and self.stun <= 0:
+            # Throw the move; combat.Combat counts the cooldown down
+            self.pending_attack = (move, side)
+            self.attack_cooldown = max(self.difficulty.attack_cooldown, ATTACKS[move].cooldown)
+
+    def draw(self, screen):
+        """Draw the enemy on the screen"""
+        screen.blit(self.sprite, (self.x, self.y))
+
+    def get_rect(self):
+        """Get the enemy's rectangle for collision detection"""
+        return pygame.Rect(self.x, self.y, ENEMY_WIDTH, ENEMY_HEIGHT)
+
+
+class Road:
+    """Road class for handling road animation"""
+    def __init__(self):
+        self.width = ROAD_WIDTH
+        self.x = ROAD_LEFT
+        self.stripe_height = 50
+        self.stripe_width = 10
+        self.stripe_gap = 30
+        self.stripes = []
+
+        # Initialize road stripes
+        for y in range(-self.stripe_height, SCREEN_HEIGHT + self.stripe_height, self.stripe_height + self.stripe_gap):
+            self.stripes.append(y)
+
+    def update(self, speed):
+        """Update road stripe positions for scrolling effect"""
+        for i in range(len(self.stripes)):
+            self.stripes[i] += speed
+
+            # If stripe goes off screen, reset to top
+            if self.stripes[i] > SCREEN_HEIGHT:
+                self.stripes[i] = -self.stripe_height
+
+    def draw(self, screen, stripes=None, color=GRAY, stripe_color=WHITE):
+        """Draw the road and stripes (optionally at captured stripe positions and in lit colors)"""
+        # Draw road
+        screen.fill(color, (self.x, 0, self.width, SCREEN_HEIGHT))
+
+        # Draw center line stripes
+        for y in (self.stripes if stripes is None else stripes):
+            screen.fill(stripe_color,
+                        (self.x + (self.width // 2) - (self.stripe_width // 2),
+                         y,
+                         self.stripe_width,
+                         self.stripe_height))
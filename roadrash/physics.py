@@ -0,0 +1,193 @@
+"""
+Bike physics for the Road Rash style game.
+
+Every rider (the player and the enemy bikers) is driven by the same model,
+integrated for all riders at once on NumPy columns:
+- Forward speed: the engine pushes with acceleration * throttle, drag grows
+  with the square of speed so a fully open throttle levels off at
+  max_speed, and brakes take off up to BRAKE_DECEL. A rider never drops
+  below its idle throttle's speed unless it brakes.
+- Lean follows the steering input at a limited rate, and the lean sets the
+  lateral speed the bike wants; lateral grip limits how quickly the actual
+  lateral speed gets there, so bikes drift into and out of turns.
+- The player can also surge up and down the screen (throttle moves the
+  bike up, braking down), with the same grip limit. Other riders move down
+  the screen at the difference between the player's speed and their own.
+
+Speeds are in pixels per tick, as everywhere else in the game. Each game
+tick (60 per second) is integrated in SUBSTEPS fixed substeps, whatever
+the render rate, so handling does not depend on the frame rate.
+
+Run this module to benchmark 500 riders integrated per tick.
+"""
+
+import math
+from collections import namedtuple
+
+import numpy as np
+
+# Fixed integration rate: substeps per 60 Hz tick
+SUBSTEPS = 4
+
+# Lean: full lean in radians and how fast the rider can tip in (radians per tick)
+MAX_LEAN = 0.6
+LEAN_RATE = 0.15
+
+# Lateral speed at full lean, and the most it can change per tick (grip)
+MAX_LATERAL = 5.0
+LATERAL_GRIP = 1.5
+# Below this forward speed a bike loses steering authority
+MIN_TURN_SPEED = 1.0
+
+# Braking deceleration per tick at full brake
+BRAKE_DECEL = 0.25
+
+# Player surge up and down the screen
+MAX_SURGE = 5.0
+SURGE_GRIP = 1.5
+
+# Enemy cruise control: throttle or brake per pixel/tick of speed error
+CRUISE_GAIN = 0.5
+
+# Per-rider handling: max_speed and acceleration in pixels per tick (per tick),
+# idle throttle the engine never drops below, and 1 if the rider can surge
+BikeParams = namedtuple("BikeParams", "max_speed acceleration idle_throttle surge")
+
+# Rider attributes integrated (state) and only read (inputs)
+STATE_FIELDS = ("x", "y", "speed", "vx", "vy", "lean")
+INPUT_FIELDS = ("throttle", "brake", "steer")
+
+
+def bike_params(difficulty, player=False):
+    """Handling for a rider from a config.Difficulty preset
+
+    The player's engine idles at the road speed and the player can surge;
+    AI riders set their own throttle (see cruise) and do neither.
+    """
+    if player:
+        return BikeParams(difficulty.max_speed, difficulty.acceleration,
+                          (difficulty.road_speed / difficulty.max_speed) ** 2, 1.0)
+    return BikeParams(difficulty.max_speed, difficulty.acceleration, 0.0, 0.0)
+
+
+def cruise(speed, target, params):
+    """Throttle and brake that hold a target speed"""
+    error = target - speed
+    # Feed forward the throttle whose drag balances the target speed
+    throttle = (target / params.max_speed) ** 2 + error * CRUISE_GAIN
+    brake = -error * CRUISE_GAIN if error < 0 else 0.0
+    return min(1.0, max(0.0, throttle)), min(1.0, brake)
+
+
+def steer_for(lateral_speed):
+    """Steering input whose lean settles at a lateral speed (pixels per tick)"""
+    lean = math.atan(lateral_speed * math.tan(MAX_LEAN) / MAX_LATERAL)
+    return max(-1.0, min(1.0, lean / MAX_LEAN))
+
+
+class Bikes:
+    """Physics state and inputs of n riders, one NumPy column per field"""
+    def __init__(self, count):
+        self.count = count
+        for field in STATE_FIELDS + INPUT_FIELDS + ("width", "height") + BikeParams._fields:
+            setattr(self, field, np.zeros(count))
+
+    @classmethod
+    def gather(cls, riders):
+        """Copy the state, inputs and handling of rider objects into columns"""
+        bikes = cls(len(riders))
+        for field in STATE_FIELDS + INPUT_FIELDS + ("width", "height"):
+            getattr(bikes, field)[:] = [getattr(rider, field) for rider in riders]
+        params = np.array([rider.bike_params for rider in riders], dtype=np.float64).reshape(-1, 4)
+        for i, field in enumerate(BikeParams._fields):
+            getattr(bikes, field)[:] = params[:, i]
+        return bikes
+
+    def scatter(self, riders):
+        """Copy integrated state back to the rider objects"""
+        columns = [getattr(self, field).tolist() for field in STATE_FIELDS]
+        for rider, values in zip(riders, zip(*columns)):
+            rider.x, rider.y, rider.speed, rider.vx, rider.vy, rider.lean = values
+
+    def integrate(self, camera_speed, bounds, substeps=SUBSTEPS):
+        """Advance every rider by one tick
+
+        camera_speed is the speed the view scrolls at (the player's speed);
+        bounds is (left, right, bottom): the road edges and the lowest a
+        surging rider's top may go.
+        """
+        left, right, bottom = bounds
+        h = 1.0 / substeps
+        lean_step = LEAN_RATE * h
+        grip_step = LATERAL_GRIP * h
+        surge_step = SURGE_GRIP * h
+        right_edge = right - self.width
+        bottom_edge = bottom - self.height
+        surging = self.surge > 0
+        throttle = np.maximum(self.throttle, self.idle_throttle)
+        target_lean = np.clip(self.steer, -1.0, 1.0) * MAX_LEAN
+        target_vy = (self.brake - self.throttle) * MAX_SURGE * self.surge
+        lateral_scale = MAX_LATERAL / math.tan(MAX_LEAN)
+        speed, vx, vy, lean, x, y = self.speed, self.vx, self.vy, self.lean, self.x, self.y
+
+        for _ in range(substeps):
+            lean += np.clip(target_lean - lean, -lean_step, lean_step)
+
+            # Engine against quadratic drag, then brakes
+            ratio = speed / self.max_speed
+            accel = self.acceleration * (throttle - ratio * ratio) - self.brake * BRAKE_DECEL
+            np.maximum(speed + accel * h, 0.0, out=speed)
+
+            # Lateral speed chases what the lean asks for, as fast as grip allows
+            authority = np.minimum(speed / MIN_TURN_SPEED, 1.0)
+            wanted = np.tan(lean) * lateral_scale * authority
+            vx += np.clip(wanted - vx, -grip_step, grip_step)
+            x += vx * h
+
+            vy += np.clip(target_vy - vy, -surge_step, surge_step)
+            y += np.where(surging, vy, camera_speed - speed) * h
+
+        # Road edges stop lateral motion; surging riders stay on screen
+        low, high = x < left, x > right_edge
+        np.clip(x, left, right_edge, out=x)
+        vx[low | high] = 0.0
+        y[:] = np.where(surging, np.clip(y, 0.0, bottom_edge), y)
+
+
+if __name__ == "__main__":
+    import time
+
+    from .config import ROAD_LEFT, ROAD_RIGHT, SCREEN_HEIGHT, load_difficulty
+
+    # 500 riders weaving, accelerating and braking at random
+    rng = np.random.default_rng(0)
+    difficulty = load_difficulty()
+    count = 500
+    bikes = Bikes(count)
+    for field, value in zip(BikeParams._fields, bike_params(difficulty)):
+        getattr(bikes, field)[:] = value
+    for field, value in zip(BikeParams._fields, bike_params(difficulty, player=True)):
+        getattr(bikes, field)[0] = value
+    bikes.width[:] = 50
+    bikes.height[:] = 100
+    bikes.x[:] = rng.uniform(ROAD_LEFT, ROAD_RIGHT - 50, count)
+    bikes.y[:] = rng.uniform(-SCREEN_HEIGHT, SCREEN_HEIGHT, count)
+    bikes.speed[:] = rng.uniform(difficulty.road_speed, difficulty.max_speed, count)
+
+    ticks = 600
+    frame_ms = 1000.0 / 60
+    bounds = (ROAD_LEFT, ROAD_RIGHT, SCREEN_HEIGHT)
+    elapsed = 0.0
+    for tick in range(ticks):
+        if tick % 30 == 0:
+            bikes.steer[:] = rng.uniform(-1, 1, count)
+            bikes.throttle[:] = rng.uniform(0, 1, count)
+            bikes.brake[:] = np.where(rng.random(count) < 0.2, 1.0, 0.0)
+        start = time.perf_counter()
+        bikes.integrate(bikes.speed[0], bounds)
+        elapsed += time.perf_counter() - start
+    tick_ms = elapsed / ticks * 1000
+    print(f"{count} riders, {SUBSTEPS} substeps: {tick_ms:.3f} ms per tick "
+          f"({tick_ms / frame_ms:.1%} of a {frame_ms:.1f} ms frame)")
+    print(f"Speeds {bikes.speed.min():.2f}..{bikes.speed.max():.2f}, "
+          f"lateral {np.abs(bikes.vx).max():.2f} px/tick, lean {np.abs(bikes.lean).max():.2f} rad")
@@ -0,0 +1,189 @@
+"""
+Pipelined simulation/render loop for the Road Rash style game.
+
+The simulation runs on a worker thread at a fixed tick rate: it applies the
+latest input, calls Game.update and publishes an immutable Frame from
+Game.capture_frame. The main thread (which must own the window and the SDL
+event queue) samples input, waits for the newest frame and draws it with
+Game.draw_frame. Blitting releases the GIL inside SDL, so heavy update ticks
+overlap with rendering.
+
+Hot-reloaded sprites are converted on the main thread (it owns the
+display), which also drops its scaled copies of them, and handed to the
+simulation thread, which swaps them in between ticks: the asset table,
+riders and lighting tints are only changed by the thread that reads them
+in capture_frame.
+
+Each drawn frame's render time goes to Game.record_frame_time, which reports
+frame spikes to telemetry; adaptive quality is not applied in this mode.
+
+On exit the runner reports how much simulation and rendering overlapped and
+the input-to-photon latency (input sampled to frame flipped).
+"""
+
+import queue
+import statistics
+import threading
+import time
+from collections import deque
+
+import pygame
+
+from . import controls
+
+# Number of work intervals/latencies kept for the report
+HISTORY = 10000
+
+
+def overlap_time(a, b):
+    """Total time two sorted lists of (start, end) intervals overlap"""
+    total = 0.0
+    i = j = 0
+    while i < len(a) and j < len(b):
+        start = max(a[i][0], b[j][0])
+        end = min(a[i][1], b[j][1])
+        if end > start:
+            total += end - start
+        if a[i][1] < b[j][1]:
+            i += 1
+        else:
+            j += 1
+    return total
+
+
+class PipelinedRunner:
+    """Runs Game.update on a worker thread and rendering on the main thread"""
+    def __init__(self, game, fps=60):
+        self.game = game
+        self.tick_seconds = 1.0 / fps
+        self.inputs = queue.SimpleQueue()
+        self.swaps = queue.SimpleQueue()        # (name, sprite) reloaded on the main thread
+        self.frame_ready = threading.Condition()
+        self.latest = None
+        self.sequence = 0
+        self.sim_intervals = deque(maxlen=HISTORY)
+        self.render_intervals = deque(maxlen=HISTORY)
+        self.latencies = deque(maxlen=HISTORY)
+
+    def simulate(self):
+        """Simulation thread: apply input, update and publish frames"""
+        game = self.game
+        actions = None
+        next_tick = time.perf_counter()
+        while game.running:
+            # Sprites reloaded since the last tick
+            while True:
+                try:
+                    name, sprite = self.swaps.get_nowait()
+                except queue.Empty:
+                    break
+                game.swap_asset(name, sprite, clear_canvas=False)
+
+            # Merge all input sampled since the last tick
+            events = []
+            samples = []
+            input_time = None
+            while True:
+                try:
+                    batch_events, batch_actions, sampled = self.inputs.get_nowait()
+                except queue.Empty:
+                    break
+                events.extend(batch_events)
+                samples.append(batch_actions)
+                if input_time is None:
+                    input_time = sampled
+
+            # Held inputs carry over to ticks without a new sample; attacks do not
+            if samples:
+                actions = controls.merge(samples)
+            elif actions is not None:
+                actions = actions._replace(attack=None)
+
+            start = time.perf_counter()
+            # Every tick is applied, and logged, even before the first sample arrives
+            game.apply_input(events, actions or controls.IDLE)
+            game.update()
+            frame = game.capture_frame(input_time)
+            self.sim_intervals.append((start, time.perf_counter()))
+
+            with self.frame_ready:
+                self.latest = frame
+                self.sequence += 1
+                self.frame_ready.notify()
+
+            # Fixed tick rate; drop ticks instead of spiralling when behind
+            next_tick += self.tick_seconds
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            elif delay < -self.tick_seconds:
+                next_tick = time.perf_counter()
+
+        with self.frame_ready:
+            self.frame_ready.notify()
+
+    def run(self):
+        """Main thread: sample input and draw the newest frame"""
+        game = self.game
+        thread = threading.Thread(target=self.simulate, name="simulation", daemon=True)
+        thread.start()
+
+        drawn = 0
+        while game.running:
+            if game.asset_watcher:
+                reloaded = game.asset_watcher.drain()
+                if reloaded:
+                    game.canvas.lod.clear()
+                for name, sprite in reloaded:
+                    self.swaps.put((name, sprite))
+
+            events = pygame.event.get()
+            game.handle_window_events(events)
+            self.inputs.put((events, game.controls.sample(events), time.perf_counter()))
+
+            with self.frame_ready:
+                self.frame_ready.wait_for(lambda: self.sequence != drawn or not game.running,
+                                          timeout=0.1)
+                frame = self.latest
+                sequence = self.sequence
+            if frame is None or sequence == drawn:
+                continue
+            drawn = sequence
+
+            start = time.perf_counter()
+            game.draw_frame(frame)
+            end = time.perf_counter()
+            self.render_intervals.append((start, end))
+            game.record_frame_time((end - start) * 1000, adapt=False)
+            if frame.input_time is not None:
+                self.latencies.append(end - frame.input_time)
+
+        thread.join()
+        self.print_report()
+        game.shutdown()
+
+    def report(self):
+        """Summarize overlap and input-to-photon latency"""
+        sim = list(self.sim_intervals)
+        render = list(self.render_intervals)
+        sim_busy = sum(end - start for start, end in sim)
+        render_busy = sum(end - start for start, end in render)
+        overlap = overlap_time(sim, render)
+        latencies = sorted(self.latencies)
+        return {
+            "sim_busy": sim_busy,
+            "render_busy": render_busy,
+            "overlap": overlap,
+            "overlap_fraction": overlap / min(sim_busy, render_busy) if sim and render else 0.0,
+            "latency_median": statistics.median(latencies) if latencies else 0.0,
+            "latency_p95": latencies[int(len(latencies) * 0.95)] if latencies else 0.0,
+            "latency_max": latencies[-1] if latencies else 0.0,
+        }
+
+    def print_report(self):
+        """Print the pipeline report"""
+        stats = self.report()
+        print(f"Simulation busy {stats['sim_busy']:.2f} s, render busy {stats['render_busy']:.2f} s, "
+              f"overlap {stats['overlap']:.2f} s ({stats['overlap_fraction']:.0%})")
+        print(f"Input-to-photon latency: median {stats['latency_median'] * 1000:.1f} ms, "
+              f"p95 {stats['latency_p95'] * 1000:.1f} ms, max {stats['latency_max'] * 1000:.1f} ms")
@@ -0,0 +1,75 @@
+"""
+Adaptive quality control for the Road Rash style game.
+
+clock.tick can only throttle a fast machine, it cannot help a slow one. The
+QualityController watches how long each frame's work takes and steps detail
+down when the frame budget is missed, and back up when there is headroom.
+Every adjustment is sent to telemetry as a "quality" event (the new level,
+with the old level and the average frame work that triggered it), and with
+verbose=True (--verbose) printed as well, so the thresholds can be tuned.
+"""
+
+from collections import deque
+
+from . import telemetry
+
+# Detail levels from best to cheapest. Only a 1/2 render scale saves time;
+# 3/4 costs more to upscale than it saves (see render_target.py)
+QUALITY_LEVELS = [
+    {"clouds": 5, "grass_patches": 10, "render_scale": 1.0, "ai_interval": 1},
+    {"clouds": 3, "grass_patches": 8, "render_scale": 1.0, "ai_interval": 2},
+    {"clouds": 2, "grass_patches": 6, "render_scale": 1.0, "ai_interval": 2},
+    {"clouds": 1, "grass_patches": 4, "render_scale": 0.5, "ai_interval": 3},
+    {"clouds": 0, "grass_patches": 2, "render_scale": 0.5, "ai_interval": 4},
+]
+
+# Thresholds as fractions of the frame budget
+DOWNGRADE_LOAD = 0.9     # Average work time above this lowers detail
+UPGRADE_LOAD = 0.5       # Average work time below this raises detail
+DOWNGRADE_WINDOW = 30    # Frames averaged before lowering detail
+UPGRADE_WINDOW = 180     # Frames averaged before raising detail
+COOLDOWN = 60            # Frames to wait after any adjustment
+
+
+class QualityController:
+    """Adjusts the game's detail level to hold a frame time budget"""
+    def __init__(self, game, fps=60, level=0, levels=QUALITY_LEVELS, verbose=False):
+        self.game = game
+        self.verbose = verbose
+        self.budget_ms = 1000.0 / fps
+        self.levels = levels
+        self.level = level
+        self.frame_times = deque(maxlen=UPGRADE_WINDOW)
+        self.cooldown = 0
+        self.game.apply_quality(self.levels[self.level])
+
+    def record(self, frame_ms):
+        """Record the work time of one frame and adjust detail if needed"""
+        self.frame_times.append(frame_ms)
+        if self.cooldown > 0:
+            self.cooldown -= 1
+            return
+
+        if len(self.frame_times) >= DOWNGRADE_WINDOW:
+            recent = list(self.frame_times)[-DOWNGRADE_WINDOW:]
+            average = sum(recent) / DOWNGRADE_WINDOW
+            if average > self.budget_ms * DOWNGRADE_LOAD and self.level < len(self.levels) - 1:
+                self.set_level(self.level + 1, average)
+                return
+
+        if len(self.frame_times) == UPGRADE_WINDOW:
+            average = sum(self.frame_times) / UPGRADE_WINDOW
+            if average < self.budget_ms * UPGRADE_LOAD and self.level > 0:
+                self.set_level(self.level - 1, average)
+
+    def set_level(self, level, average_ms):
+        """Switch to another detail level and report why"""
+        telemetry.emit("quality", level, f"{self.level}->{level} {average_ms:.2f} ms")
+        if self.verbose:
+            print(f"Quality level {self.level} -> {level}: average frame work "
+                  f"{average_ms:.2f} ms, budget {self.budget_ms:.2f} ms, "
+                  f"settings {self.levels[level]}")
+        self.level = level
+        self.game.apply_quality(self.levels[level])
+        self.frame_times.clear()
+        self.cooldown = COOLDOWN
@@ -0,0 +1,307 @@
+"""
+Internal render target for the Road Rash style game.
+
+The scene is drawn in logical coordinates (the game's fixed 800x600 world)
+into a RenderTarget, whatever the window's size. The window can be any
+size and resized live: on every resize the Layout (the largest viewport
+of the logical aspect ratio that fits, letterboxed, and its scale) is
+computed once, and everything drawn is scaled by it.
+
+At render scale 1.0 the scene is drawn at the window's resolution, straight
+into the viewport of the screen. At lower scales it draws into a smaller
+internal surface and present() upscales the result, either nearest-neighbor
+or with scale2x (only for an exact 2x factor). Fewer pixels are filled and
+blitted per frame. Sprites are scaled once per scale and cached. The
+scene's sprites (drawn in batches) are kept in a lod.LODCache at their
+exact size, bounded by memory, so a copy outlives a change of render scale
+or window size and is reused when adaptive quality or the window goes back
+to it. Single blits (HUD text, made every frame) are only cached for the
+current scale and drop out once unused.
+
+The upscale is not free, so only an integer factor pays off (measured with
+rain and night lighting, software rendering): at 1/2 scale a frame costs
+1.03 ms against 1.22 ms native in an 800x600 window and 2.16 ms against
+3.61 ms at 1600x1200, while 3/4 scale is slower than native at every size
+(1.81 and 4.88 ms). Adaptive quality therefore only ever drops to 1/2.
+
+After a resize the sprites in use are rescaled on a background thread.
+Until they are ready, frames draw with their copies at the previous size
+(off by a few percent for a frame or two), so resizing does not stall.
+Sprites still in the LOD cache at the new size are not rescaled at all.
+
+Sprites drawn at a variable size (blit with size) come from the same
+LODCache, at the nearest of its levels.
+
+Run this module to benchmark fill-rate savings against image quality.
+"""
+
+import threading
+import weakref
+from collections import namedtuple
+
+import pygame
+
+from .lod import LODCache
+
+# Upscale filters for present()
+NEAREST = "nearest"
+SCALE2X = "scale2x"
+UPSCALE_MODES = (NEAREST, SCALE2X)
+
+
+# Window size, the letterboxed viewport (x, y, width, height) and logical-to-window scale
+Layout = namedtuple("Layout", "window viewport fit")
+
+
+def compute_layout(window_size, logical_size):
+    """The largest viewport with the logical aspect ratio centred in a window"""
+    window_width, window_height = window_size
+    logical_width, logical_height = logical_size
+    fit = min(window_width / logical_width, window_height / logical_height)
+    width, height = max(1, round(logical_width * fit)), max(1, round(logical_height * fit))
+    viewport = ((window_width - width) // 2, (window_height - height) // 2, width, height)
+    return Layout(tuple(window_size), viewport, fit)
+
+
+def parse_resolution(text):
+    """Parse a WIDTHxHEIGHT string such as '400x300'"""
+    width, height = text.lower().split("x")
+    return int(width), int(height)
+
+
+class RenderTarget:
+    """Drawing surface for a window of any size, optionally at a reduced internal resolution
+
+    render_scale is the fraction of the window's resolution drawn at; scale
+    is the resulting factor from logical coordinates to surface pixels.
+    """
+    def __init__(self, screen, scale=1.0, upscale=NEAREST, logical_size=None):
+        if upscale not in UPSCALE_MODES:
+            raise ValueError(f"Unknown upscale mode: {upscale}")
+        self.logical_size = tuple(logical_size or screen.get_size())
+        self.upscale = upscale
+        # Nearest-neighbor like the upscale, so scaled copies keep the sprites' hard edges
+        self.lod = LODCache(smooth=False)
+        self.rescaling = None       # (thread, result, previous sprites) while sprites are rescaled
+        self.scaled_sprites = weakref.WeakKeyDictionary()
+        self.render_scale = scale
+        self.resize(screen, background=False)
+
+    def resize(self, screen, background=True):
+        """Follow a new window surface; recomputes the layout once
+
+        With background=True the sprites in use are rescaled on a thread and
+        swapped in when done; until then their previous copies are drawn.
+        """
+        previous = self.scaled_sprites
+        self.screen = screen
+        self.layout = compute_layout(screen.get_size(), self.logical_size)
+        screen.fill((0, 0, 0))
+        self.set_scale(self.render_scale)
+        if not background or not previous or self.scale == 1.0:
+            self.rescaling = None
+            return
+
+        # Sprites still cached at this size from an earlier visit need no work
+        sprites = [sprite for sprite in previous.keys() if self.lod.get_exact(sprite, self.scale, make=False) is None]
+        result = {}
+        thread = threading.Thread(target=self.rescale_sprites, args=(sprites, self.scale, result),
+                                  name="sprite-rescale", daemon=True)
+        self.rescaling = (thread, result, previous)
+        thread.start()
+
+    @staticmethod
+    def rescale_sprites(sprites, scale, result):
+        """Background thread: scale sprites into result"""
+        for sprite in sprites:
+            width, height = sprite.get_size()
+            result[sprite] = pygame.transform.scale(sprite, (max(1, int(width * scale)),
+                                                             max(1, int(height * scale))))
+
+    def finish_rescaling(self):
+        """Swap in the background-rescaled sprites once they are done"""
+        thread, result, _ = self.rescaling
+        if thread.is_alive():
+            return
+        self.rescaling = None
+        for sprite, scaled in result.items():
+            self.scaled_sprites.setdefault(sprite, scaled)
+            self.lod.put_exact(sprite, scaled)
+
+    def set_scale(self, scale):
+        """Change the render scale (1.0 = the window's resolution)"""
+        self.rescaling = None
+        self.render_scale = scale
+        x, y, width, height = self.layout.viewport
+        self.scale = self.layout.fit * scale
+        if scale == 1.0:
+            self.surface = self.screen.subsurface(self.layout.viewport)
+        else:
+            size = (max(1, int(width * scale)), max(1, int(height * scale)))
+            self.surface = pygame.Surface(size).convert(self.screen)
+
+        # Scaled copies of sprites; per-frame surfaces (HUD text) drop out on their own
+        self.scaled_sprites = weakref.WeakKeyDictionary()
+
+    def get_size(self):
+        """Logical size of the target"""
+        return self.logical_size
+
+    def scaled_sprite(self, sprite, keep=True):
+        """Get a sprite scaled to the internal resolution, cached
+
+        keep=True also keeps it in the LOD cache for later scale changes.
+        """
+        scaled = self.scaled_sprites.get(sprite)
+        if scaled is not None:
+            return scaled
+        if keep:
+            scaled = self.lod.get_exact(sprite, self.scale, make=False)
+        if scaled is None and self.rescaling is not None:
+            # Still being rescaled in the background: draw the previous size meanwhile
+            scaled = self.rescaling[2].get(sprite)
+            if scaled is not None:
+                return scaled
+        if scaled is None:
+            if keep:
+                scaled = self.lod.get_exact(sprite, self.scale)
+            else:
+                width, height = sprite.get_size()
+                scaled = pygame.transform.scale(sprite, (max(1, int(width * self.scale)),
+                                                         max(1, int(height * self.scale))))
+        self.scaled_sprites[sprite] = scaled
+        return scaled
+
+    def blit(self, sprite, position, size=1.0, special_flags=0):
+        """Draw a sprite at a position given in logical coordinates
+
+        size draws the sprite larger or smaller, using the nearest cached
+        level-of-detail variant.
+        """
+        if size != 1.0:
+            x, y = position[0], position[1]
+            return self.surface.blit(self.lod.get(sprite, size * self.scale), (x * self.scale, y * self.scale),
+                                     special_flags=special_flags)
+        if self.scale == 1.0:
+            return self.surface.blit(sprite, position, special_flags=special_flags)
+        x, y = position[0], position[1]
+        return self.surface.blit(self.scaled_sprite(sprite, keep=False), (x * self.scale, y * self.scale),
+                                 special_flags=special_flags)
+
+    def blits(self, batch):
+        """Draw a render_queue batch of (sprite, (x, y)) in one Surface.blits call"""
+        if self.rescaling is not None:
+            self.finish_rescaling()
+        if self.scale != 1.0:
+            s = self.scale
+            batch = [(self.scaled_sprite(sprite), (x * s, y * s)) for sprite, (x, y) in batch]
+        self.surface.blits(batch, doreturn=False)
+
+    def fill(self, color, rect=None, special_flags=0):
+        """Fill the whole target, or a rectangle given in logical coordinates"""
+        if rect is None or self.scale == 1.0:
+            return self.surface.fill(color, rect, special_flags)
+        x, y, width, height = rect
+        s = self.scale
+        return self.surface.fill(color, (round(x * s), round(y * s),
+                                         max(1, round(width * s)), max(1, round(height * s))), special_flags)
+
+    def present(self):
+        """Copy the internal surface to the screen's viewport"""
+        if self.render_scale == 1.0:
+            return
+        viewport = self.screen.subsurface(self.layout.viewport)
+        size = viewport.get_size()
+        if self.upscale == SCALE2X and self.surface.get_width() * 2 == size[0] \
+                and self.surface.get_height() * 2 == size[1]:
+            pygame.transform.scale2x(self.surface, viewport)
+        else:
+            pygame.transform.scale(self.surface, size, viewport)
+
+
+def psnr(reference, image):
+    """Peak signal-to-noise ratio between two equal-size surfaces, in dB"""
+    import numpy
+
+    a = pygame.surfarray.pixels3d(reference).astype(numpy.float32)
+    b = pygame.surfarray.pixels3d(image).astype(numpy.float32)
+    mse = float(numpy.mean((a - b) ** 2))
+    if mse == 0:
+        return float("inf")
+    return 10 * numpy.log10(255.0 ** 2 / mse)
+
+
+if __name__ == "__main__":
+    import os
+    import random
+    import time
+
+    # Benchmark draw cost and image quality at several internal resolutions
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    from .game import Game
+
+    random.seed(0)
+    game = Game(adaptive_quality=False, weather="rain", lighting="night")
+    for _ in range(120):
+        game.update()
+
+    frames = 300
+    logical_size = game.canvas.logical_size
+    print(f"{'window':>10} {'internal':>10} {'upscale':>8} {'pixels':>7} {'ms/frame':>9} {'vs native':>9} "
+          f"{'PSNR dB':>8}")
+    for window in ((800, 600), (1600, 1200)):
+        game.screen = pygame.display.set_mode(window)
+        reference = native = None
+        for scale in (1.0, 0.75, 0.5, 0.25):
+            for upscale in UPSCALE_MODES:
+                if upscale == SCALE2X and scale != 0.5:
+                    continue
+                game.canvas = RenderTarget(game.screen, scale, upscale, logical_size)
+                game.draw()
+                start = time.perf_counter()
+                for _ in range(frames):
+                    game.draw()
+                elapsed = (time.perf_counter() - start) / frames
+
+                if reference is None:
+                    reference, native = game.screen.copy(), elapsed
+                width, height = game.canvas.surface.get_size()
+                print(f"{window[0]:>4}x{window[1]:<5} {width:>4}x{height:<5} {upscale:>8} {scale * scale:>6.0%} "
+                      f"{elapsed * 1000:>9.3f} {elapsed / native:>8.0%} {psnr(reference, game.screen):>8.1f}")
+    game.screen = pygame.display.set_mode(logical_size)
+
+    # Frame time right after a resize: sprites rescaled in the background or before the frame
+    game.canvas = RenderTarget(game.screen, logical_size=logical_size)
+    game.draw()
+    for background in (True, False):
+        worst = 0.0
+        for size in ((1280, 960), (640, 480), (1600, 1200), (800, 600)):
+            screen = pygame.display.set_mode(size)
+            start = time.perf_counter()
+            game.canvas.resize(screen, background)
+            game.draw()
+            worst = max(worst, time.perf_counter() - start)
+            if game.canvas.rescaling:
+                game.canvas.rescaling[0].join()
+            game.draw()
+        label = "background rescale" if background else "rescale in frame"
+        print(f"{label}: worst frame after a resize {worst * 1000:.3f} ms")
+
+    # Frames right after adaptive quality switches render scale, with the LOD cache kept or emptied
+    game.screen = pygame.display.set_mode((1600, 1200))
+    game.canvas = RenderTarget(game.screen, logical_size=logical_size)
+    game.draw()
+    times = {False: [], True: []}
+    for _ in range(20):
+        for keep in (False, True):
+            for scale in (0.5, 1.0):
+                if not keep:
+                    game.canvas.lod.clear()
+                start = time.perf_counter()
+                game.canvas.set_scale(scale)
+                game.draw()
+                times[keep].append(time.perf_counter() - start)
+    for keep, label in ((False, "LOD cache emptied"), (True, "LOD cache kept")):
+        print(f"{label}: first frame after a quality change {sum(times[keep]) / len(times[keep]) * 1000:.3f} ms mean, "
+              f"{max(times[keep]) * 1000:.3f} ms worst")
+    print(f"LOD cache: {game.canvas.lod.stats()}")
@@ -0,0 +1,162 @@
+"""
+Rewind buffer for the Road Rash style game.
+
+Keeps a memory-bounded ring buffer of per-tick state deltas built from
+savestate snapshots. Every tick stores the XOR of its snapshot against the
+previous tick, compressed with zlib (consecutive ticks differ in only a few
+bytes, so deltas are tiny). Every keyframe_interval ticks the full snapshot
+is stored as well, so any tick still in the buffer can be rebuilt from the
+nearest keyframe. Stepping backwards one tick at a time only needs the
+latest delta, since XOR is its own inverse.
+"""
+
+import zlib
+from collections import deque
+
+# Defaults: one keyframe per second at 60 FPS, 8 MB of history
+KEYFRAME_INTERVAL = 60
+MAX_BYTES = 8 * 1024 * 1024
+COMPRESSION_LEVEL = 1
+
+
+def _xor(a, b):
+    """XOR two equal-length byte strings"""
+    n = len(a)
+    return (int.from_bytes(a, "little") ^ int.from_bytes(b, "little")).to_bytes(n, "little")
+
+
+class RewindBuffer:
+    """Ring buffer of compressed per-tick deltas with periodic keyframes"""
+    def __init__(self, max_bytes=MAX_BYTES, keyframe_interval=KEYFRAME_INTERVAL):
+        self.max_bytes = max_bytes
+        self.keyframe_interval = keyframe_interval
+        self.clear()
+
+    def clear(self):
+        """Drop all recorded history"""
+        # Each entry is [delta, keyframe, size]; delta is None for the oldest entry
+        self.entries = deque()
+        self.first_tick = 0
+        self.last = None
+        self.used_bytes = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    @property
+    def last_tick(self):
+        """Tick number of the most recent entry"""
+        return self.first_tick + len(self.entries) - 1
+
+    def record(self, snapshot):
+        """Append the snapshot for the next tick"""
+        if self.last is not None and len(snapshot) != len(self.last):
+            # Layout changed (different entity counts), old deltas are useless
+            self.clear()
+
+        if self.last is None:
+            delta = None
+        else:
+            delta = zlib.compress(_xor(snapshot, self.last), COMPRESSION_LEVEL)
+
+        tick = self.first_tick + len(self.entries)
+        keyframe = None
+        if delta is None or tick % self.keyframe_interval == 0:
+            keyframe = zlib.compress(snapshot, COMPRESSION_LEVEL)
+
+        size = (len(delta) if delta else 0) + (len(keyframe) if keyframe else 0)
+        self.entries.append([delta, keyframe, size])
+        self.used_bytes += size
+        self.last = snapshot
+        self.evict()
+
+    def evict(self):
+        """Drop the oldest history until the buffer fits in max_bytes"""
+        entries = self.entries
+        while self.used_bytes > self.max_bytes and len(entries) > 1:
+            self.used_bytes -= entries.popleft()[2]
+            self.first_tick += 1
+            # History must always start at a keyframe
+            while len(entries) > 1 and entries[0][1] is None:
+                self.used_bytes -= entries.popleft()[2]
+                self.first_tick += 1
+            oldest = entries[0]
+            if oldest[0] is not None:
+                self.used_bytes -= len(oldest[0])
+                oldest[2] -= len(oldest[0])
+                oldest[0] = None
+
+    def pop(self):
+        """Remove the latest tick and return the snapshot before it, or None"""
+        if len(self.entries) < 2:
+            return None
+        delta, _, size = self.entries.pop()
+        self.used_bytes -= size
+        self.last = _xor(self.last, zlib.decompress(delta))
+        return self.last
+
+    def snapshot_at(self, tick):
+        """Rebuild the snapshot recorded at the given tick"""
+        index = tick - self.first_tick
+        if index < 0 or index >= len(self.entries):
+            raise IndexError(f"Tick {tick} is not in the rewind buffer")
+        if index == len(self.entries) - 1:
+            return self.last
+
+        # Walk back to the nearest keyframe, then replay deltas forward
+        start = index
+        while self.entries[start][1] is None:
+            start -= 1
+        snapshot = zlib.decompress(self.entries[start][1])
+        for i in range(start + 1, index + 1):
+            snapshot = _xor(snapshot, zlib.decompress(self.entries[i][0]))
+        return snapshot
+
+    def stats(self, fps=60):
+        """Memory usage summary of the recorded history"""
+        ticks = len(self.entries)
+        seconds = ticks / fps
+        return {
+            "ticks": ticks,
+            "seconds": seconds,
+            "bytes": self.used_bytes,
+            "bytes_per_second": self.used_bytes / seconds if seconds else 0.0,
+        }
+
+
+if __name__ == "__main__":
+    import os
+    import time
+
+    # Report rewind memory use and reconstruction speed on a headless game
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    from . import savestate
+    from .game import Game
+
+    game = Game()
+    game.rewind.clear()
+    ticks = 60 * 30
+    start = time.perf_counter()
+    for _ in range(ticks):
+        game.update()
+        if game.game_over:
+            game.game_over = False
+    record_time = (time.perf_counter() - start) / ticks
+
+    stats = game.rewind.stats()
+    print(f"History: {stats['ticks']} ticks ({stats['seconds']:.1f} s)")
+    print(f"Memory:  {stats['bytes'] / 1024:.1f} KiB total, "
+          f"{stats['bytes_per_second'] / 1024:.1f} KiB per second of history")
+    print(f"Full snapshots would use {len(game.rewind.last) * 60 / 1024:.1f} KiB per second")
+    print(f"Update + record: {record_time * 1e6:.1f} us per tick")
+
+    target = game.rewind.last_tick - 60 * 10
+    start = time.perf_counter()
+    savestate.restore_state(game, game.rewind.snapshot_at(target))
+    print(f"Reconstruct tick 10 s back: {(time.perf_counter() - start) * 1e3:.2f} ms")
+
+    start = time.perf_counter()
+    steps = 0
+    while game.rewind.pop() is not None and steps < 600:
+        steps += 1
+    print(f"Step back: {(time.perf_counter() - start) / max(steps, 1) * 1e6:.1f} us per tick")
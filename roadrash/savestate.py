@@ -0,0 +1,191 @@
+"""
+Save-state snapshots for the Road Rash style game.
+
+Snapshots are a compact, versioned binary format packed with struct/array
+(no pickle). They capture the full simulation state of a running Game plus
+the state of the random module, so a restored game continues exactly as the
+original would have.
+
+Entities in the ECS world are stored per archetype, in entity type order:
+a count followed by the raw bytes of each component column.
+
+The current run's statistics (start tick, top speed, crash cause) and the
+distance the lighting has followed are stored too, so a quick load or a
+rewind puts the game over screen and the day/tunnel phase back as well.
+The crash cause is stored as an index into the causes the game can have
+(crash_causes), so a crash does not change the snapshot's length and the
+rewind buffer keeps its history across it.
+Particles are cosmetic (they have their own random generator) and are left
+as they are.
+"""
+
+import random
+import struct
+from array import array
+
+import numpy
+
+from .behavior import ACTION_NAMES
+
+# Snapshot format
+MAGIC = b"RRSS"
+VERSION = 8
+
+# Enemy states (behavior tree actions) are stored as a small index instead of a string
+STATE_NAMES = ACTION_NAMES
+STATE_INDEX = {name: i for i, name in enumerate(STATE_NAMES)}
+
+# Crash causes besides the solid entity types the player can run into
+RIDER_CRASH_CAUSES = ("enemy", "knockout")
+
+# Packed record layouts (little endian, fixed size)
+HEADER = struct.Struct("<4sHBI")         # magic, version, game_over, tick
+COUNTS = struct.Struct("<3H")            # enemies, stripes, archetypes
+PLAYER = struct.Struct("<dddqhdhh")      # x, y, speed, score, health, knockback, stun, attack_cooldown
+ENEMY = struct.Struct("<ddBbhhBhdhdd")   # x, y, state, patrol_direction, patrol_timer, attack_cooldown, has_target,
+                                         # health, knockback, stun, speed, pace
+RUN = struct.Struct("<IddB")             # run_start_tick, top_speed, lighting distance, crash cause (0 = none)
+BIKE = struct.Struct("<6d")              # vx, vy, lean, throttle, brake, steer (after each rider)
+ARCHETYPE = struct.Struct("<I")          # entity count
+RNG_TAIL = struct.Struct("<iBd")         # rng version, has_gauss_next, gauss_next
+RNG_WORDS = 625                          # Mersenne Twister state words + index
+
+
+def crash_causes(game):
+    """Every crash cause a game can record, in stored index order (from 1)"""
+    return RIDER_CRASH_CAUSES + tuple(game.world.archetypes)
+
+
+def save_state(game):
+    """Serialize the full game state and RNG state into bytes"""
+    player = game.player
+    enemies = game.enemies
+    stripes = game.road.stripes
+    archetypes = list(game.world.archetypes.values())
+
+    cause = crash_causes(game).index(game.crash_cause) + 1 if game.crash_cause else 0
+    parts = [
+        HEADER.pack(MAGIC, VERSION, 1 if game.game_over else 0, game.tick),
+        RUN.pack(game.run_start_tick, game.top_speed, game.lighting.distance, cause),
+        COUNTS.pack(len(enemies), len(stripes), len(archetypes)),
+        PLAYER.pack(player.x, player.y, player.speed, player.score,
+                    player.health, player.knockback, player.stun, player.attack_cooldown),
+        BIKE.pack(player.vx, player.vy, player.lean,
+                  player.throttle, player.brake, player.steer),
+    ]
+
+    for enemy in enemies:
+        parts.append(ENEMY.pack(enemy.x, enemy.y, STATE_INDEX[enemy.state],
+                                enemy.patrol_direction, enemy.patrol_timer,
+                                enemy.attack_cooldown,
+                                1 if enemy.target is not None else 0,
+                                enemy.health, enemy.knockback, enemy.stun, enemy.speed,
+                                enemy.pace))
+        parts.append(BIKE.pack(enemy.vx, enemy.vy, enemy.lean,
+                               enemy.throttle, enemy.brake, enemy.steer))
+
+    parts.append(array("d", stripes).tobytes())
+
+    for archetype in archetypes:
+        parts.append(ARCHETYPE.pack(archetype.count))
+        for field in archetype.type.fields:
+            parts.append(archetype[field].tobytes())
+
+    # Random module state: (version, 625 words, gauss_next)
+    rng_version, words, gauss_next = random.getstate()
+    parts.append(array("I", words).tobytes())
+    parts.append(RNG_TAIL.pack(rng_version, gauss_next is not None,
+                               gauss_next if gauss_next is not None else 0.0))
+
+    return b"".join(parts)
+
+
+def restore_state(game, data):
+    """Restore a snapshot produced by save_state into an existing game"""
+    view = memoryview(data)
+    magic, version, game_over, tick = HEADER.unpack_from(view, 0)
+    if magic != MAGIC:
+        raise ValueError("Not a Road Rash save state")
+    if version != VERSION:
+        raise ValueError(f"Unsupported save state version: {version}")
+    offset = HEADER.size
+
+    run_start_tick, top_speed, distance, cause = RUN.unpack_from(view, offset)
+    offset += RUN.size
+
+    n_enemies, n_stripes, n_archetypes = COUNTS.unpack_from(view, offset)
+    offset += COUNTS.size
+
+    # The snapshot describes entity counts, the game must already hold them
+    archetypes = list(game.world.archetypes.values())
+    if n_enemies != len(game.enemies) or n_archetypes != len(archetypes):
+        raise ValueError("Save state does not match the game's entity counts")
+
+    player = game.player
+    (player.x, player.y, player.speed, player.score,
+     player.health, player.knockback, player.stun, player.attack_cooldown) = PLAYER.unpack_from(view, offset)
+    player.pending_attack = None
+    offset += PLAYER.size
+    (player.vx, player.vy, player.lean,
+     player.throttle, player.brake, player.steer) = BIKE.unpack_from(view, offset)
+    offset += BIKE.size
+    game.game_over = bool(game_over)
+    game.tick = tick
+    game.run_start_tick, game.top_speed = run_start_tick, top_speed
+    game.crash_cause = crash_causes(game)[cause - 1] if cause else None
+    game.lighting.distance = distance
+
+    for enemy in game.enemies:
+        (enemy.x, enemy.y, state, enemy.patrol_direction, enemy.patrol_timer,
+         enemy.attack_cooldown, has_target,
+         enemy.health, enemy.knockback, enemy.stun, enemy.speed, enemy.pace) = ENEMY.unpack_from(view, offset)
+        enemy.pending_attack = None
+        enemy.state = STATE_NAMES[state]
+        enemy.target = player if has_target else None
+        offset += ENEMY.size
+        (enemy.vx, enemy.vy, enemy.lean,
+         enemy.throttle, enemy.brake, enemy.steer) = BIKE.unpack_from(view, offset)
+        offset += BIKE.size
+
+    stripes = array("d")
+    stripes.frombytes(view[offset:offset + n_stripes * 8])
+    offset += n_stripes * 8
+    game.road.stripes = stripes.tolist()
+
+    # Entity counts follow the quality level, so they may legitimately differ
+    for archetype in archetypes:
+        (count,) = ARCHETYPE.unpack_from(view, offset)
+        offset += ARCHETYPE.size
+        archetype.resize(count)
+        for field in archetype.type.fields:
+            column = archetype[field]
+            column[:] = numpy.frombuffer(view[offset:offset + column.nbytes], column.dtype)
+            offset += column.nbytes
+
+    words = array("I")
+    words.frombytes(view[offset:offset + RNG_WORDS * 4])
+    offset += RNG_WORDS * 4
+    rng_version, has_gauss, gauss_next = RNG_TAIL.unpack_from(view, offset)
+    random.setstate((rng_version, tuple(words), gauss_next if has_gauss else None))
+
+
+if __name__ == "__main__":
+    import os
+    import timeit
+
+    # Benchmark save/restore on a headless game
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    from .game import Game
+
+    game = Game()
+    for _ in range(120):
+        game.update()
+
+    snapshot = save_state(game)
+    runs = 2000
+    save_time = timeit.timeit(lambda: save_state(game), number=runs) / runs
+    restore_time = timeit.timeit(lambda: restore_state(game, snapshot), number=runs) / runs
+
+    print(f"Snapshot size: {len(snapshot)} bytes")
+    print(f"Save:    {save_time * 1e6:.1f} us")
+    print(f"Restore: {restore_time * 1e6:.1f} us")
@@ -0,0 +1,348 @@
+"""
+Gameplay telemetry for the Road Rash style game.
+
+Game code calls telemetry.emit(kind, value, detail) for crashes, enemy state
+changes, speed changes and frame-time spikes. When telemetry is off emit is
+a no-op. start() swaps in the bound EventBus.emit, which claims a slot in a
+fixed-size ring buffer with an atomic counter and stores one tuple: no lock
+and no allocation beyond the event itself, from any thread. Always call it
+as telemetry.emit, never import the function itself.
+
+A background flusher drains the ring every FLUSH_INTERVAL seconds, packs the
+events into a compact binary batch (array columns plus a small JSON
+trailer) and hands it to every exporter: RotatingFileExporter appends
+gzip members to size-rotated files, HttpExporter POSTs to a collector. If
+the flusher falls behind by more than the ring size the oldest events are
+overwritten and counted as dropped.
+
+Run this module to measure the overhead at 10k events/s, with `dump DIR` to
+print stored events as JSON Lines, or with `collect` to start a local HTTP
+collector stand-in.
+"""
+
+import gzip
+import itertools
+import json
+import math
+import os
+import struct
+import threading
+import time
+from array import array
+
+# Ring buffer size (a power of two) and seconds between flushes
+CAPACITY = 1 << 16
+FLUSH_INTERVAL = 0.5
+
+# Frame work above this many milliseconds is reported as a spike
+SPIKE_MS = 1000.0 / 60
+
+# Default rotation: 5 files of up to 4 MB of compressed events
+MAX_FILE_BYTES = 4 * 1024 * 1024
+BACKUP_COUNT = 4
+COMPRESSION_LEVEL = 1
+
+# Batch layout: header, then time_ns (int64), value (float64, NaN for None)
+# and kind index (uint8) columns, then a JSON [kind names, details] trailer
+BATCH_MAGIC = b"RRTE"
+BATCH_HEADER = struct.Struct("<4sII")   # magic, event count, trailer bytes
+
+
+def encode_batch(events):
+    """Pack (sequence, time_ns, kind, value, detail) tuples into one binary batch"""
+    _, times, kinds, values, details = zip(*events)
+    names = sorted(set(kinds))
+    index = {name: i for i, name in enumerate(names)}
+    trailer = json.dumps([names, details], separators=(",", ":")).encode()
+    return b"".join([
+        BATCH_HEADER.pack(BATCH_MAGIC, len(events), len(trailer)),
+        array("q", times).tobytes(),
+        array("d", [math.nan if value is None else value for value in values]).tobytes(),
+        bytes([index[kind] for kind in kinds]),
+        trailer,
+    ])
+
+
+def decode_batches(data):
+    """Yield event dicts from concatenated binary batches"""
+    view = memoryview(data)
+    offset = 0
+    while offset < len(view):
+        magic, count, trailer_size = BATCH_HEADER.unpack_from(view, offset)
+        if magic != BATCH_MAGIC:
+            raise ValueError("Not a telemetry batch")
+        offset += BATCH_HEADER.size
+        times = array("q")
+        times.frombytes(view[offset:offset + count * 8])
+        offset += count * 8
+        values = array("d")
+        values.frombytes(view[offset:offset + count * 8])
+        offset += count * 8
+        kinds = view[offset:offset + count]
+        offset += count
+        names, details = json.loads(bytes(view[offset:offset + trailer_size]))
+        offset += trailer_size
+        for i in range(count):
+            value = values[i]
+            yield {"t": times[i] / 1e9, "kind": names[kinds[i]],
+                   "value": None if math.isnan(value) else value, "detail": details[i]}
+
+
+class EventBus:
+    """Lock-free multi-producer ring buffer drained by a flusher thread"""
+    def __init__(self, exporters, capacity=CAPACITY, interval=FLUSH_INTERVAL):
+        if capacity & (capacity - 1):
+            raise ValueError("Ring buffer capacity must be a power of two")
+        self.exporters = list(exporters)
+        self.mask = capacity - 1
+        self.slots = [None] * capacity
+        # next() on itertools.count is atomic, so producers never share a slot
+        self.claims = itertools.count()
+        self.read = 0
+        self.dropped = 0
+        self.exported = 0
+        self.flush_seconds = 0.0
+        self.interval = interval
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def emit(self, kind, value=None, detail=None):
+        """Record one event (hot path)"""
+        sequence = next(self.claims)
+        self.slots[sequence & self.mask] = (sequence, time.time_ns(), kind, value, detail)
+
+    def drain(self):
+        """Take every complete event from the ring, oldest first"""
+        events = []
+        slots = self.slots
+        mask = self.mask
+        while True:
+            event = slots[self.read & mask]
+            if event is None or event[0] < self.read:
+                # Slot not written yet (claimed, or never used)
+                break
+            if event[0] > self.read:
+                # Producers lapped the flusher: skip to the oldest slot that can still be intact
+                oldest = event[0] - mask
+                self.dropped += oldest - self.read
+                self.read = oldest
+                continue
+            events.append(event)
+            self.read += 1
+        return events
+
+    def flush(self):
+        """Encode drained events and pass them to the exporters"""
+        start = time.perf_counter()
+        events = self.drain()
+        if not events:
+            return
+        batch = encode_batch(events)
+        for exporter in self.exporters:
+            try:
+                exporter.export(batch, len(events))
+            except Exception as e:
+                print(f"Telemetry export to {exporter} failed: {e}")
+        self.exported += len(events)
+        self.flush_seconds += time.perf_counter() - start
+
+    def start(self):
+        """Start the background flusher"""
+        self.thread = threading.Thread(target=self.run, name="telemetry", daemon=True)
+        self.thread.start()
+
+    def run(self):
+        """Flusher loop executed on the telemetry thread"""
+        while not self.stop_event.wait(self.interval):
+            self.flush()
+
+    def stop(self):
+        """Flush remaining events and close the exporters"""
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+        self.flush()
+        for exporter in self.exporters:
+            exporter.close()
+        if self.dropped:
+            print(f"Telemetry dropped {self.dropped} events")
+
+
+class RotatingFileExporter:
+    """Appends gzip-compressed batches to size-rotated files
+
+    Each batch is written as its own gzip member, so gzip.open reads a
+    file back as one continuous stream of batches.
+    """
+    def __init__(self, directory, name="events", max_bytes=MAX_FILE_BYTES, backups=BACKUP_COUNT):
+        self.directory = directory
+        self.name = name
+        self.max_bytes = max_bytes
+        self.backups = backups
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, index=0):
+        """Path of the current file (0) or of a rotated backup"""
+        suffix = f".{index}" if index else ""
+        return os.path.join(self.directory, f"{self.name}{suffix}.bin.gz")
+
+    def export(self, batch, count):
+        """Compress and append one batch, rotating first if the file is full"""
+        data = gzip.compress(batch, compresslevel=COMPRESSION_LEVEL)
+        current = self.path()
+        if os.path.exists(current) and os.path.getsize(current) + len(data) > self.max_bytes:
+            self.rotate()
+        with open(current, "ab") as f:
+            f.write(data)
+
+    def rotate(self):
+        """Shift events.bin.gz -> events.1.bin.gz -> ..., dropping the oldest"""
+        for index in range(self.backups, 0, -1):
+            source = self.path(index - 1)
+            if os.path.exists(source):
+                os.replace(source, self.path(index))
+
+    def close(self):
+        pass
+
+    def __str__(self):
+        return self.directory
+
+
+class HttpExporter:
+    """POSTs gzip-compressed batches to a collector URL"""
+    def __init__(self, url, timeout=2.0):
+        self.url = url
+        self.timeout = timeout
+
+    def export(self, batch, count):
+        """Send one batch; failures are reported by the bus and the batch dropped"""
+        import urllib.request
+
+        request = urllib.request.Request(self.url, data=gzip.compress(batch, COMPRESSION_LEVEL),
+                                         method="POST", headers={
+                                             "Content-Type": "application/octet-stream",
+                                             "Content-Encoding": "gzip",
+                                             "X-Event-Count": str(count),
+                                         })
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            response.read()
+
+    def close(self):
+        pass
+
+    def __str__(self):
+        return self.url
+
+
+def _emit_off(kind, value=None, detail=None):
+    """Stand-in for emit while telemetry is off"""
+
+
+# Record an event: _emit_off, or the running bus's emit
+emit = _emit_off
+# The running event bus, or None when telemetry is off
+_bus = None
+
+
+def start(exporters, capacity=CAPACITY, interval=FLUSH_INTERVAL):
+    """Turn telemetry on with the given exporters"""
+    global emit, _bus
+    stop()
+    _bus = EventBus(exporters, capacity, interval)
+    _bus.start()
+    emit = _bus.emit
+    return _bus
+
+
+def stop():
+    """Flush and turn telemetry off"""
+    global emit, _bus
+    bus, _bus = _bus, None
+    emit = _emit_off
+    if bus is not None:
+        bus.stop()
+
+
+def read_events(directory, name="events"):
+    """Yield decoded events from every file in a telemetry directory, oldest first"""
+    exporter = RotatingFileExporter(directory, name)
+    for index in range(exporter.backups, -1, -1):
+        path = exporter.path(index)
+        if os.path.exists(path):
+            with gzip.open(path, "rb") as f:
+                yield from decode_batches(f.read())
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+    import tempfile
+
+    parser = argparse.ArgumentParser(description="Road Rash telemetry tools")
+    commands = parser.add_subparsers(dest="command")
+    dump = commands.add_parser("dump", help="print stored events as JSON Lines")
+    dump.add_argument("directory")
+    collect = commands.add_parser("collect", help="run a local HTTP collector stand-in")
+    collect.add_argument("--port", type=int, default=8765)
+    collect.add_argument("--directory", default="telemetry-collected")
+    args = parser.parse_args()
+
+    if args.command == "dump":
+        for event in read_events(args.directory):
+            print(json.dumps(event))
+        sys.exit(0)
+
+    if args.command == "collect":
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        # Store every received batch with the same rotating file sink the game uses
+        sink = RotatingFileExporter(args.directory)
+        lock = threading.Lock()
+
+        class CollectorHandler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                if self.headers.get("Content-Encoding") == "gzip":
+                    body = gzip.decompress(body)
+                count = int(self.headers.get("X-Event-Count", 0))
+                with lock:
+                    sink.export(body, count)
+                print(f"Received {count} events from {self.client_address[0]}")
+                self.send_response(204)
+                self.end_headers()
+
+            def log_message(self, format, *args):
+                pass
+
+        print(f"Collecting telemetry on http://localhost:{args.port}/ into {args.directory}/")
+        ThreadingHTTPServer(("", args.port), CollectorHandler).serve_forever()
+
+    # Overhead of 10k events/s against a 60 FPS frame budget
+    events_per_second = 10000
+    per_frame = events_per_second // 60
+    frames = 600
+    frame_seconds = 1.0 / 60
+    with tempfile.TemporaryDirectory() as scratch:
+        bus = start([RotatingFileExporter(scratch, max_bytes=128 * 1024)])
+        emit_time = 0.0
+        for frame in range(frames):
+            frame_start = time.perf_counter()
+            for i in range(per_frame):
+                emit("speed", 3.0 + i * 0.01)
+            emit_time += time.perf_counter() - frame_start
+            # Leave the rest of the frame to the flusher, as the game loop's sleep would
+            time.sleep(max(0.0, frame_seconds - (time.perf_counter() - frame_start)))
+        stop()
+        files = sorted(os.listdir(scratch))
+        stored = sum(1 for _ in read_events(scratch))
+
+    frame_ms = frame_seconds * 1000
+    emit_ms = emit_time / frames * 1000
+    flush_ms = bus.flush_seconds / frames * 1000
+    print(f"Emit: {emit_time / (frames * per_frame) * 1e6:.3f} us per event, {emit_ms:.4f} ms per frame "
+          f"at {events_per_second} events/s ({emit_ms / frame_ms:.2%} of a {frame_ms:.1f} ms frame)")
+    print(f"Flusher: {flush_ms:.4f} ms per frame on its own thread ({flush_ms / frame_ms:.2%})")
+    print(f"Exported {bus.exported} events, dropped {bus.dropped}, {stored} read back "
+          f"from {len(files)} files: {', '.join(files)}")
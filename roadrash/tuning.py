@@ -0,0 +1,317 @@
+"""
+Difficulty tuning by parameter sweeps over headless episodes.
+
+A sweep runs every combination of the swept parameters for a number of
+seeds. Each run is a headless Game driven by ScriptedPlayer, a rule-based
+rider that swerves to the clearest lane and hits back at enemies alongside.
+Episodes run in a process pool, and each one is seeded so it replays exactly.
+
+Parameters are any config.Difficulty field, plus range_scale, which scales
+the enter and exit distances of every in_range node in behaviors.json (the
+enemies' detection and attack ranges).
+
+Results are cached on disk: one JSON file per parameter set, named by a
+hash of the resolved parameters, the episode length, EPISODE_VERSION and
+the contents of the data files episodes load (behaviors.json and
+entities.json), and holding one result per seed. Editing a data file
+therefore starts a fresh set of results; code changes need a version bump. An interrupted sweep resumes where it
+stopped, and a repeated sweep only runs new seeds or parameter values.
+
+The report is a difficulty curve per parameter: mean survival time and
+score at each value, averaged over the other parameters. The parameter
+sets closest to a target survival time are listed last. For example:
+
+    python -m roadrash.tuning --param enemy_speed=1:4:4 --param range_scale=0.5,1,1.5 --seeds 8
+"""
+
+import argparse
+import hashlib
+import itertools
+import json
+import os
+import random
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from . import config
+from .behavior import DEFAULT_BEHAVIORS_FILE, BehaviorTree
+from .config import ROAD_LEFT, ROAD_RIGHT, SCREEN_HEIGHT
+from .controls import Actions
+from .ecs import DEFAULT_ENTITIES_FILE
+
+# Bump when the game or the scripted player changes, so cached results are not reused
+# (2: the player rides through controls.Actions, with analog throttle and steering)
+EPISODE_VERSION = 2
+
+# Data files that shape an episode besides the difficulty; their contents are part of the cache key
+EPISODE_DATA_FILES = (DEFAULT_BEHAVIORS_FILE, DEFAULT_ENTITIES_FILE)
+
+DEFAULT_CACHE_DIR = "tuning_cache"
+
+# Difficulty fields the game stores in integer fields
+INTEGER_FIELDS = ("attack_cooldown", "player_health", "enemy_health")
+
+# Ticks per second of game time
+TICK_RATE = 60
+
+
+def data_digest(paths=EPISODE_DATA_FILES):
+    """Hash of the contents of the episode data files"""
+    digest = hashlib.sha1()
+    for path in paths:
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def parse_param(text):
+    """Parse name=v1,v2,... or name=start:stop:count into (name, values)"""
+    name, _, values = text.partition("=")
+    if name not in config.Difficulty._fields and name != "range_scale":
+        raise argparse.ArgumentTypeError(f"Unknown parameter: {name}")
+    try:
+        if ":" in values:
+            start, stop, count = values.split(":")
+            numbers = np.linspace(float(start), float(stop), int(count)).round(6).tolist()
+        else:
+            numbers = [float(value) for value in values.split(",")]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Bad values for {name}: {values}")
+    if not numbers:
+        raise argparse.ArgumentTypeError(f"No values for {name}")
+    return name, numbers
+
+
+def scale_ranges(node, scale):
+    """Copy of a behavior tree node with every in_range distance scaled"""
+    node = dict(node)
+    if node.get("type") == "in_range":
+        node["enter"] = node["enter"] * scale
+        node["exit"] = node["exit"] * scale
+    if "children" in node:
+        node["children"] = [scale_ranges(child, scale) for child in node["children"]]
+    return node
+
+
+def episode_difficulty(preset, params):
+    """The preset's config.Difficulty with a parameter set's overrides"""
+    overrides = {name: (round(value) if name in INTEGER_FIELDS else value)
+                 for name, value in params.items() if name != "range_scale"}
+    return config.load_difficulty(preset)._replace(**overrides)
+
+
+def episode_behaviors(params):
+    """(trees, riders) from behaviors.json with a parameter set's range_scale"""
+    with open(DEFAULT_BEHAVIORS_FILE) as f:
+        data = json.load(f)
+    scale = params.get("range_scale", 1.0)
+    trees = {name: BehaviorTree(name, {**spec, "tree": scale_ranges(spec["tree"], scale)})
+             for name, spec in data["personalities"].items()}
+    return trees, data["riders"]
+
+
+class ScriptedPlayer:
+    """Rule-based rider standing in for a human in tuning episodes
+
+    Opens the throttle whenever it has dropped below its cruising height on
+    the screen (throttle also surges the bike up the screen) and swerves
+    toward the lane with the most clear road ahead. It never brakes, since
+    obstacles scroll down at the player whatever its speed. Enemies riding
+    alongside get punched. Its Actions go through Game.apply_actions like
+    a human's, so its runs can be recorded and replayed.
+    """
+    def __init__(self, throttle=0.6, cruise_y=SCREEN_HEIGHT * 0.55, lookahead=300, lanes=9, reach=90):
+        self.throttle = throttle
+        self.cruise_y = cruise_y
+        self.lookahead = lookahead
+        self.lanes = lanes
+        self.reach = reach
+
+    def next(self, game):
+        """This tick's Actions"""
+        player = game.player
+        enemies = [(enemy.x, enemy.y, enemy.width, enemy.height) for enemy in game.enemies]
+        boxes = np.vstack([game.world.solid_boxes(), np.reshape(enemies, (-1, 4))])
+
+        # Clear road ahead of each lane: distance to the nearest box overlapping it
+        lanes = np.linspace(ROAD_LEFT, ROAD_RIGHT - player.width, self.lanes)
+        x, y, w, h = boxes.T
+        ahead = (y + h > player.y - self.lookahead) & (y < player.y + player.height)
+        overlap = (x[None, :] < lanes[:, None] + player.width) & (x[None, :] + w[None, :] > lanes[:, None])
+        gap = np.where(overlap & ahead[None, :], np.maximum(player.y - (y + h), 0.0)[None, :], self.lookahead)
+        clearance = gap.min(axis=1) if len(boxes) else np.full(self.lanes, float(self.lookahead))
+
+        # Prefer the clearest lane, then the nearest one
+        best = np.flatnonzero(clearance == clearance.max())
+        target = lanes[best[np.argmin(np.abs(lanes[best] - player.x))]]
+        steer = max(-1.0, min(1.0, (target - player.x) / 40))
+        throttle = self.throttle if player.y > self.cruise_y else 0.0
+
+        # Hit back at the first enemy alongside
+        for enemy in game.enemies:
+            dx = enemy.x - player.x
+            if abs(dx) < self.reach and abs(enemy.y - player.y) < player.height / 2:
+                return Actions(steer, throttle, 0.0, "punch", 1 if dx >= 0 else -1, False)
+        return Actions(steer, throttle, 0.0, None, 0, False)
+
+
+def run_episode(job):
+    """Play one seeded episode; returns (key, seed, result dict)"""
+    key, preset, params, seed, ticks = job
+    from .game import Game
+
+    random.seed(seed)
+    game = Game(adaptive_quality=False, difficulty=episode_difficulty(preset, params),
+                behaviors=episode_behaviors(params))
+    policy = ScriptedPlayer()
+    while game.tick < ticks and not game.game_over:
+        game.apply_actions(policy.next(game))
+        game.update()
+    result = {
+        "survival": game.tick / TICK_RATE,
+        "score": game.player.score,
+        "health": game.player.health,
+        "hits": game.combat.hits,
+        "cause": game.crash_cause if game.game_over else None,
+    }
+    game.shutdown()
+    return key, seed, result
+
+
+def worker_init():
+    """Process pool initializer: headless pygame"""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+
+class ResultCache:
+    """Directory of per-parameter-set result files"""
+    def __init__(self, path=DEFAULT_CACHE_DIR):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+    @staticmethod
+    def key(preset, params, ticks):
+        """Stable hash of everything that decides an episode's outcome, except the seed"""
+        difficulty = episode_difficulty(preset, params)
+        identity = {"version": EPISODE_VERSION, "ticks": ticks, "difficulty": difficulty._asdict(),
+                    "range_scale": params.get("range_scale", 1.0), "data": data_digest()}
+        return hashlib.sha1(json.dumps(identity, sort_keys=True).encode()).hexdigest()[:16]
+
+    def load(self, key):
+        """{seed: result} cached for a parameter set"""
+        try:
+            with open(os.path.join(self.path, key + ".json")) as f:
+                return {int(seed): result for seed, result in json.load(f)["episodes"].items()}
+        except (OSError, ValueError, KeyError):
+            return {}
+
+    def store(self, key, params, episodes):
+        """Write a parameter set's results, atomically so an interrupt cannot corrupt them"""
+        path = os.path.join(self.path, key + ".json")
+        with open(path + ".tmp", "w") as f:
+            json.dump({"params": params, "episodes": episodes}, f, indent=1, sort_keys=True)
+        os.replace(path + ".tmp", path)
+
+
+def sweep(preset, grid, seeds, ticks, cache, workers=None):
+    """Run every missing (parameter set, seed) episode
+
+    grid is a list of (name, values); returns [(params, {seed: result})] in
+    grid order.
+    """
+    names = [name for name, _ in grid]
+    points = [dict(zip(names, values)) for values in itertools.product(*(values for _, values in grid))]
+    keys = [cache.key(preset, params, ticks) for params in points]
+    results = {key: cache.load(key) for key in keys}
+    jobs = [(key, preset, params, seed, ticks)
+            for key, params in zip(keys, points) for seed in range(seeds) if seed not in results[key]]
+    print(f"{len(points)} parameter sets x {seeds} seeds: {len(points) * seeds - len(jobs)} cached, "
+          f"{len(jobs)} to run")
+
+    params_by_key = dict(zip(keys, points))
+    if jobs and workers != 1:
+        with ProcessPoolExecutor(max_workers=workers, initializer=worker_init) as pool:
+            futures = [pool.submit(run_episode, job) for job in jobs]
+            for done, future in enumerate(as_completed(futures), 1):
+                key, seed, result = future.result()
+                results[key][seed] = result
+                cache.store(key, params_by_key[key], results[key])
+                print(f"\r{done}/{len(jobs)} episodes", end="", flush=True)
+        print()
+    else:
+        worker_init()
+        for job in jobs:
+            key, seed, result = run_episode(job)
+            results[key][seed] = result
+            cache.store(key, params_by_key[key], results[key])
+    return [(params, {seed: results[key][seed] for seed in range(seeds)}) for params, key in zip(points, keys)]
+
+
+def difficulty_curves(grid, outcomes):
+    """Text lines with mean survival and score per value of each parameter"""
+    lines = []
+    longest = max((result["survival"] for _, episodes in outcomes for result in episodes.values()), default=1)
+    for name, values in grid:
+        lines.append(f"{name}:")
+        by_value = defaultdict(list)
+        for params, episodes in outcomes:
+            by_value[params[name]].extend(episodes.values())
+        for value in values:
+            results = by_value[value]
+            survival = np.mean([result["survival"] for result in results])
+            score = np.mean([result["score"] for result in results])
+            bar = "#" * round(30 * survival / max(longest, 1e-9))
+            lines.append(f"  {value:>10g}  survival {survival:7.1f} s  score {score:8.0f}  {bar}")
+    return lines
+
+
+def write_csv(path, outcomes):
+    """One row per episode, for plotting elsewhere"""
+    names = sorted({name for params, _ in outcomes for name in params})
+    with open(path, "w") as f:
+        f.write(",".join(names + ["seed", "survival", "score", "health", "hits", "cause"]) + "\n")
+        for params, episodes in outcomes:
+            for seed, result in sorted(episodes.items()):
+                row = [params[name] for name in names] + [seed] + [result[field] for field in
+                                                                    ("survival", "score", "health", "hits", "cause")]
+                f.write(",".join("" if value is None else str(value) for value in row) + "\n")
+
+
+def main(argv=None):
+    """Parse command line options and run a sweep"""
+    parser = argparse.ArgumentParser(description="Sweep difficulty parameters over headless episodes")
+    parser.add_argument("--param", type=parse_param, action="append", required=True,
+                        metavar="NAME=VALUES", help="values as v1,v2,... or start:stop:count; repeatable")
+    parser.add_argument("--difficulty", choices=sorted(config.load_difficulties()),
+                        default=config.DEFAULT_DIFFICULTY, help="preset the parameters override")
+    parser.add_argument("--seeds", type=int, default=4, help="episodes per parameter set")
+    parser.add_argument("--seconds", type=float, default=90, help="longest episode in game seconds")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: one per CPU)")
+    parser.add_argument("--cache", default=DEFAULT_CACHE_DIR, help="result cache directory")
+    parser.add_argument("--csv", help="also write every episode to this CSV file")
+    parser.add_argument("--target", type=float, default=60,
+                        help="survival time in seconds the best parameter sets are ranked against")
+    args = parser.parse_args(argv)
+
+    grid = args.param
+    outcomes = sweep(args.difficulty, grid, args.seeds, round(args.seconds * TICK_RATE),
+                     ResultCache(args.cache), args.workers)
+    print("\n".join(difficulty_curves(grid, outcomes)))
+    if args.csv:
+        write_csv(args.csv, outcomes)
+
+    # Parameter sets whose mean survival is closest to the target
+    ranked = sorted(outcomes, key=lambda outcome: abs(np.mean([r["survival"] for r in outcome[1].values()])
+                                                     - args.target))
+    print(f"Closest to {args.target:g} s:")
+    for params, episodes in ranked[:5]:
+        survival = np.mean([result["survival"] for result in episodes.values()])
+        text = ", ".join(f"{name}={value:g}" for name, value in params.items())
+        print(f"  {survival:6.1f} s  {text}")
+
+
+if __name__ == "__main__":
+    main()
@@ -21,7 +21,7 @@ pip install -r requirements.txt
 
 # Run the game
 echo "Starting Road Rash Game..."
-python3 game.py
+python3 run_game_direct.py
 
 # Deactivate virtual environment when done
 deactivate
\ No newline at end of file
@@ -6,7 +6,6 @@ This script runs the game directly without requiring the shell script.
 
 import sys
 import os
-import subprocess
 
 def main():
     """Run the game directly"""
@@ -18,15 +17,14 @@ def main():
     # Change to the script directory
     os.chdir(script_dir)
     
-    # Run the game
+    # Run the game with the classic tuning
     try:
-        import game
-        game_instance = game.Game()
-        game_instance.run()
+        from roadrash.game import main as run_game
+        run_game(["--difficulty", "classic"] + sys.argv[1:])
     except ImportError as e:
         print(f"Error importing game module: {e}")
-        print("Make sure pygame and boto3 are installed.")
-        print("Try running: pip install pygame boto3")
+        print("Make sure pygame and numpy are installed.")
+        print("Try running: pip install -r requirements.txt")
         sys.exit(1)
     except Exception as e:
         print(f"Error running game: {e}")
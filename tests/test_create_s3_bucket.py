@@ -0,0 +1,105 @@
+"""
+Publishing assets with create_s3_bucket.upload_default_assets against moto's
+in-process S3: unchanged assets are skipped, multipart ETags match
+local_etag, and the manifests carry the content version.
+"""
+
+import json
+import os
+
+import pytest
+
+moto = pytest.importorskip("moto")
+boto3 = pytest.importorskip("boto3")
+
+import create_default_assets
+import create_s3_bucket
+
+BUCKET = "road-rash-test-assets"
+BIG_SIZE = 20 * 1024 * 1024
+
+
+@pytest.fixture
+def assets_dir(tmp_path, monkeypatch):
+    """A small asset set, with one file well over the multipart threshold"""
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    # The asset set is written below; do not regenerate the real one
+    monkeypatch.setattr(create_default_assets, "create_default_assets", lambda *args, **kwargs: None)
+
+    directory = tmp_path / "assets"
+    (directory / "variants").mkdir(parents=True)
+    (directory / "player.png").write_bytes(b"player" * 100)
+    (directory / "variants" / "enemy_1.png").write_bytes(b"enemy" * 100)
+    (directory / "big.png").write_bytes(os.urandom(BIG_SIZE))
+    return str(directory)
+
+
+@pytest.fixture
+def put_calls(monkeypatch):
+    """Object keys written by every S3 client the publisher creates"""
+    calls = []
+    make_client = create_s3_bucket.get_s3_client
+
+    def counting_client(*args, **kwargs):
+        client = make_client(*args, **kwargs)
+        for operation in ("PutObject", "CreateMultipartUpload"):
+            client.meta.events.register(f"provide-client-params.s3.{operation}",
+                                        lambda params, **_: calls.append(params["Key"]))
+        return client
+
+    monkeypatch.setattr(create_s3_bucket, "get_s3_client", counting_client)
+    return calls
+
+
+def asset_puts(calls):
+    """Writes other than the manifests"""
+    return [key for key in calls if key != create_s3_bucket.MANIFEST_KEY and not key.startswith("manifests/")]
+
+
+def test_publish_skips_unchanged_and_writes_manifests(assets_dir, put_calls):
+    with moto.mock_aws():
+        assert create_s3_bucket.create_bucket(BUCKET)
+        assert create_s3_bucket.upload_default_assets(BUCKET, assets_dir=assets_dir)
+        assert sorted(asset_puts(put_calls)) == ["big.png", "player.png", "variants/enemy_1.png"]
+
+        # Publishing the same files again uploads nothing
+        put_calls.clear()
+        assert create_s3_bucket.upload_default_assets(BUCKET, assets_dir=assets_dir)
+        assert asset_puts(put_calls) == []
+
+        # A multipart object's ETag is the one local_etag predicts
+        client = boto3.client("s3", region_name="us-east-1")
+        big_path = os.path.join(assets_dir, "big.png")
+        remote = client.head_object(Bucket=BUCKET, Key="big.png")["ETag"].strip('"')
+        assert remote.endswith("-3")
+        assert remote == create_s3_bucket.local_etag(big_path)
+
+        # Both manifests hold the content version and every asset's ETag
+        latest = json.loads(client.get_object(Bucket=BUCKET, Key=create_s3_bucket.MANIFEST_KEY)["Body"].read())
+        versioned_key = f"manifests/manifest-{latest['version']}.json"
+        versioned = json.loads(client.get_object(Bucket=BUCKET, Key=versioned_key)["Body"].read())
+        assert versioned == latest
+        entries = {key: {"etag": create_s3_bucket.local_etag(path), "size": os.path.getsize(path)}
+                   for key, path in create_s3_bucket.list_local_assets(assets_dir)}
+        assert latest == create_s3_bucket.build_manifest(entries)
+        assert latest["assets"]["big.png"]["etag"] == remote
+
+
+def test_changed_asset_is_uploaded_again(assets_dir, put_calls):
+    with moto.mock_aws():
+        assert create_s3_bucket.create_bucket(BUCKET)
+        assert create_s3_bucket.upload_default_assets(BUCKET, assets_dir=assets_dir)
+        first = json.loads(boto3.client("s3", region_name="us-east-1")
+                           .get_object(Bucket=BUCKET, Key=create_s3_bucket.MANIFEST_KEY)["Body"].read())
+
+        with open(os.path.join(assets_dir, "player.png"), "ab") as f:
+            f.write(b"edited")
+        put_calls.clear()
+        assert create_s3_bucket.upload_default_assets(BUCKET, assets_dir=assets_dir)
+        assert asset_puts(put_calls) == ["player.png"]
+
+        second = json.loads(boto3.client("s3", region_name="us-east-1")
+                            .get_object(Bucket=BUCKET, Key=create_s3_bucket.MANIFEST_KEY)["Body"].read())
+        assert second["version"] != first["version"]
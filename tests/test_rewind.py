@@ -0,0 +1,50 @@
+"""
+Rewinding a headless game across a crash: the crash must not change the
+save-state layout, so the history from before it stays in the buffer.
+"""
+
+import pytest
+
+pygame = pytest.importorskip("pygame")
+
+import create_default_assets
+from roadrash import savestate
+from roadrash.game import Game
+
+
+@pytest.fixture
+def game(tmp_path, monkeypatch):
+    """A seeded headless game with generated assets"""
+    monkeypatch.setenv("SDL_VIDEODRIVER", "dummy")
+    monkeypatch.setenv("SDL_AUDIODRIVER", "dummy")
+    monkeypatch.chdir(tmp_path)
+    create_default_assets.create_default_assets(workers=1)
+    game = Game(adaptive_quality=False, seed=3)
+    yield game
+    game.shutdown()
+
+
+def test_rewind_across_crash(game, monkeypatch):
+    for _ in range(120):
+        game.update()
+    assert not game.game_over
+    before = savestate.save_state(game)
+    history = len(game.rewind)
+
+    # The next tick runs into an obstacle
+    monkeypatch.setattr(game.world, "collides", lambda rect: "obstacle")
+    game.update()
+    assert game.game_over and game.crash_cause == "obstacle"
+    assert len(game.rewind) == history + 1
+
+    savestate.restore_state(game, game.rewind.pop())
+    assert not game.game_over and game.crash_cause is None
+    assert savestate.save_state(game) == before
+
+
+def test_crash_cause_round_trip(game):
+    game.crash("enemy")
+    snapshot = savestate.save_state(game)
+    game.crash_cause = None
+    savestate.restore_state(game, snapshot)
+    assert game.game_over and game.crash_cause == "enemy"